@@ -9,10 +9,24 @@ from .shared_buffer import SharedBuffer
 from .producer import Producer
 from .consumer import Consumer
 from .system import ProducerConsumerSystem
+from .stats import StatsRegistry, ThreadStats
+from .partitioning import PartitionedBuffer, PartitionReader
+from .processing import ReorderBuffer
+from .profiling import ContentionProfiler
+from .rate_limit import AIMDController, LeakyBucket, TokenBucket
 
 __all__ = [
     'SharedBuffer',
     'Producer',
     'Consumer',
     'ProducerConsumerSystem',
+    'StatsRegistry',
+    'ThreadStats',
+    'TokenBucket',
+    'LeakyBucket',
+    'AIMDController',
+    'ReorderBuffer',
+    'PartitionedBuffer',
+    'PartitionReader',
+    'ContentionProfiler',
 ]
@@ -3,6 +3,8 @@ Consumer Module
 
 Implements the consumer thread that reads items from a shared buffer
 and stores them in a destination container (thread-safe via a shared lock).
+Optionally hands each item to a shared executor for processing, with an
+ordered-output mode that restores FIFO order through a reorder buffer.
 """
 
 from __future__ import annotations
@@ -10,9 +12,15 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from typing import Any, List
+from concurrent.futures import Executor, Future
+from contextlib import nullcontext
+from functools import partial
+from typing import Any, Callable, List, Optional
 
+from .processing import ReorderBuffer
+from .profiling import ContentionProfiler
 from .shared_buffer import SharedBuffer
+from .stats import ThreadStats
 
 
 class Consumer(threading.Thread):
@@ -24,7 +32,10 @@ class Consumer(threading.Thread):
         - Graceful shutdown via a poison-pill sentinel (POISON_PILL).
         - Respect for a cooperative stop_event.
         - Destination writes protected by a shared lock to avoid races.
-        - Per-thread consumption statistics.
+        - Optional processor applied to each item, inline or on a shared
+          ThreadPoolExecutor/ProcessPoolExecutor with bounded in-flight work.
+        - Optional ordered output via a shared ReorderBuffer.
+        - Per-thread consumption statistics (single-writer, lock-free).
 
     Attributes:
         consumer_id: Unique identifier for this consumer.
@@ -33,12 +44,20 @@ class Consumer(threading.Thread):
         shared_buffer: The shared bounded buffer to consume from.
         stop_event: Event used to signal cooperative shutdown.
         consumption_delay: Optional delay to simulate processing.
+        processor: Optional callable transforming each item before storage.
+        executor: Optional executor the processor runs on.
+        reorder_buffer: Optional ReorderBuffer restoring FIFO output order.
+        profiler: Optional ContentionProfiler timing destination_lock waits.
+        stats: Per-thread counters ("consumed", "get_timeouts", "process_errors").
         items_consumed: Number of successfully consumed items.
     """
 
     # Poison pill sentinel to signal consumer shutdown.
     POISON_PILL = object()
 
+    # Counter names recorded in self.stats.
+    STAT_KEYS = ("consumed", "get_timeouts", "process_errors")
+
     def __init__(
         self,
         consumer_id: int,
@@ -47,6 +66,12 @@ class Consumer(threading.Thread):
         shared_buffer: SharedBuffer,
         stop_event: threading.Event,
         consumption_delay: float = 0.01,
+        stats: Optional[ThreadStats] = None,
+        processor: Optional[Callable[[Any], Any]] = None,
+        executor: Optional[Executor] = None,
+        reorder_buffer: Optional[ReorderBuffer] = None,
+        max_in_flight: int = 16,
+        profiler: Optional[ContentionProfiler] = None,
     ) -> None:
         """
         Initialize the consumer thread.
@@ -58,7 +83,23 @@ class Consumer(threading.Thread):
             shared_buffer: Shared buffer to get items from.
             stop_event: Event to signal thread shutdown.
             consumption_delay: Delay between consuming items (simulates work).
+            stats: Counter set to write to; a private one is created if omitted.
+            processor: Callable applied to each item; its return value is
+                stored instead of the item. Must be picklable for process pools.
+            executor: Executor to run processor on; inline when omitted.
+                The caller owns the executor and must shut it down.
+            reorder_buffer: Shared ReorderBuffer; when set, results are
+                appended in buffer FIFO order regardless of completion order.
+            max_in_flight: Maximum items submitted to the executor and not
+                yet completed (keeps backpressure on the shared buffer).
+            profiler: Contention profiler; destination_lock acquisition is
+                timed while it is enabled.
         """
+        if executor is not None and processor is None:
+            raise ValueError("executor requires a processor")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+
         super().__init__(name=f"Consumer-{consumer_id}")
         self.consumer_id = consumer_id
         self.destination = destination
@@ -66,10 +107,92 @@ class Consumer(threading.Thread):
         self.shared_buffer = shared_buffer
         self.stop_event = stop_event
         self.consumption_delay = consumption_delay
-        self.items_consumed = 0
+        self.stats = stats or ThreadStats(self.name, self.STAT_KEYS)
+        self.processor = processor
+        self.executor = executor
+        self.reorder_buffer = reorder_buffer
+        self.profiler = profiler
+
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        # Executor callbacks complete items on pool threads, so stats stop
+        # being single-writer; serialize them only in that mode.
+        self._stats_lock = threading.Lock() if executor is not None else nullcontext()
 
         self._log = logging.getLogger(__name__)
 
+    @property
+    def items_consumed(self) -> int:
+        """Number of items successfully consumed by this consumer."""
+        return self.stats.get("consumed")
+
+    def _destination_locked(self):
+        """Context manager for destination_lock; timed when profiling is on."""
+        prof = self.profiler
+        if prof is None or not prof.enabled:
+            return self.destination_lock
+        return prof.acquire(self.destination_lock, "Consumer._deliver;destination_lock")
+
+    def _deliver(self, seq: Optional[int], item: Any, result: Any) -> None:
+        """Store a processed result and mark its buffer task as done."""
+        if self.reorder_buffer is not None:
+            self.reorder_buffer.submit(seq, self.destination, result)
+        else:
+            with self._destination_locked():
+                self.destination.append(result)
+
+        with self._stats_lock:
+            self.stats.incr("consumed")
+        self._log.info(
+            "Consumer %s consumed: %r (total: %d)",
+            self.consumer_id,
+            item,
+            self.items_consumed,
+        )
+        self.shared_buffer.task_done()
+
+    def _fail(self, seq: Optional[int], item: Any, exc: BaseException) -> None:
+        """Record a processor failure without stalling ordered output."""
+        self._log.error(
+            "Consumer %s failed to process %r: %s", self.consumer_id, item, exc
+        )
+        if self.reorder_buffer is not None:
+            self.reorder_buffer.skip(seq)
+        with self._stats_lock:
+            self.stats.incr("process_errors")
+        self.shared_buffer.task_done()
+
+    def _on_done(self, seq: Optional[int], item: Any, future: Future) -> None:
+        """Executor callback: deliver the result and free an in-flight slot."""
+        try:
+            exc = future.exception()
+            if exc is not None:
+                self._fail(seq, item, exc)
+            else:
+                self._deliver(seq, item, future.result())
+        finally:
+            self._in_flight.release()
+
+    def _handle(self, seq: Optional[int], item: Any) -> None:
+        """Process one item inline or hand it to the executor."""
+        if self.processor is None:
+            self._deliver(seq, item, item)
+        elif self.executor is None:
+            try:
+                result = self.processor(item)
+            except Exception as exc:
+                self._fail(seq, item, exc)
+            else:
+                self._deliver(seq, item, result)
+        else:
+            self._in_flight.acquire()
+            try:
+                future = self.executor.submit(self.processor, item)
+            except Exception as exc:  # e.g. RuntimeError from a shut-down executor
+                self._in_flight.release()
+                self._fail(seq, item, exc)
+                return
+            future.add_done_callback(partial(self._on_done, seq, item))
+
     def run(self) -> None:
         """
         Main execution loop for the consumer thread.
@@ -78,36 +201,43 @@ class Consumer(threading.Thread):
         in the destination list. Handles poison pills for graceful shutdown
         and respects the stop event. Uses a shared lock to ensure thread-safe
         writes to the destination list.
+
+        With an executor, items are submitted for processing and task_done()
+        is called from the completion callback, so SharedBuffer.join() (and
+        therefore graceful shutdown) waits for in-flight work to finish.
         """
         self._log.info("Consumer %s started", self.consumer_id)
 
+        ordered = self.reorder_buffer is not None
+
         try:
             while not self.stop_event.is_set():
-                item = self.shared_buffer.get(timeout=1.0)
-
-                if item is None:
+                if ordered:
+                    # get_sequenced() returns None only on timeout, so a
+                    # stored None keeps its sequence number and is delivered.
+                    got = self.shared_buffer.get_sequenced(timeout=1.0)
+                    timed_out = got is None
+                    seq, item = (None, None) if timed_out else got
+                else:
+                    seq, item = None, self.shared_buffer.get(timeout=1.0)
+                    timed_out = item is None
+
+                if timed_out:
+                    with self._stats_lock:
+                        self.stats.incr("get_timeouts")
                     continue
 
                 if item is self.POISON_PILL:
                     self._log.info("Consumer %s received poison pill", self.consumer_id)
+                    if ordered:
+                        self.reorder_buffer.skip(seq)
                     self.shared_buffer.task_done()
                     break
 
                 if self.consumption_delay > 0:
                     time.sleep(self.consumption_delay)
 
-                with self.destination_lock:
-                    self.destination.append(item)
-
-                self.items_consumed += 1
-                self._log.info(
-                    "Consumer %s consumed: %r (total: %d)",
-                    self.consumer_id,
-                    item,
-                    self.items_consumed,
-                )
-
-                self.shared_buffer.task_done()
+                self._handle(seq, item)
 
         except Exception as exc:
             self._log.error(
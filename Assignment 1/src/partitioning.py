@@ -0,0 +1,211 @@
+"""
+Partitioning Module
+
+Keyed routing across several SharedBuffers. Items are assigned to one of K
+partitions by a stable hash of their key, so items with the same key always
+travel through the same FIFO buffer (per-key ordering is preserved) and each
+buffer's lock is shared by only a fraction of the threads.
+"""
+
+from __future__ import annotations
+
+import threading
+import zlib
+from collections import deque
+from time import monotonic, perf_counter_ns
+from typing import Any, Callable, Deque, List, Optional, Sequence
+
+from .profiling import ContentionProfiler
+from .shared_buffer import QueueClosed, SharedBuffer
+
+
+def stable_hash(key: Any) -> int:
+    """
+    Process-independent hash of a key.
+
+    Uses CRC32 over the key's string form rather than hash(), which is
+    randomized per interpreter for str/bytes.
+    """
+    if isinstance(key, int):
+        return key & 0xFFFFFFFF
+    data = key if isinstance(key, bytes) else str(key).encode("utf-8")
+    return zlib.crc32(data)
+
+
+class PartitionedBuffer:
+    """
+    Producer-facing view over K SharedBuffers with key-hash routing.
+
+    - put(item, timeout): routes to partition_for(item) and blocks only on
+      that partition.
+    - join(): blocks until every partition has been fully processed.
+    - close(): closes every partition.
+    - reader(partitions): consumer-facing view over a subset of partitions.
+
+    Attributes:
+        partitions: The underlying SharedBuffer instances.
+        key_fn: Extracts the routing key from an item (e.g., customer id).
+    """
+
+    def __init__(
+        self,
+        num_partitions: int,
+        max_size: int = 10,
+        key_fn: Optional[Callable[[Any], Any]] = None,
+        profiler: Optional[ContentionProfiler] = None,
+    ) -> None:
+        """
+        Args:
+            num_partitions: Number of partitions K (must be > 0).
+            max_size: Capacity of each partition.
+            key_fn: Routing key extractor; defaults to the item itself.
+            profiler: Optional contention profiler shared by all partitions.
+        """
+        if num_partitions <= 0:
+            raise ValueError("num_partitions must be positive")
+        self.partitions: List[SharedBuffer] = [
+            SharedBuffer(max_size=max_size, profiler=profiler) for _ in range(num_partitions)
+        ]
+        self.key_fn = key_fn or (lambda item: item)
+        self._profiler = profiler
+
+    def partition_for(self, item: Any) -> int:
+        """Index of the partition an item is routed to."""
+        return stable_hash(self.key_fn(item)) % len(self.partitions)
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Enqueue an item on its key's partition.
+        Returns True if enqueued, or False if the timeout elapsed.
+        """
+        return self.partitions[self.partition_for(item)].put(item, timeout=timeout)
+
+    def join(self) -> None:
+        """Block until all partitions have no unfinished tasks."""
+        for buffer in self.partitions:
+            buffer.join()
+
+    def close(self) -> None:
+        """Close every partition."""
+        for buffer in self.partitions:
+            buffer.close()
+
+    def reader(self, indices: Sequence[int]) -> "PartitionReader":
+        """Create a consumer-facing view over the given partition indices."""
+        return PartitionReader([self.partitions[i] for i in indices], self._profiler)
+
+    def size(self) -> int:
+        """Approximate total occupancy across partitions (lock-free)."""
+        return sum(buffer.size() for buffer in self.partitions)
+
+    @property
+    def max_size(self) -> int:
+        """Combined capacity of all partitions."""
+        return sum(buffer.max_size for buffer in self.partitions)
+
+    def __len__(self) -> int:
+        return self.size()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(partitions={len(self.partitions)}, "
+            f"size={self.size()}, max_size={self.max_size})"
+        )
+
+
+class PartitionReader:
+    """
+    Consumer-facing view over the partitions owned by one consumer.
+
+    Exposes the subset of the SharedBuffer API a Consumer uses (get,
+    task_done, put for poison pills). get() scans the owned partitions
+    round-robin without blocking and otherwise sleeps on a wake-up event
+    that every owned partition signals on put, so an idle consumer costs
+    nothing and never holds more than one partition lock at a time.
+    """
+
+    def __init__(
+        self,
+        buffers: Sequence[SharedBuffer],
+        profiler: Optional[ContentionProfiler] = None,
+    ) -> None:
+        if not buffers:
+            raise ValueError("a reader needs at least one partition")
+        self.buffers: List[SharedBuffer] = list(buffers)
+        self._wakeup = threading.Event()
+        for buffer in self.buffers:
+            buffer.add_put_listener(self._wakeup.set)
+
+        self._next = 0
+        # Source buffer of each dequeued item whose task_done() is pending.
+        self._sources: Deque[SharedBuffer] = deque()
+        self._sources_lock = threading.Lock()
+        self._profiler = profiler
+
+    def _wait(self, timeout: Optional[float]) -> bool:
+        """Sleep on the wake-up event; timed when profiling is on."""
+        prof = self._profiler
+        if prof is None or not prof.enabled:
+            return self._wakeup.wait(timeout)
+        t0 = perf_counter_ns()
+        try:
+            return self._wakeup.wait(timeout)
+        finally:
+            prof.record("PartitionReader.get;wakeup.wait", perf_counter_ns() - t0)
+
+    def _poll(self) -> Any:
+        """One non-blocking round-robin pass; returns the buffer and item."""
+        n = len(self.buffers)
+        open_count = n
+        for offset in range(n):
+            buffer = self.buffers[(self._next + offset) % n]
+            try:
+                item = buffer.get(timeout=0)
+            except QueueClosed:
+                open_count -= 1
+                continue
+            if item is not None:
+                self._next = (self._next + offset + 1) % n
+                return buffer, item
+        if open_count == 0:
+            raise QueueClosed("All partitions are closed")
+        return None, None
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Dequeue the next item from any owned partition.
+        Returns None if the timeout elapsed.
+        Raises QueueClosed once every owned partition is closed and empty.
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            # Clear before scanning so a put racing with the scan still wakes us.
+            self._wakeup.clear()
+            buffer, item = self._poll()
+            if buffer is not None:
+                with self._sources_lock:
+                    self._sources.append(buffer)
+                return item
+
+            if deadline is None:
+                self._wait(None)
+                continue
+            remaining = deadline - monotonic()
+            if remaining <= 0 or not self._wait(remaining):
+                return None
+
+    def task_done(self) -> None:
+        """Mark the oldest outstanding item from this reader as processed."""
+        with self._sources_lock:
+            if not self._sources:
+                raise ValueError("task_done() called too many times")
+            buffer = self._sources.popleft()
+        buffer.task_done()
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """Enqueue a control item (e.g., a poison pill) on the first owned partition."""
+        return self.buffers[0].put(item, timeout=timeout)
+
+    def size(self) -> int:
+        """Approximate occupancy across owned partitions (lock-free)."""
+        return sum(buffer.size() for buffer in self.buffers)
@@ -0,0 +1,74 @@
+"""
+Processing Module
+
+Support for consumer-side parallel processing: a reorder buffer that
+reassembles out-of-order results into the buffer's FIFO sequence before
+appending them to their destination lists.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Marks a sequence number that produces no output (poison pill, failed item).
+_SKIP = object()
+
+
+class ReorderBuffer:
+    """
+    Thread-safe reorder buffer keyed by SharedBuffer dequeue sequence.
+
+    Results may arrive in any order (from pool workers or multiple
+    consumers); they are held until every lower sequence number has been
+    resolved and then flushed to their destinations strictly in order.
+    Every sequence number handed out by the buffer must eventually be
+    resolved via submit() or skip(), otherwise output stalls at the gap.
+
+    Attributes:
+        destination_lock: Lock guarding appends to destination lists.
+    """
+
+    def __init__(self, destination_lock: Optional[threading.Lock] = None, start: int = 0) -> None:
+        """
+        Args:
+            destination_lock: Lock shared with other writers of the
+                destinations; a private lock is used if omitted.
+            start: First sequence number expected.
+        """
+        self.destination_lock = destination_lock or threading.Lock()
+        self._lock = threading.Lock()
+        self._next = start
+        self._pending: Dict[int, Tuple[Optional[List[Any]], Any]] = {}
+
+    def submit(self, seq: int, destination: List[Any], result: Any) -> None:
+        """Record the result for seq and flush any newly contiguous run."""
+        self._resolve(seq, destination, result)
+
+    def skip(self, seq: int) -> None:
+        """Mark seq as producing no output so later results are not held up."""
+        self._resolve(seq, None, _SKIP)
+
+    def pending(self) -> int:
+        """Number of results waiting on an earlier sequence number."""
+        return len(self._pending)
+
+    def _resolve(self, seq: int, destination: Optional[List[Any]], result: Any) -> None:
+        with self._lock:
+            if seq < self._next or seq in self._pending:
+                raise ValueError(f"sequence {seq} already resolved")
+            self._pending[seq] = (destination, result)
+
+            ready: List[Tuple[List[Any], Any]] = []
+            while self._next in self._pending:
+                dest, value = self._pending.pop(self._next)
+                if value is not _SKIP:
+                    ready.append((dest, value))
+                self._next += 1
+
+            # Appending while still holding self._lock keeps flushes from
+            # concurrent resolvers from interleaving out of order.
+            if ready:
+                with self.destination_lock:
+                    for dest, value in ready:
+                        dest.append(value)
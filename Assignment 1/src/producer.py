@@ -10,9 +10,11 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from typing import Any, List
+from typing import Any, List, Optional
 
+from .rate_limit import AIMDController, RateLimiter
 from .shared_buffer import SharedBuffer
+from .stats import ThreadStats
 
 
 class Producer(threading.Thread):
@@ -23,8 +25,10 @@ class Producer(threading.Thread):
     Features:
         - Respects a cooperative stop_event for early shutdown.
         - Optional production_delay to simulate work per item.
+        - Optional per-producer and global rate limiters (token/leaky bucket).
+        - Optional AIMD backoff that adapts the rate to buffer occupancy.
         - Lossless under contention via retry loop on buffer.put().
-        - Per-thread production statistics.
+        - Per-thread production statistics (single-writer, lock-free).
 
     Attributes:
         producer_id: Unique identifier for this producer.
@@ -32,9 +36,16 @@ class Producer(threading.Thread):
         shared_buffer: Shared buffer to place items into.
         stop_event: Event to signal thread shutdown.
         production_delay: Delay between producing items.
+        rate_limiter: Optional limiter applied to this producer only.
+        global_rate_limiter: Optional limiter shared by all producers.
+        backoff: Optional AIMD controller fed with put outcomes and occupancy.
+        stats: Per-thread counters ("produced", "put_retries").
         items_produced: Counter for successfully produced items.
     """
 
+    # Counter names recorded in self.stats.
+    STAT_KEYS = ("produced", "put_retries")
+
     def __init__(
         self,
         producer_id: int,
@@ -42,6 +53,10 @@ class Producer(threading.Thread):
         shared_buffer: SharedBuffer,
         stop_event: threading.Event,
         production_delay: float = 0.01,
+        stats: Optional[ThreadStats] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        global_rate_limiter: Optional[RateLimiter] = None,
+        backoff: Optional[AIMDController] = None,
     ) -> None:
         """
         Initialize the producer thread.
@@ -52,6 +67,10 @@ class Producer(threading.Thread):
             shared_buffer: Shared buffer to place items into.
             stop_event: Event to signal thread shutdown.
             production_delay: Delay between producing items (simulates work).
+            stats: Counter set to write to; a private one is created if omitted.
+            rate_limiter: Limiter for this producer (e.g., TokenBucket).
+            global_rate_limiter: Limiter shared across producers.
+            backoff: AIMD controller that paces puts based on occupancy.
         """
         super().__init__(name=f"Producer-{producer_id}")
         self.producer_id = producer_id
@@ -59,20 +78,47 @@ class Producer(threading.Thread):
         self.shared_buffer = shared_buffer
         self.stop_event = stop_event
         self.production_delay = production_delay
-        self.items_produced = 0
+        self.stats = stats or ThreadStats(self.name, self.STAT_KEYS)
+        self.rate_limiter = rate_limiter
+        self.global_rate_limiter = global_rate_limiter
+        self.backoff = backoff
 
         self._log = logging.getLogger(__name__)
 
+    @property
+    def items_produced(self) -> int:
+        """Number of items successfully enqueued by this producer."""
+        return self.stats.get("produced")
+
+    def _acquire_permits(self, limiters) -> bool:
+        """
+        Block on each configured limiter in turn.
+        Returns False if stop_event was set while waiting.
+        """
+        for limiter in limiters:
+            if limiter is not None and not limiter.acquire(stop_event=self.stop_event):
+                return False
+        return True
+
+    def _occupancy(self) -> float:
+        """Lock-free buffer fill ratio used as the AIMD congestion signal."""
+        return self.shared_buffer.size() / self.shared_buffer.max_size
+
     def run(self) -> None:
         """
         Main execution loop for the producer thread.
 
-        Iterates the source, optionally sleeps to simulate work, then attempts
-        to enqueue each item. If the buffer is full, retries until successful
-        or until stop_event is set (prevents data loss under contention).
+        Iterates the source, optionally sleeps to simulate work, waits for
+        the configured rate limiters, then attempts to enqueue each item. If
+        the buffer is full, retries until successful or until stop_event is
+        set (prevents data loss under contention). With a backoff controller,
+        each attempt's outcome and the buffer occupancy adjust the pacing,
+        and retries wait for the (reduced) rate instead of spinning.
         """
         self._log.info("Producer %s started", self.producer_id)
 
+        limiters = (self.global_rate_limiter, self.rate_limiter, self.backoff)
+
         try:
             for item in self.source:
                 if self.stop_event.is_set():
@@ -82,9 +128,19 @@ class Producer(threading.Thread):
                 if self.production_delay > 0:
                     time.sleep(self.production_delay)
 
+                if not self._acquire_permits(limiters):
+                    self._log.info(
+                        "Producer %s stopping while rate limited", self.producer_id
+                    )
+                    break
+
                 while not self.stop_event.is_set():
-                    if self.shared_buffer.put(item, timeout=0.5):
-                        self.items_produced += 1
+                    accepted = self.shared_buffer.put(item, timeout=0.5)
+                    if self.backoff is not None:
+                        self.backoff.record(accepted, self._occupancy())
+
+                    if accepted:
+                        self.stats.incr("produced")
                         self._log.info(
                             "Producer %s produced: %r (total: %d)",
                             self.producer_id,
@@ -93,9 +149,12 @@ class Producer(threading.Thread):
                         )
                         break 
 
+                    self.stats.incr("put_retries")
                     self._log.debug(
                         "Producer %s retrying put for: %r", self.producer_id, item
                     )
+                    if self.backoff is not None:
+                        self.backoff.acquire(stop_event=self.stop_event)
 
                 if self.stop_event.is_set():
                     self._log.info(
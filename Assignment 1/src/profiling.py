@@ -0,0 +1,166 @@
+"""
+Profiling Module
+
+Runtime-toggleable contention profiler. When enabled, SharedBuffer and
+Consumer time their blocking points (lock acquisition, _wait_until and the
+condition waits inside it, join, destination_lock) with perf_counter_ns and
+attribute the time to the calling thread and call site. Results can be
+exported as flamegraph-compatible folded stacks or as a summary table.
+When disabled, instrumented code pays a single attribute check.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Dict, Iterator, List, Tuple
+
+_log = logging.getLogger(__name__)
+
+# Per-site accumulator: [count, total_ns, max_ns].
+_Record = List[int]
+
+
+class ContentionProfiler:
+    """
+    Collects blocked/wait time per (thread, call site).
+
+    Each thread writes only to its own table (found via threading.local), so
+    recording never takes a shared lock. Call sites are ';'-separated frame
+    paths such as "SharedBuffer.put;_wait_until;cond.wait"; values recorded
+    for a site are self time, so folded output sums correctly in a
+    flamegraph.
+
+    Attributes:
+        enabled: Whether instrumented code should record timings. May be
+            flipped at any time from any thread.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._local = threading.local()
+        self._tables_lock = threading.Lock()
+        self._tables: List[Tuple[str, Dict[str, _Record]]] = []
+
+    def enable(self) -> None:
+        """Start recording."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording (collected data is kept)."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard all collected data."""
+        with self._tables_lock:
+            self._tables = []
+            self._local = threading.local()
+
+    def _table(self) -> Dict[str, _Record]:
+        table = getattr(self._local, "table", None)
+        if table is None:
+            table = {}
+            self._local.table = table
+            with self._tables_lock:
+                self._tables.append((threading.current_thread().name, table))
+        return table
+
+    def record(self, site: str, elapsed_ns: int) -> None:
+        """Add one observation of elapsed_ns for site on the current thread."""
+        table = self._table()
+        rec = table.get(site)
+        if rec is None:
+            table[site] = [1, elapsed_ns, elapsed_ns]
+        else:
+            rec[0] += 1
+            rec[1] += elapsed_ns
+            if elapsed_ns > rec[2]:
+                rec[2] = elapsed_ns
+
+    @contextmanager
+    def acquire(self, lock, site: str) -> Iterator[None]:
+        """
+        Acquire lock, recording time spent blocked under site.
+
+        An uncontended acquire (non-blocking attempt succeeds) is recorded as
+        a zero-duration observation so hit counts remain meaningful.
+        """
+        if lock.acquire(blocking=False):
+            self.record(site, 0)
+        else:
+            start = perf_counter_ns()
+            lock.acquire()
+            self.record(site, perf_counter_ns() - start)
+        try:
+            yield
+        finally:
+            lock.release()
+
+    def has_data(self) -> bool:
+        """Whether anything has been recorded."""
+        return any(table for _, table in list(self._tables))
+
+    def _snapshot(self) -> List[Tuple[str, str, _Record]]:
+        rows = []
+        for thread_name, table in list(self._tables):
+            for site, rec in list(table.items()):
+                rows.append((thread_name, site, list(rec)))
+        return rows
+
+    def folded(self) -> List[str]:
+        """
+        Folded-stack lines ("thread;frame;frame value") with values in
+        microseconds, as consumed by flamegraph.pl / speedscope.
+        """
+        merged: Dict[str, int] = {}
+        for thread_name, site, rec in self._snapshot():
+            key = f"{thread_name};{site}"
+            merged[key] = merged.get(key, 0) + rec[1]
+        return [f"{stack} {ns // 1000}" for stack, ns in sorted(merged.items()) if ns >= 1000]
+
+    def dump_folded(self, path: str | Path) -> Path:
+        """Write folded stacks to path and return it."""
+        out = Path(path)
+        out.write_text("\n".join(self.folded()) + "\n", encoding="utf-8")
+        return out
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate per call site across threads.
+
+        Returns:
+            Dict mapping site -> {count, total_ms, mean_us, max_us, threads},
+            ordered by total time descending.
+        """
+        agg: Dict[str, Dict[str, float]] = {}
+        threads: Dict[str, set] = {}
+        for thread_name, site, (count, total, peak) in self._snapshot():
+            row = agg.setdefault(site, {"count": 0, "total_ns": 0, "max_ns": 0})
+            row["count"] += count
+            row["total_ns"] += total
+            row["max_ns"] = max(row["max_ns"], peak)
+            threads.setdefault(site, set()).add(thread_name)
+
+        out: Dict[str, Dict[str, float]] = {}
+        for site, row in sorted(agg.items(), key=lambda kv: kv[1]["total_ns"], reverse=True):
+            out[site] = {
+                "count": row["count"],
+                "total_ms": round(row["total_ns"] / 1e6, 3),
+                "mean_us": round(row["total_ns"] / row["count"] / 1e3, 3) if row["count"] else 0.0,
+                "max_us": round(row["max_ns"] / 1e3, 3),
+                "threads": len(threads[site]),
+            }
+        return out
+
+    def format_summary(self) -> str:
+        """Human-readable summary table."""
+        lines = [f"{'site':48s} {'count':>8s} {'total_ms':>10s} {'mean_us':>10s} {'max_us':>10s} {'threads':>7s}"]
+        for site, row in self.summary().items():
+            lines.append(
+                f"{site[:48]:48s} {row['count']:8d} {row['total_ms']:10.3f} "
+                f"{row['mean_us']:10.3f} {row['max_us']:10.3f} {row['threads']:7d}"
+            )
+        return "\n".join(lines)
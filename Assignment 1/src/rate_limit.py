@@ -0,0 +1,210 @@
+"""
+Rate Limiting Module
+
+Flow-control primitives for producers: a token bucket (bursty, average-rate
+limited), a leaky bucket (smooth, evenly spaced), and an AIMD controller that
+adapts a producer's rate to buffer occupancy. All limiters are thread-safe,
+so a single instance can be shared across producers as a global limit.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from time import monotonic
+from typing import Optional, Protocol
+
+
+def _sleep(delay: float, stop_event: Optional[threading.Event]) -> bool:
+    """
+    Sleep for delay seconds, waking early if stop_event is set.
+    Returns True if the full delay elapsed, False if stopped.
+    """
+    if stop_event is None:
+        time.sleep(delay)
+        return True
+    return not stop_event.wait(delay)
+
+
+class RateLimiter(Protocol):
+    """Interface shared by all limiters: block until one item may proceed."""
+
+    def acquire(self, tokens: float = 1.0, stop_event: Optional[threading.Event] = None) -> bool:
+        ...
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    acquire() consumes tokens and blocks until enough are available. Allows
+    bursts of up to `capacity` items while bounding the long-run rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """
+        Initialize the bucket (starts full).
+
+        Args:
+            rate: Refill rate in tokens per second (must be > 0).
+            capacity: Maximum burst size; defaults to max(1, rate).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        capacity = max(1.0, rate) if capacity is None else capacity
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._last = monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if available without blocking.
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds to wait
+            before enough tokens will have accumulated.
+        """
+        if tokens > self.capacity:
+            raise ValueError("tokens exceeds bucket capacity")
+        with self._lock:
+            self._refill(monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Block until tokens are taken.
+        Returns True on success, or False if stop_event was set while waiting.
+        """
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if not _sleep(wait, stop_event):
+                return False
+
+
+class LeakyBucket:
+    """
+    Leaky-bucket (virtual scheduling) rate limiter.
+
+    Each acquire() reserves the next free slot, spaced exactly 1/rate apart,
+    and sleeps until that slot. Produces a smooth, burst-free output rate.
+    """
+
+    def __init__(self, rate: float) -> None:
+        """
+        Args:
+            rate: Items per second (must be > 0).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self._next = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Block until this caller's slot arrives.
+        Returns True on success, or False if stop_event was set while waiting.
+        """
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next)
+            self._next = slot + tokens / self.rate
+        delay = slot - now
+        if delay <= 0:
+            return True
+        return _sleep(delay, stop_event)
+
+
+class AIMDController:
+    """
+    Additive-increase / multiplicative-decrease pacing driven by occupancy.
+
+    The producer paces itself at the current rate. After each put attempt it
+    reports the outcome and the buffer fill ratio: a successful put below the
+    high watermark raises the rate by `increase` items/s; a timed-out put or
+    an occupancy at or above the watermark multiplies the rate by `decrease`.
+    This converges on the highest rate the consumers can sustain without
+    spinning on put() timeouts.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 100.0,
+        min_rate: float = 1.0,
+        max_rate: float = 10_000.0,
+        increase: float = 10.0,
+        decrease: float = 0.5,
+        high_watermark: float = 0.8,
+    ) -> None:
+        """
+        Args:
+            initial_rate: Starting rate in items per second.
+            min_rate: Lower bound for the rate (must be > 0).
+            max_rate: Upper bound for the rate.
+            increase: Additive step applied on an uncongested success.
+            decrease: Multiplicative factor (0 < decrease < 1) on congestion.
+            high_watermark: Fill ratio (0-1] treated as congestion.
+        """
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError("require 0 < min_rate <= initial_rate <= max_rate")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be in (0, 1)")
+        if not 0 < high_watermark <= 1:
+            raise ValueError("high_watermark must be in (0, 1]")
+
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.high_watermark = float(high_watermark)
+        self._rate = float(initial_rate)
+        self._next = monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """Current pacing rate in items per second."""
+        return self._rate
+
+    def record(self, success: bool, occupancy: float) -> None:
+        """
+        Feed back the result of a put attempt.
+
+        Args:
+            success: Whether the put was accepted before its timeout.
+            occupancy: Buffer fill ratio (size / max_size) after the attempt.
+        """
+        with self._lock:
+            if success and occupancy < self.high_watermark:
+                self._rate = min(self.max_rate, self._rate + self.increase)
+            else:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+
+    def acquire(self, tokens: float = 1.0, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Block until the next slot at the current rate.
+        Returns True on success, or False if stop_event was set while waiting.
+        """
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next)
+            self._next = slot + tokens / self._rate
+        delay = slot - now
+        if delay <= 0:
+            return True
+        return _sleep(delay, stop_event)
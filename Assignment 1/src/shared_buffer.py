@@ -3,18 +3,24 @@ Shared Buffer Module
 
 Thread-safe bounded buffer implemented with an explicit mutex and
 condition variables (wait/notify). Supports blocking put/get with
-optional timeouts and join/task_done coordination.
+optional timeouts and join/task_done coordination. An optional
+ContentionProfiler times lock acquisition and condition waits.
 """
 
 from __future__ import annotations
 
-from time import monotonic
-from typing import Deque, Generic, Optional, TypeVar
+from time import monotonic, perf_counter_ns
+from typing import Callable, Deque, Generic, List, Optional, Tuple, TypeVar
 from collections import deque
 import threading
 
+from .profiling import ContentionProfiler
+
 T = TypeVar("T")
 
+# Internal marker distinguishing a get() timeout from a stored None item.
+_TIMEOUT = object()
+
 
 class QueueClosed(RuntimeError):
     """Raised when operations are attempted on a closed buffer."""
@@ -29,9 +35,10 @@ class SharedBuffer(Generic[T]):
     - get(timeout): blocks when empty; returns None on timeout.
     - task_done(): marks a retrieved item as fully processed.
     - join(): blocks until all put items have a matching task_done().
+    - get_sequenced(timeout): like get(), plus the item's FIFO sequence number.
     """
 
-    def __init__(self, max_size: int = 10) -> None:
+    def __init__(self, max_size: int = 10, profiler: Optional[ContentionProfiler] = None) -> None:
         if max_size <= 0:
             raise ValueError("max_size must be positive")
 
@@ -48,31 +55,72 @@ class SharedBuffer(Generic[T]):
 
         self._closed: bool = False
 
+        # Number of items removed so far; doubles as the next dequeue sequence.
+        self._dequeued: int = 0
+
+        # Callbacks fired (under the lock) after each put and on close.
+        self._put_listeners: List[Callable[[], None]] = []
+
+        # Optional contention profiler; consulted only when enabled.
+        self._profiler = profiler
+
     # ----------------------------
     # Internal helpers
     # ----------------------------
 
-    def _wait_until(self, predicate, timeout: Optional[float], cond=None) -> bool:
+    def _locked(self, site: str):
+        """
+        Context manager acquiring self._lock; timed when profiling is on.
+        """
+        prof = self._profiler
+        if prof is None or not prof.enabled:
+            return self._lock
+        return prof.acquire(self._lock, site)
+
+    def _wait_until(self, predicate, timeout: Optional[float], cond=None, site: Optional[str] = None) -> bool:
         """
         Wait (under self._lock) until predicate() becomes True or timeout elapses.
         Returns True if predicate became True; False on timeout.
+
+        When profiling is on and a site is given, time spent inside cond.wait
+        is recorded under "<site>;cond.wait" and the remaining loop overhead
+        under site itself.
         """
         if cond is None:
             cond = self._not_empty
 
-        if timeout is None:
+        wait = cond.wait
+        prof = self._profiler
+        profiling = site is not None and prof is not None and prof.enabled
+        if profiling:
+            started = perf_counter_ns()
+            waited = [0]
+
+            def wait(timeout: Optional[float] = None) -> bool:
+                t0 = perf_counter_ns()
+                try:
+                    return cond.wait(timeout)
+                finally:
+                    waited[0] += perf_counter_ns() - t0
+
+        try:
+            if timeout is None:
+                while not predicate():
+                    wait()
+                return True
+
+            deadline = monotonic() + timeout
+            remaining = timeout
             while not predicate():
-                cond.wait()
+                if remaining <= 0:
+                    return False
+                wait(timeout=remaining)
+                remaining = deadline - monotonic()
             return True
-
-        deadline = monotonic() + timeout
-        remaining = timeout
-        while not predicate():
-            if remaining <= 0:
-                return False
-            cond.wait(timeout=remaining)
-            remaining = deadline - monotonic()
-        return True
+        finally:
+            if profiling:
+                prof.record(f"{site};cond.wait", waited[0])
+                prof.record(site, perf_counter_ns() - started - waited[0])
 
 
 
@@ -82,7 +130,7 @@ class SharedBuffer(Generic[T]):
         Returns True if enqueued, or False if the timeout elapsed.
         Raises QueueClosed if the buffer was closed before/while waiting.
         """
-        with self._lock:
+        with self._locked("SharedBuffer.put;lock"):
             if self._closed:
                 raise QueueClosed("Buffer is closed")
 
@@ -90,7 +138,7 @@ class SharedBuffer(Generic[T]):
                 return (not self._closed) and (len(self._q) < self._max)
 
             if not can_put():
-                if not self._wait_until(can_put, timeout, self._not_full):
+                if not self._wait_until(can_put, timeout, self._not_full, "SharedBuffer.put;_wait_until"):
                     return False
                 if self._closed:
                     raise QueueClosed("Buffer is closed")
@@ -98,39 +146,70 @@ class SharedBuffer(Generic[T]):
             self._q.append(item)
             self._unfinished_tasks += 1
             self._not_empty.notify()
+            for listener in self._put_listeners:
+                listener()
             return True
 
+    def _take(self, timeout: Optional[float], site: str):
+        """
+        Remove and return the head item (caller holds self._lock).
+        Returns _TIMEOUT if the timeout elapsed. site names the caller for
+        the profiler.
+        """
+        def can_get() -> bool:
+            if self._closed and not self._q:
+                return True
+            return bool(self._q)
+
+        if not can_get():
+            if not self._wait_until(can_get, timeout, self._not_empty, f"{site};_wait_until"):
+                return _TIMEOUT
+
+        if self._closed and not self._q:
+            raise QueueClosed("Buffer is closed")
+
+        item = self._q.popleft()
+        self._dequeued += 1
+
+        self._not_full.notify()
+        return item
+
     def get(self, timeout: Optional[float] = None) -> Optional[T]:
         """
         Dequeue and return an item. Blocks while the buffer is empty.
         Returns None if the timeout elapsed.
         Raises QueueClosed if the buffer is closed and empty.
         """
-        with self._lock:
-            def can_get() -> bool:
-            
-                if self._closed and not self._q:
-                    return True  
-                return bool(self._q)
+        with self._locked("SharedBuffer.get;lock"):
+            item = self._take(timeout, "SharedBuffer.get")
+            return None if item is _TIMEOUT else item
 
-            if not can_get():
-                if not self._wait_until(can_get, timeout, self._not_empty):
-                    return None
+    def get_sequenced(self, timeout: Optional[float] = None) -> Optional[Tuple[int, T]]:
+        """
+        Dequeue an item together with its sequence number.
 
-            if self._closed and not self._q:
-                raise QueueClosed("Buffer is closed")
+        Sequence numbers start at 0 and are assigned under the lock at
+        removal time. Because the buffer is FIFO, they follow the order in
+        which producers enqueued items, which lets downstream stages restore
+        that order after out-of-order processing.
 
-            item = self._q.popleft()
-            
-            self._not_full.notify()
-            return item
+        Returns:
+            (sequence, item), or None if the timeout elapsed.
+        Raises:
+            QueueClosed if the buffer is closed and empty.
+        """
+        with self._locked("SharedBuffer.get_sequenced;lock"):
+            item = self._take(timeout, "SharedBuffer.get_sequenced")
+            if item is _TIMEOUT:
+                return None
+            return self._dequeued - 1, item
 
     def task_done(self) -> None:
         """
         Indicate that a previously enqueued task is complete.
         Must be called once for each item removed by get().
         """
-        with self._lock:
+        with self._locked("SharedBuffer.task_done;lock"):
             if self._unfinished_tasks <= 0:
                 raise ValueError("task_done() called too many times")
             self._unfinished_tasks -= 1
@@ -142,9 +221,13 @@ class SharedBuffer(Generic[T]):
         Block until all items put into the buffer have been processed
         (i.e., until unfinished_tasks drops to zero).
         """
-        with self._lock:
-            while self._unfinished_tasks:
-                self._all_tasks_done.wait()
+        with self._locked("SharedBuffer.join;lock"):
+            self._wait_until(
+                lambda: not self._unfinished_tasks,
+                None,
+                self._all_tasks_done,
+                "SharedBuffer.join;_wait_until",
+            )
 
     def close(self) -> None:
         """
@@ -160,27 +243,51 @@ class SharedBuffer(Generic[T]):
                 self._not_empty.notify_all()
                 self._not_full.notify_all()
                 self._all_tasks_done.notify_all()
+                for listener in self._put_listeners:
+                    listener()
 
+    def add_put_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register a callback invoked after every successful put() and on close().
 
-    def size(self) -> int:
+        Lets a reader wait on several buffers at once. The callback runs while
+        the buffer lock is held, so it must be fast and must not call back
+        into this buffer (e.g., threading.Event.set).
+        """
         with self._lock:
-            return len(self._q)
+            self._put_listeners.append(listener)
+
+    # ----------------------------
+    # Lock-free introspection
+    # ----------------------------
+    # These reads deliberately skip self._lock so that monitoring at high
+    # frequency never contends with put/get. len() on a deque and reads of
+    # plain attributes are atomic under the GIL; the values are approximate
+    # snapshots that may be stale by the time the caller inspects them.
+
+    def size(self) -> int:
+        """Approximate current occupancy (lock-free)."""
+        return len(self._q)
 
     def is_empty(self) -> bool:
-        with self._lock:
-            return len(self._q) == 0
+        """Approximate emptiness check (lock-free)."""
+        return len(self._q) == 0
 
     def is_full(self) -> bool:
-        with self._lock:
-            return len(self._q) >= self._max
+        """Approximate fullness check (lock-free)."""
+        return len(self._q) >= self._max
+
+    @property
+    def max_size(self) -> int:
+        """Configured capacity of the buffer."""
+        return self._max
 
     def __len__(self) -> int:
         return self.size()
 
     def __repr__(self) -> str:
-        with self._lock:
-            return (
-                f"{self.__class__.__name__}(max_size={self._max}, "
-                f"size={len(self._q)}, closed={self._closed}, "
-                f"unfinished_tasks={self._unfinished_tasks})"
-            )
+        return (
+            f"{self.__class__.__name__}(max_size={self._max}, "
+            f"size={len(self._q)}, closed={self._closed}, "
+            f"unfinished_tasks={self._unfinished_tasks})"
+        )
@@ -0,0 +1,96 @@
+"""
+Statistics Module
+
+Per-thread counters aggregated on read. Each worker thread owns a
+ThreadStats instance and is its only writer, so increments never take a
+lock; readers (dashboards, get_statistics) sum over snapshots instead of
+contending with the put/get hot path.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List
+
+
+class ThreadStats:
+    """
+    Single-writer counter set owned by one thread.
+
+    Only the owning thread may call incr(); any thread may call get() or
+    snapshot(). Under CPython, int rebinding and dict.copy() are atomic, so
+    readers see a consistent (possibly slightly stale) view without locking.
+
+    Attributes:
+        name: Label used when reporting per-thread statistics.
+    """
+
+    __slots__ = ("name", "_counts")
+
+    def __init__(self, name: str, keys: Iterable[str] = ()) -> None:
+        """
+        Initialize the counter set.
+
+        Args:
+            name: Label for this thread's counters.
+            keys: Counter names to pre-register with a value of 0.
+        """
+        self.name = name
+        self._counts: Dict[str, int] = {k: 0 for k in keys}
+
+    def incr(self, key: str, n: int = 1) -> None:
+        """Add n to a counter. Must only be called by the owning thread."""
+        self._counts[key] = self._counts.get(key, 0) + n
+
+    def get(self, key: str) -> int:
+        """Return the current value of a counter (0 if never incremented)."""
+        return self._counts.get(key, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        """Return a point-in-time copy of all counters."""
+        return self._counts.copy()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r}, counts={self._counts!r})"
+
+
+class StatsRegistry:
+    """
+    Registry of per-thread counters with lock-free aggregation on read.
+
+    Registration takes a lock (it happens once per thread at setup time);
+    reads copy the registered list and sum snapshots without blocking any
+    writer.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._threads: List[ThreadStats] = []
+
+    def register(self, name: str, keys: Iterable[str] = ()) -> ThreadStats:
+        """
+        Create and register a counter set for one thread.
+
+        Args:
+            name: Label for the thread (e.g., "Producer-1").
+            keys: Counter names to pre-register.
+
+        Returns:
+            The ThreadStats instance the thread should write to.
+        """
+        stats = ThreadStats(name, keys)
+        with self._lock:
+            self._threads.append(stats)
+        return stats
+
+    def totals(self) -> Dict[str, int]:
+        """Sum every counter across all registered threads."""
+        out: Dict[str, int] = {}
+        for stats in list(self._threads):
+            for key, value in stats.snapshot().items():
+                out[key] = out.get(key, 0) + value
+        return out
+
+    def per_thread(self) -> Dict[str, Dict[str, int]]:
+        """Return a snapshot of counters keyed by thread name."""
+        return {stats.name: stats.snapshot() for stats in list(self._threads)}
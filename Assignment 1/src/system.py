@@ -9,11 +9,18 @@ from __future__ import annotations
 
 import logging
 import threading
-from typing import Any, List
-
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Union
+
+from .partitioning import PartitionedBuffer
+from .processing import ReorderBuffer
+from .profiling import ContentionProfiler
+from .rate_limit import AIMDController, RateLimiter
 from .shared_buffer import SharedBuffer
 from .producer import Producer
 from .consumer import Consumer
+from .stats import StatsRegistry
 
 _log = logging.getLogger(__name__)
 
@@ -25,34 +32,85 @@ class ProducerConsumerSystem:
     Responsibilities:
         - Lifecycle management for producer/consumer threads
         - Coordinated, lossless shutdown (graceful mode)
-        - Aggregated system statistics
+        - Aggregated system statistics (per-thread counters, summed on read)
 
     Attributes:
-        shared_buffer: The shared bounded buffer instance.
+        shared_buffer: The shared bounded buffer instance (a PartitionedBuffer
+            in partitioned mode).
         stop_event: Event to signal cooperative shutdown to all threads.
         destination_lock: Shared lock to guard the shared destination list.
         producers: List of producer threads.
         consumers: List of consumer threads.
+        stats: Registry of per-thread counters for producers and consumers.
+        global_rate_limiter: Optional limiter shared by every producer.
+        executor: Optional executor shared by consumers for item processing.
+        reorder_buffer: ReorderBuffer used when ordered output is enabled.
+        profiler: ContentionProfiler shared by buffers and consumers.
+        profile_path: Where to write folded stacks at graceful shutdown.
     """
 
-    def __init__(self, buffer_size: int = 10) -> None:
+    def __init__(
+        self,
+        buffer_size: int = 10,
+        global_rate_limiter: Optional[RateLimiter] = None,
+        executor: Optional[Executor] = None,
+        ordered_output: bool = False,
+        num_partitions: int = 1,
+        partition_key: Optional[Callable[[Any], Any]] = None,
+        profile: bool = False,
+        profile_path: Optional[Union[str, Path]] = None,
+    ) -> None:
         """
         Initialize the producer-consumer system.
 
         Args:
             buffer_size: Maximum size of the shared buffer (must be > 0).
+            global_rate_limiter: Optional limiter (e.g., TokenBucket) capping
+                the combined rate of all producers.
+            executor: Optional ThreadPoolExecutor/ProcessPoolExecutor shared by
+                all consumers for their processor work. The caller owns it.
+            ordered_output: If True, consumers append results in the order
+                items were enqueued, even when processing completes out of order.
+            num_partitions: Number of buffers K. With K > 1, items are routed by
+                a stable hash of partition_key(item) and each consumer owns a
+                disjoint set of partitions, preserving per-key ordering.
+                buffer_size then applies to each partition.
+            partition_key: Routing key extractor (e.g., lambda t: t.customer_id);
+                defaults to the item itself.
+            profile: Start with contention profiling enabled. It can also be
+                toggled at runtime via enable_profiling()/disable_profiling().
+            profile_path: If set, shutdown_gracefully() writes the collected
+                wait times here as flamegraph-compatible folded stacks.
         """
-        self.shared_buffer = SharedBuffer(max_size=buffer_size)
+        if num_partitions > 1 and ordered_output:
+            raise ValueError("ordered_output is not supported with partitions")
+
+        self.profiler = ContentionProfiler(enabled=profile)
+        self.profile_path = profile_path
+
+        self.shared_buffer: Union[SharedBuffer, PartitionedBuffer]
+        if num_partitions > 1:
+            self.shared_buffer = PartitionedBuffer(
+                num_partitions, buffer_size, partition_key, profiler=self.profiler
+            )
+        else:
+            self.shared_buffer = SharedBuffer(max_size=buffer_size, profiler=self.profiler)
         self.stop_event = threading.Event()
         self.destination_lock = threading.Lock()  # Shared lock for destination list
         self.producers: List[Producer] = []
         self.consumers: List[Consumer] = []
+        self.stats = StatsRegistry()
+        self.global_rate_limiter = global_rate_limiter
+        self.executor = executor
+        self.reorder_buffer = ReorderBuffer(self.destination_lock) if ordered_output else None
 
     def add_producer(
         self,
         producer_id: int,
         source: List[Any],
         production_delay: float = 0.01,
+        rate_limiter: Optional[RateLimiter] = None,
+        backoff: Optional[AIMDController] = None,
     ) -> Producer:
         """
         Add a producer to the system.
@@ -61,6 +119,8 @@ class ProducerConsumerSystem:
             producer_id: Unique identifier for the producer.
             source: Items for the producer to emit into the buffer.
             production_delay: Optional delay between productions (simulate work).
+            rate_limiter: Optional per-producer limiter (TokenBucket/LeakyBucket).
+            backoff: Optional AIMD controller adapting the rate to occupancy.
 
         Returns:
             The created Producer instance (not yet started).
@@ -71,6 +131,10 @@ class ProducerConsumerSystem:
             shared_buffer=self.shared_buffer,
             stop_event=self.stop_event,
             production_delay=production_delay,
+            stats=self.stats.register(f"Producer-{producer_id}", Producer.STAT_KEYS),
+            rate_limiter=rate_limiter,
+            global_rate_limiter=self.global_rate_limiter,
+            backoff=backoff,
         )
         self.producers.append(producer)
         return producer
@@ -80,6 +144,7 @@ class ProducerConsumerSystem:
         consumer_id: int,
         destination: List[Any],
         consumption_delay: float = 0.01,
+        processor: Optional[Callable[[Any], Any]] = None,
     ) -> Consumer:
         """
         Add a consumer to the system.
@@ -88,6 +153,8 @@ class ProducerConsumerSystem:
             consumer_id: Unique identifier for the consumer.
             destination: Shared list to store consumed items.
             consumption_delay: Optional delay between consumptions (simulate work).
+            processor: Optional callable applied to each item (on the system
+                executor when one is configured); results are stored instead.
 
         Returns:
             The created Consumer instance (not yet started).
@@ -99,19 +166,42 @@ class ProducerConsumerSystem:
             shared_buffer=self.shared_buffer,
             stop_event=self.stop_event,
             consumption_delay=consumption_delay,
+            stats=self.stats.register(f"Consumer-{consumer_id}", Consumer.STAT_KEYS),
+            processor=processor,
+            executor=self.executor if processor is not None else None,
+            reorder_buffer=self.reorder_buffer,
+            profiler=self.profiler,
         )
         self.consumers.append(consumer)
         return consumer
 
+    def _assign_partitions(self) -> None:
+        """
+        Give each consumer a reader over its own partitions.
+
+        Partition p is owned by consumer p % num_consumers, so every key is
+        consumed by exactly one thread.
+        """
+        partitions = self.shared_buffer.partitions
+        if len(partitions) < len(self.consumers):
+            raise ValueError("num_partitions must be >= number of consumers")
+        n = len(self.consumers)
+        for idx, consumer in enumerate(self.consumers):
+            consumer.shared_buffer = self.shared_buffer.reader(range(idx, len(partitions), n))
+
     def start(self) -> None:
         """
         Start all producer and consumer threads.
 
         Note:
             Consumers are started first so they are ready to receive items.
+            In partitioned mode, partitions are assigned to consumers here.
         """
         _log.info("Starting producer-consumer system")
 
+        if isinstance(self.shared_buffer, PartitionedBuffer):
+            self._assign_partitions()
+
         # Start consumers first to be ready for items
         for consumer in self.consumers:
             consumer.start()
@@ -146,14 +236,18 @@ class ProducerConsumerSystem:
         _log.debug("Waiting for buffer to drain via join()")
         self.shared_buffer.join()
 
-        for _ in self.consumers:
-            while not self.shared_buffer.put(Consumer.POISON_PILL, timeout=0.5):
+        # Each consumer's own view: the shared buffer, or its first partition.
+        for consumer in self.consumers:
+            while not consumer.shared_buffer.put(Consumer.POISON_PILL, timeout=0.5):
                 _log.debug("Retrying poison-pill enqueue...")
         
         self.shared_buffer.join()
         for consumer in self.consumers:
             consumer.join()
 
+        if self.profiler.has_data():
+            self._report_profile()
+
         _log.info("System shutdown complete")
 
     def shutdown_forcefully(self) -> None:
@@ -175,10 +269,31 @@ class ProducerConsumerSystem:
 
         _log.info("Forceful shutdown complete")
 
+    def enable_profiling(self) -> None:
+        """Start recording lock and wait contention (safe while running)."""
+        self.profiler.enable()
+
+    def disable_profiling(self) -> None:
+        """Stop recording contention; data collected so far is kept."""
+        self.profiler.disable()
+
+    def _report_profile(self) -> None:
+        """Log the contention summary and write folded stacks if configured."""
+        _log.info("Contention profile:\n%s", self.profiler.format_summary())
+        if self.profile_path is not None:
+            path = self.profiler.dump_folded(self.profile_path)
+            _log.info("Wrote folded contention stacks to %s", path)
+
     def get_statistics(self) -> dict:
         """
         Return aggregated system statistics.
 
+        Safe to call at high frequency while the system is running: counters
+        are summed from per-thread snapshots and buffer occupancy is read
+        without taking the buffer lock, so polling never contends with
+        put/get. Values are approximate while threads are active and exact
+        at quiescence.
+
         Returns:
             Dictionary containing:
                 - num_producers: Number of producer threads.
@@ -188,8 +303,9 @@ class ProducerConsumerSystem:
                 - buffer_size: Current buffer occupancy.
                 - items_in_transit: Produced minus consumed (>= 0 during runtime).
         """
-        total_produced = sum(p.items_produced for p in self.producers)
-        total_consumed = sum(c.items_consumed for c in self.consumers)
+        totals = self.stats.totals()
+        total_produced = totals.get("produced", 0)
+        total_consumed = totals.get("consumed", 0)
 
         return {
             "num_producers": len(self.producers),
@@ -199,3 +315,13 @@ class ProducerConsumerSystem:
             "buffer_size": self.shared_buffer.size(),
             "items_in_transit": total_produced - total_consumed,
         }
+
+    def get_thread_statistics(self) -> dict:
+        """
+        Return a lock-free snapshot of every thread's counters.
+
+        Returns:
+            Dictionary mapping thread name (e.g. "Producer-1") to its counters
+            ("produced"/"put_retries" or "consumed"/"get_timeouts").
+        """
+        return self.stats.per_thread()
@@ -0,0 +1,103 @@
+"""
+Unit tests for keyed partitioning.
+
+Covers stable routing, multi-partition readers, and end-to-end per-key
+ordering with each key consumed by a single consumer.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+import unittest
+from collections import defaultdict
+from typing import Any, Dict, List
+
+# Allow "src" imports when running this file directly.
+sys.path.insert(0, "..")
+
+from src import ProducerConsumerSystem  # type: ignore
+from src.partitioning import PartitionedBuffer, stable_hash  # type: ignore
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class TestPartitionedBuffer(unittest.TestCase):
+    """Unit test cases for PartitionedBuffer and PartitionReader."""
+
+    def test_same_key_same_partition(self) -> None:
+        """Items sharing a key always route to the same partition."""
+        buf = PartitionedBuffer(4, max_size=10, key_fn=lambda item: item[0])
+        self.assertEqual(buf.partition_for(("cust-1", 1)), buf.partition_for(("cust-1", 2)))
+        self.assertEqual(stable_hash("abc"), stable_hash("abc"))
+
+    def test_reader_blocks_until_owned_partition_put(self) -> None:
+        """A reader waiting on several partitions wakes on a put to any of them."""
+        buf = PartitionedBuffer(2, max_size=5, key_fn=lambda item: item)
+        reader = buf.reader([0, 1])
+        got: List[Any] = []
+
+        t = threading.Thread(target=lambda: got.append(reader.get(timeout=2.0)))
+        t.start()
+        time.sleep(0.05)
+        buf.put(7)
+        t.join()
+
+        self.assertEqual(got, [7])
+        reader.task_done()
+        buf.join()
+
+    def test_reader_timeout(self) -> None:
+        """get() on empty owned partitions honors the timeout."""
+        reader = PartitionedBuffer(2).reader([0, 1])
+        t0 = time.monotonic()
+        self.assertIsNone(reader.get(timeout=0.2))
+        self.assertGreaterEqual(time.monotonic() - t0, 0.18)
+
+
+class TestPartitionedSystem(unittest.TestCase):
+    """End-to-end tests for partitioned ProducerConsumerSystem."""
+
+    def test_per_key_order_and_ownership(self) -> None:
+        """Each key is consumed by one consumer, in production order."""
+        # Disjoint key sets per producer, so per-key order is well defined.
+        sources = [[(f"P{p}-C{i % 6}", p, i) for i in range(20)] for p in range(2)]
+        owners: Dict[str, set] = defaultdict(set)
+        destination: List[Any] = []
+
+        system = ProducerConsumerSystem(buffer_size=4, num_partitions=6, partition_key=lambda t: t[0])
+        for i, src in enumerate(sources, start=1):
+            system.add_producer(i, src, production_delay=0)
+        for i in range(3):
+            system.add_consumer(
+                i + 1,
+                destination,
+                consumption_delay=0,
+                processor=lambda t: (threading.current_thread().name, t),
+            )
+
+        system.start()
+        system.shutdown_gracefully()
+
+        self.assertEqual(len(destination), 40)
+        per_key: Dict[str, List[int]] = defaultdict(list)
+        for thread_name, (key, _, seq) in destination:
+            owners[key].add(thread_name)
+            per_key[key].append(seq)
+        self.assertTrue(all(len(names) == 1 for names in owners.values()))
+        self.assertTrue(all(seqs == sorted(seqs) for seqs in per_key.values()))
+        self.assertEqual(system.get_statistics()["total_consumed"], 40)
+
+    def test_more_consumers_than_partitions_rejected(self) -> None:
+        """Every consumer must own at least one partition."""
+        system = ProducerConsumerSystem(num_partitions=2)
+        for i in range(3):
+            system.add_consumer(i + 1, [])
+        with self.assertRaises(ValueError):
+            system.start()
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,146 @@
+"""
+Unit tests for consumer-side parallel processing.
+
+Covers ReorderBuffer sequencing and end-to-end processing on thread and
+process pools, with and without ordered output.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List
+
+# Allow "src" imports when running this file directly.
+sys.path.insert(0, "..")
+
+from src import ProducerConsumerSystem  # type: ignore
+from src.processing import ReorderBuffer  # type: ignore
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+def _jittered_double(x: int) -> int:
+    time.sleep(random.uniform(0, 0.003))
+    return 2 * x
+
+
+class TestReorderBuffer(unittest.TestCase):
+    """Unit test cases for ReorderBuffer."""
+
+    def test_out_of_order_submissions_flush_in_order(self) -> None:
+        """Results are held until the gap fills, then flushed in sequence."""
+        out: List[Any] = []
+        rb = ReorderBuffer()
+        rb.submit(2, out, "c")
+        rb.submit(1, out, "b")
+        self.assertEqual(out, [])
+        self.assertEqual(rb.pending(), 2)
+        rb.submit(0, out, "a")
+        self.assertEqual(out, ["a", "b", "c"])
+        self.assertEqual(rb.pending(), 0)
+
+    def test_skip_releases_later_results(self) -> None:
+        """Skipped sequence numbers produce no output and do not stall."""
+        out: List[Any] = []
+        rb = ReorderBuffer()
+        rb.submit(1, out, "b")
+        rb.skip(0)
+        self.assertEqual(out, ["b"])
+
+    def test_duplicate_sequence_rejected(self) -> None:
+        """Resolving the same sequence twice is an error."""
+        rb = ReorderBuffer()
+        rb.skip(0)
+        with self.assertRaises(ValueError):
+            rb.submit(0, [], "x")
+
+
+class TestPooledConsumers(unittest.TestCase):
+    """End-to-end tests for consumers backed by an executor."""
+
+    def test_thread_pool_ordered_output(self) -> None:
+        """Jittered parallel processing still yields FIFO-ordered results."""
+        source = list(range(100))
+        destination: List[Any] = []
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            system = ProducerConsumerSystem(buffer_size=10, executor=pool, ordered_output=True)
+            system.add_producer(1, source, production_delay=0)
+            for i in range(3):
+                system.add_consumer(i + 1, destination, consumption_delay=0, processor=_jittered_double)
+            system.start()
+            system.shutdown_gracefully()
+
+        self.assertEqual(destination, [2 * x for x in source])
+        self.assertEqual(system.get_statistics()["total_consumed"], 100)
+
+    def test_process_pool_unordered(self) -> None:
+        """A process pool processes every item exactly once."""
+        source = list(range(30))
+        destination: List[Any] = []
+
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            system = ProducerConsumerSystem(buffer_size=5, executor=pool)
+            system.add_producer(1, source, production_delay=0)
+            system.add_consumer(1, destination, consumption_delay=0, processor=_square)
+            system.start()
+            system.shutdown_gracefully()
+
+        self.assertEqual(sorted(destination), [x * x for x in source])
+
+    def test_processor_errors_do_not_stall_ordered_output(self) -> None:
+        """A failing item is skipped and counted; the rest stay ordered."""
+        def fragile(x: int) -> int:
+            if x == 3:
+                raise RuntimeError("boom")
+            return x
+
+        destination: List[Any] = []
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            system = ProducerConsumerSystem(buffer_size=4, executor=pool, ordered_output=True)
+            system.add_producer(1, list(range(10)), production_delay=0)
+            system.add_consumer(1, destination, consumption_delay=0, processor=fragile)
+            system.start()
+            system.shutdown_gracefully()
+
+        self.assertEqual(destination, [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(system.stats.totals()["process_errors"], 1)
+
+
+    def test_ordered_output_keeps_none_items(self) -> None:
+        """A stored None is delivered in order instead of stalling the output."""
+        source = [1, None, 2, None, 3]
+        destination: List[Any] = []
+        system = ProducerConsumerSystem(buffer_size=4, ordered_output=True)
+        system.add_producer(1, source, production_delay=0)
+        system.add_consumer(1, destination, consumption_delay=0)
+        system.start()
+        system.shutdown_gracefully()
+
+        self.assertEqual(destination, source)
+
+    def test_submit_failure_does_not_hang_shutdown(self) -> None:
+        """Items rejected by a shut-down executor are failed, not leaked."""
+        pool = ThreadPoolExecutor(max_workers=2)
+        pool.shutdown()
+        destination: List[Any] = []
+        system = ProducerConsumerSystem(buffer_size=4, executor=pool, ordered_output=True)
+        system.add_producer(1, list(range(6)), production_delay=0)
+        system.add_consumer(1, destination, consumption_delay=0, processor=_square)
+        system.start()
+        system.shutdown_gracefully()
+
+        self.assertEqual(destination, [])
+        self.assertEqual(system.stats.totals()["process_errors"], 6)
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
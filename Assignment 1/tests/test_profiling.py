@@ -0,0 +1,87 @@
+"""
+Unit tests for the contention profiler.
+
+Covers lock/wait attribution, folded-stack export at graceful shutdown,
+and runtime toggling.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from typing import Any, List
+
+# Allow "src" imports when running this file directly.
+sys.path.insert(0, "..")
+
+from src import ProducerConsumerSystem  # type: ignore
+from src.profiling import ContentionProfiler  # type: ignore
+from src.shared_buffer import SharedBuffer  # type: ignore
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class TestContentionProfiler(unittest.TestCase):
+    """Unit test cases for ContentionProfiler."""
+
+    def test_disabled_profiler_records_nothing(self) -> None:
+        """With profiling off, buffer operations leave no data."""
+        prof = ContentionProfiler()
+        buf: SharedBuffer = SharedBuffer(max_size=1, profiler=prof)
+        buf.put("x")
+        buf.get()
+        self.assertFalse(prof.has_data())
+
+    def test_wait_time_attributed_to_thread_and_site(self) -> None:
+        """A blocked get() is recorded under the waiting thread and site."""
+        prof = ContentionProfiler(enabled=True)
+        buf: SharedBuffer = SharedBuffer(max_size=1, profiler=prof)
+
+        t = threading.Thread(target=lambda: buf.get(timeout=1.0), name="Waiter")
+        t.start()
+        time.sleep(0.05)
+        buf.put("x")
+        t.join()
+
+        self.assertIn("SharedBuffer.get;_wait_until;cond.wait", prof.summary())
+        waiter_lines = [line for line in prof.folded() if line.startswith("Waiter;SharedBuffer.get;_wait_until;cond.wait ")]
+        self.assertEqual(len(waiter_lines), 1)
+        self.assertGreaterEqual(int(waiter_lines[0].rsplit(" ", 1)[1]), 30_000)
+
+    def test_shutdown_writes_folded_stacks(self) -> None:
+        """Graceful shutdown dumps a folded-stack file when profiling."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "contention.folded")
+            destination: List[Any] = []
+
+            system = ProducerConsumerSystem(buffer_size=2, profile=True, profile_path=path)
+            system.add_producer(1, list(range(20)), production_delay=0)
+            system.add_consumer(1, destination, consumption_delay=0.002)
+            system.start()
+            system.shutdown_gracefully()
+
+            with open(path, encoding="utf-8") as f:
+                lines = [line for line in f.read().splitlines() if line]
+
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+        self.assertTrue(any(line.startswith("Producer-1;SharedBuffer.put;_wait_until") for line in lines))
+
+    def test_runtime_toggle(self) -> None:
+        """Profiling can be turned on mid-run and off again."""
+        system = ProducerConsumerSystem(buffer_size=5)
+        system.shared_buffer.put("a")
+        self.assertFalse(system.profiler.has_data())
+        system.enable_profiling()
+        system.shared_buffer.get()
+        system.disable_profiling()
+        self.assertIn("SharedBuffer.get;lock", system.profiler.summary())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,90 @@
+"""
+Unit tests for producer rate limiting.
+
+Covers token-bucket bursts and pacing, leaky-bucket spacing, AIMD rate
+adaptation, and end-to-end use of a global limiter across producers.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+import unittest
+from typing import Any, List
+
+# Allow "src" imports when running this file directly.
+sys.path.insert(0, "..")
+
+from src import ProducerConsumerSystem  # type: ignore
+from src.rate_limit import AIMDController, LeakyBucket, TokenBucket  # type: ignore
+
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class TestRateLimiters(unittest.TestCase):
+    """Unit test cases for TokenBucket, LeakyBucket and AIMDController."""
+
+    def test_token_bucket_allows_burst_then_waits(self) -> None:
+        """A full bucket serves `capacity` immediately, then reports a wait."""
+        bucket = TokenBucket(rate=10, capacity=3)
+        self.assertEqual([bucket.try_acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertGreater(bucket.try_acquire(), 0.0)
+
+    def test_token_bucket_paces_long_run_rate(self) -> None:
+        """Acquiring beyond the burst takes roughly (n - capacity) / rate."""
+        bucket = TokenBucket(rate=50, capacity=1)
+        t0 = time.monotonic()
+        for _ in range(6):
+            self.assertTrue(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - t0, 0.09)
+
+    def test_leaky_bucket_spacing(self) -> None:
+        """Leaky bucket spaces acquisitions 1/rate apart."""
+        bucket = LeakyBucket(rate=50)
+        t0 = time.monotonic()
+        for _ in range(6):
+            self.assertTrue(bucket.acquire())
+        self.assertGreaterEqual(time.monotonic() - t0, 0.09)
+
+    def test_acquire_returns_false_when_stopped(self) -> None:
+        """A set stop_event aborts the wait."""
+        bucket = TokenBucket(rate=0.1, capacity=1)
+        bucket.try_acquire()
+        stop = threading.Event()
+        stop.set()
+        self.assertFalse(bucket.acquire(stop_event=stop))
+
+    def test_aimd_increase_and_decrease(self) -> None:
+        """Success below watermark adds; congestion multiplies down."""
+        aimd = AIMDController(initial_rate=10, min_rate=1, max_rate=100, increase=5, decrease=0.5)
+        aimd.record(True, 0.1)
+        self.assertEqual(aimd.rate, 15)
+        aimd.record(True, 0.9)
+        self.assertEqual(aimd.rate, 7.5)
+        aimd.record(False, 1.0)
+        self.assertEqual(aimd.rate, 3.75)
+        for _ in range(10):
+            aimd.record(False, 1.0)
+        self.assertEqual(aimd.rate, 1)
+
+    def test_system_with_global_limiter_and_backoff(self) -> None:
+        """Rate-limited producers still deliver every item exactly once."""
+        sources = [[f"P{i}-{j}" for j in range(10)] for i in range(3)]
+        destination: List[Any] = []
+
+        system = ProducerConsumerSystem(buffer_size=3, global_rate_limiter=TokenBucket(rate=500, capacity=5))
+        for i, src in enumerate(sources, start=1):
+            system.add_producer(i, src, production_delay=0, backoff=AIMDController(initial_rate=200))
+        system.add_consumer(1, destination, consumption_delay=0.001)
+
+        system.start()
+        system.shutdown_gracefully()
+
+        self.assertEqual(sorted(destination), sorted(x for s in sources for x in s))
+        self.assertEqual(system.get_statistics()["total_produced"], 30)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,60 @@
+"""
+Unit tests for the per-thread statistics subsystem.
+
+Covers ThreadStats/StatsRegistry aggregation and the lock-free occupancy
+reads on SharedBuffer used by monitoring.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import unittest
+
+# Allow "src" imports when running this file directly.
+sys.path.insert(0, "..")
+
+from src.shared_buffer import SharedBuffer  # type: ignore
+from src.stats import StatsRegistry, ThreadStats  # type: ignore
+
+
+class TestThreadStats(unittest.TestCase):
+    """Unit test cases for ThreadStats and StatsRegistry."""
+
+    def test_preregistered_keys_start_at_zero(self) -> None:
+        """Keys passed at construction appear in snapshots with value 0."""
+        stats = ThreadStats("t", ("a", "b"))
+        self.assertEqual(stats.snapshot(), {"a": 0, "b": 0})
+        self.assertEqual(stats.get("missing"), 0)
+
+    def test_registry_aggregates_across_threads(self) -> None:
+        """Totals sum every thread's single-writer counters."""
+        registry = StatsRegistry()
+
+        def work(name: str, n: int) -> None:
+            stats = registry.register(name, ("count",))
+            for _ in range(n):
+                stats.incr("count")
+
+        threads = [threading.Thread(target=work, args=(f"W{i}", 1000)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(registry.totals(), {"count": 4000})
+        self.assertEqual(len(registry.per_thread()), 4)
+
+    def test_buffer_reads_do_not_take_lock(self) -> None:
+        """Occupancy reads succeed even while another holder owns the lock."""
+        buffer: SharedBuffer = SharedBuffer(max_size=2)
+        buffer.put("x")
+        with buffer._lock:
+            self.assertEqual(buffer.size(), 1)
+            self.assertFalse(buffer.is_empty())
+            self.assertFalse(buffer.is_full())
+            self.assertIn("size=1", repr(buffer))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
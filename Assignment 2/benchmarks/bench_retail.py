@@ -0,0 +1,237 @@
+# benchmarks/bench_retail.py
+"""
+Benchmark suite for the retail analysis.
+
+Times load_transactions, every analysis function and the full main.py
+report (in-memory and --stream) on deterministic synthetic datasets (see
+src/synthetic.py), and records rows/second and peak RSS per stage. Each
+stage runs in its own child process so peak RSS is attributable to that
+stage. Results are appended to a JSON-lines history keyed by git commit,
+and each run is compared with the previous entry for the same dataset
+size.
+
+Usage (from the Assignment 2 directory):
+
+    python -m benchmarks.bench_retail                      # 10K and 100K rows
+    python -m benchmarks.bench_retail --rows 1000000 --repeat 3
+    python -m benchmarks.bench_retail --stages load report
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import multiprocessing as mp
+import platform
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import main as cli  # noqa: E402
+from src import analysis, load_transactions  # noqa: E402
+from src.synthetic import write_synthetic_csv  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+DEFAULT_HISTORY = ROOT / "benchmarks" / "history.jsonl"
+DATA_DIR = ROOT / "data"
+
+# Analysis functions benchmarked individually (all take the raw rows).
+ANALYSIS_STAGES = [
+    name for name in analysis.__all__ if name not in ("valid_transactions", "returns_view", "fields_for")
+]
+STAGES = ["load"] + ANALYSIS_STAGES + ["report", "stream_report"]
+
+
+# -----------------------------
+# Measurement helpers
+# -----------------------------
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB (None if unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _run_stage(stage: str, csv_path: str, repeat: int) -> Dict[str, Any]:
+    """Run one stage in the current process and return its measurements."""
+    if stage == "load":
+        rows = 0
+
+        def run() -> None:
+            nonlocal rows
+            rows = sum(1 for _ in load_transactions(csv_path))
+
+        seconds = _best_of(run, repeat)
+    elif stage in ("report", "stream_report"):
+        rows = sum(1 for _ in load_transactions(csv_path))
+        build = cli.build_report if stage == "report" else cli.build_report_streaming
+
+        def run() -> None:
+            with redirect_stdout(io.StringIO()):
+                cli.print_report(build(Path(csv_path)))
+
+        seconds = _best_of(run, repeat)
+    else:
+        fn = getattr(analysis, stage)
+        data = list(load_transactions(csv_path))
+        rows = len(data)
+        seconds = _best_of(lambda: fn(data), repeat)
+
+    return {
+        "seconds": round(seconds, 6),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _child(stage: str, csv_path: str, repeat: int, conn) -> None:
+    try:
+        conn.send(_run_stage(stage, csv_path, repeat))
+    except BaseException as exc:  # report, don't hang the parent
+        conn.send({"error": repr(exc)})
+    finally:
+        conn.close()
+
+
+def run_isolated(stage: str, csv_path: Path, repeat: int) -> Dict[str, Any]:
+    """Run a stage in a fresh child process so its peak RSS is its own."""
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context("fork" if "fork" in methods else "spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(stage, str(csv_path), repeat, child))
+    proc.start()
+    child.close()
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+# -----------------------------
+# History
+# -----------------------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _previous(history: Path, rows: int) -> Optional[Dict[str, Any]]:
+    if not history.exists():
+        return None
+    last = None
+    for line in history.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            if entry.get("rows") == rows:
+                last = entry
+    return last
+
+
+def _append(history: Path, entry: Dict[str, Any]) -> None:
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with history.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def _print_table(entry: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> None:
+    print(f"\n{entry['rows']:,} rows (seed {entry['seed']}, commit {entry['commit'] or '?'})")
+    prev_results = (previous or {}).get("results", {})
+    if previous:
+        print(f"compared with commit {previous.get('commit') or '?'} ({previous.get('timestamp')})")
+    print(f"{'stage':28s} {'seconds':>10s} {'rows/sec':>12s} {'peak MiB':>9s} {'vs prev':>8s}")
+    for stage, res in entry["results"].items():
+        if "error" in res:
+            print(f"{stage:28s} ERROR {res['error']}")
+            continue
+        delta = ""
+        before = prev_results.get(stage, {}).get("seconds")
+        if before:
+            delta = f"{(res['seconds'] - before) / before * 100:+.1f}%"
+        rss = f"{res['peak_rss_mb']:.1f}" if res["peak_rss_mb"] is not None else "-"
+        print(f"{stage:28s} {res['seconds']:10.4f} {res['rows_per_sec'] or 0:12,d} {rss:>9s} {delta:>8s}")
+
+
+# -----------------------------
+# Entry point
+# -----------------------------
+
+def dataset_path(rows: int, seed: int) -> Path:
+    """Cached synthetic dataset location for a size and seed."""
+    return DATA_DIR / f"synthetic_{rows}_s{seed}.csv"
+
+
+def run(rows: int, seed: int, stages: Sequence[str], repeat: int, isolate: bool) -> Dict[str, Any]:
+    """Benchmark one dataset size and return the history entry."""
+    csv_path = dataset_path(rows, seed)
+    if not csv_path.exists():
+        print(f"Generating {csv_path.name} ...")
+        write_synthetic_csv(csv_path, rows, seed=seed)
+
+    results: Dict[str, Any] = {}
+    for stage in stages:
+        results[stage] = run_isolated(stage, csv_path, repeat) if isolate else _run_stage(stage, str(csv_path), repeat)
+
+    return {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "rows": rows,
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the retail analysis on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000], help="Dataset sizes")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Stages to run")
+    parser.add_argument("--repeat", type=int, default=1, help="Timing repetitions (best is kept)")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON-lines history file")
+    parser.add_argument("--no-isolate", action="store_true", help="Run stages in-process (RSS is cumulative)")
+    parser.add_argument("--no-record", action="store_true", help="Do not append to the history file")
+    args = parser.parse_args(argv)
+
+    entries: List[Dict[str, Any]] = []
+    for rows in args.rows:
+        entry = run(rows, args.seed, args.stages, args.repeat, isolate=not args.no_isolate)
+        _print_table(entry, _previous(args.history, rows))
+        entries.append(entry)
+    if not args.no_record:
+        for entry in entries:
+            _append(args.history, entry)
+        print(f"\nAppended {len(entries)} result(s) to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import os
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from src import (
     Transaction,
+    WEEKDAYS,
     load_transactions,
     avg_order_value,
     cancellation_rate,
@@ -15,10 +17,24 @@ from src import (
     top_n_products_by_revenue,
     total_revenue,
     units_sold_per_product,
-    valid_transactions,
     sales_by_weekday,
     cancellation_summary,
+    fields_for,
 )
+from src.basket import FIELDS_USED as BASKET_FIELDS, MarketBasket
+from src.columnar import read_columnar, write_columnar
+from src.cube import load_or_build_cube
+from src.dataset import Dataset
+from src.executor import ReportExecutor, Task
+from src.external import external_report
+from src.customers import FIELDS_USED as CUSTOMER_FIELDS, CustomerAccumulator, analyze_customers
+from src.io_utils import ENGINES, expand_sources
+from src.money import exact_revenue
+from src.multifile import report_many
+from src.server import serve
+from src.streaming import stream_report
+from src.timeseries import FREQUENCIES, TimeSeries, period_label
+from src.sqlite_store import SQLiteBackend, load_into_sqlite
 
 
 TOP_N = 10  # fixed top size
@@ -29,59 +45,487 @@ def header(title: str) -> None:
     print("=" * 80)
 
 
+COLUMNAR_SUFFIXES = {".parquet", ".pq", ".arrow", ".feather", ".ipc"}
+
+Source = Union[Path, Sequence[Path]]
+
+
+def _columnar_file(source: Source) -> Optional[Path]:
+    """
+    The Parquet/Arrow file behind source (a path, glob or list), if any.
+
+    Raises:
+        ValueError: If source resolves to several files and any of them is
+            Parquet/Arrow; columnar input is read one file at a time.
+    """
+    try:
+        paths = expand_sources(source)
+    except FileNotFoundError:
+        return None   # reported by the CSV loader
+    columnar = [p for p in paths if p.suffix.lower() in COLUMNAR_SUFFIXES]
+    if not columnar:
+        return None
+    if len(paths) > 1:
+        raise ValueError(f"Parquet/Arrow input must be a single file, got {len(paths)} files")
+    return columnar[0]
+
+
+def read_source(
+    source: Source,
+    engine: str = "csv",
+    fields: Optional[Collection[str]] = None,
+) -> Iterator[Transaction]:
+    """
+    Stream transactions from a CSV or a Parquet/Arrow file (by suffix), or
+    from several CSVs (a list, directory or glob; see load_transactions).
+    engine selects the CSV reader ("csv" or "mmap"); fields limits the
+    columns that are parsed (None: all).
+    """
+    columnar = _columnar_file(source)
+    if columnar is not None:
+        return read_columnar(columnar, columns=None if fields is None else sorted(fields))
+    return load_transactions(source, engine=engine, fields=fields)
+
+
+# Report section -> (analysis function, keyword arguments). All but
+# cancellation_summary run on the sales view.
+SECTIONS: Dict[str, Tuple[Callable[..., Any], Dict[str, Any]]] = {
+    "total_revenue": (total_revenue, {}),
+    "revenue_by_country": (revenue_by_country, {}),
+    "monthly_revenue": (monthly_revenue, {}),
+    "top_products": (top_n_products_by_revenue, {"n": TOP_N}),
+    "top_customers": (top_n_customers_by_revenue, {"n": TOP_N}),
+    "avg_order_value": (avg_order_value, {}),
+    "units_sold_per_product": (units_sold_per_product, {}),
+    "sales_by_weekday": (sales_by_weekday, {}),
+    "cancellation_summary": (cancellation_summary, {}),
+}
+
+
+MONEY_MODES = ("float", "exact")
+
+# Sections answered by src.money.MoneyTotals methods of the same name.
+EXACT_SECTIONS = ("total_revenue", "revenue_by_country")
+
+
+# Below this much input, workers=None runs the report serially: starting a
+# pool costs more than the sections take on a small file.
+PARALLEL_MIN_BYTES = 32 * 2**20
+
+
+def _auto_workers(source: Source, workers: Optional[int]) -> Optional[int]:
+    """workers as given, or for None: 1 for small inputs, else one per CPU."""
+    if workers is not None:
+        return workers
+    try:
+        size = sum(os.path.getsize(p) for p in expand_sources(source))
+    except OSError:
+        return 1   # the loader reports the error
+    return None if size >= PARALLEL_MIN_BYTES else 1
+
+
+def _dataset(rows: List[Transaction]) -> Dataset:
+    data = Dataset(rows)
+    data.valid()   # build the sales view before any worker starts
+    return data
+
+
+# Report graph: one shared Dataset holds the parsed rows and the sales view,
+# built once; each section is a Dataset.query on it (see src.dataset).
+REPORT_GRAPH: Dict[str, Task] = {
+    "data": Task(_dataset, ("rows",), shared=True),
+    **{name: Task(Dataset.query, ("data",), {"fn": fn, **kwargs}) for name, (fn, kwargs) in SECTIONS.items()},
+}
+
+
+def build_report(
+    csv_path: Source,
+    engine: str = "csv",
+    sections: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    money: str = "float",
+) -> Dict[str, Any]:
+    """
+    Compute report sections from the source file using in-memory analysis.
+
+    With sections, only those are computed and only the columns they read
+    are kept (see src.analysis.fields_for), so e.g. a total_revenue-only
+    report never builds descriptions or customer IDs; every row is still
+    validated as in a full load. The input is
+    parsed once into a Dataset and the sections run concurrently in up to
+    workers processes (see src.executor.ReportExecutor); the result is the
+    same for any number of workers. workers=None uses one per CPU for
+    inputs of PARALLEL_MIN_BYTES or more and runs serially below that, where
+    a pool would cost more than it saves. Several CSVs are instead
+    scanned in parallel, one worker per file, and merged (see
+    src.multifile.report_many). With money="exact",
+    total_revenue and revenue_by_country are cent-exact Decimals summed in
+    integer pence from batch-converted columns (see src.money); CSV only.
+    """
+    names = list(SECTIONS) if sections is None else list(sections)
+    workers = _auto_workers(csv_path, workers)
+    report: Dict[str, Any] = {}
+    if money == "exact":
+        exact = [name for name in names if name in EXACT_SECTIONS]
+        if exact:
+            totals = exact_revenue(csv_path)
+            for name in exact:
+                report[name] = getattr(totals, name)()
+        rest = [name for name in names if name not in EXACT_SECTIONS]
+    else:
+        rest = names
+
+    if rest and _columnar_file(csv_path) is None and len(expand_sources(csv_path)) > 1:
+        full = report_many(csv_path, top_n=TOP_N, workers=workers, engine=engine)
+        report.update((name, full[name]) for name in rest)
+    elif rest:
+        fields = None
+        if sections is not None:
+            fields = fields_for(*(SECTIONS[name][0] for name in rest))
+        rows = list(read_source(csv_path, engine, fields))
+        report.update(ReportExecutor(REPORT_GRAPH, workers).run({"rows": rows}, targets=rest))
+    return {name: report[name] for name in names}
+
+
+def build_report_streaming(
+    csv_path: Source,
+    approximate: bool = False,
+    workers: Optional[int] = None,
+    engine: str = "csv",
+    max_groups: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Compute every report section in one pass with constant-size accumulators.
+
+    Memory is bounded by group cardinality (countries, products, customers,
+    invoices), not by row count, so arbitrarily large exports fit. With
+    approximate, invoice-level metrics use fixed-size sketches instead and
+    order-value quantiles are added. Multiple CSVs are scanned by parallel
+    workers (one per file) and merged. With max_groups, the exact report is
+    computed in a single process and the product, customer and invoice
+    groups spill to disk beyond that many (see src.external). workers=None
+    is resolved as in build_report().
+    """
+    workers = _auto_workers(csv_path, workers)
+    if max_groups is not None:
+        return external_report(read_source(csv_path, engine), top_n=TOP_N, max_groups=max_groups)
+    if _columnar_file(csv_path) is not None:
+        return stream_report(read_source(csv_path), top_n=TOP_N, approximate=approximate)
+    return report_many(csv_path, top_n=TOP_N, approximate=approximate, workers=workers, engine=engine)
+
+
+def build_report_sqlite(csv_path: Source, db_path: Path, reload: bool = False, engine: str = "csv") -> Dict[str, Any]:
+    """
+    Compute every report section with SQL aggregates.
+
+    The CSV is bulk-loaded into db_path on first use (or when reload is set);
+    later runs query the indexed database without touching the CSV.
+    """
+    if reload or not db_path.exists():
+        load_into_sqlite(read_source(csv_path, engine), db_path, replace=True)
+
+    with SQLiteBackend(db_path) as db:
+        return {
+            "total_revenue": db.total_revenue(),
+            "revenue_by_country": db.revenue_by_country(),
+            "monthly_revenue": db.monthly_revenue(),
+            "top_products": db.top_n_products_by_revenue(n=TOP_N),
+            "top_customers": db.top_n_customers_by_revenue(n=TOP_N),
+            "avg_order_value": db.avg_order_value(),
+            "units_sold_per_product": db.units_sold_per_product(),
+            "sales_by_weekday": db.sales_by_weekday(),
+            "cancellation_summary": db.cancellation_summary(),
+        }
+
+
+def build_report_cube(csv_path: Path, cube_path: Path, reload: bool = False) -> Dict[str, Any]:
+    """
+    Serve every report section from the pre-aggregated sales cube.
+
+    The cube is built on first use, extended with only the new rows when the
+    CSV has been appended to, and rebuilt from scratch when reload is set.
+    """
+    cube = load_or_build_cube(csv_path, cube_path, rebuild=reload)
+    return {
+        "total_revenue": cube.total_revenue(),
+        "revenue_by_country": cube.revenue_by_country(),
+        "monthly_revenue": cube.monthly_revenue(),
+        "top_products": cube.top_n_products_by_revenue(n=TOP_N),
+        "top_customers": cube.top_n_customers_by_revenue(n=TOP_N),
+        "avg_order_value": cube.avg_order_value(),
+        "units_sold_per_product": cube.units_sold_per_product(),
+        "sales_by_weekday": cube.sales_by_weekday(),
+        "cancellation_summary": cube.cancellation_summary(),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the report sections produced by any build_report_* function."""
+    if "total_revenue" in report:
+        header("TOTAL REVENUE (Sales view)")
+        print(f"{report['total_revenue']:,.2f}")
+
+    if "revenue_by_country" in report:
+        header(f"REVENUE BY COUNTRY (Top {TOP_N})")
+        by_country = report["revenue_by_country"]
+        for country, amt in sorted(by_country.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
+            print(f"{country:20s} {amt:,.2f}")
+
+    if "monthly_revenue" in report:
+        header(f"MONTHLY REVENUE (Top {TOP_N} months by revenue)")
+        by_month = report["monthly_revenue"]
+        for month, amt in sorted(by_month.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
+            print(f"{month}  {amt:,.2f}")
+
+    if "top_products" in report:
+        header(f"TOP {TOP_N} PRODUCTS BY REVENUE")
+        for name, amt in report["top_products"]:
+            print(f"{name[:40]:40s} {amt:,.2f}")
+
+    if "top_customers" in report:
+        header(f"TOP {TOP_N} CUSTOMERS BY REVENUE")
+        for cust, amt in report["top_customers"]:
+            print(f"{str(cust)[:12]:12s} {amt:,.2f}")
+
+    if "avg_order_value" in report:
+        header("AVERAGE ORDER VALUE (Sales view)")
+        print(f"{report['avg_order_value']:,.2f}")
+
+    if "units_sold_per_product" in report:
+        header(f"UNITS SOLD PER PRODUCT (Top {TOP_N})")
+        units_by_product = report["units_sold_per_product"]
+        for name, units in sorted(units_by_product.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
+            print(f"{name[:40]:40s} {units}")
+
+    if "sales_by_weekday" in report:
+        header("SALES BY DAY OF WEEK")
+        weekday_totals = report["sales_by_weekday"]
+        for day in WEEKDAYS:
+            print(f"{day:10s} {weekday_totals[day]:,.2f}")
+
+    if "cancellation_summary" in report:
+        header("CANCELLATION AND RETURNS SUMMARY")
+        summary = report["cancellation_summary"]
+        for k in ["TotalCancellations", "CancellationRate", "CancelledNetAmount", "CancelledAbsAmount"]:
+            val = summary[k]
+            if k == "CancellationRate":
+                print(f"{k+':':20s} {val:.2f}%")
+            else:
+                print(f"{k+':':20s} {val}")
+
+    if "order_value_quantiles" in report:
+        header("ORDER VALUE QUANTILES (approximate)")
+        for k, val in report["order_value_quantiles"].items():
+            print(f"{k+':':20s} {val:,.2f}")
+        print(f"{'Distinct customers:':20s} {report['distinct_customers']:,}")
+
+
+def print_series(series: TimeSeries, window: Optional[int] = None) -> None:
+    """Print a revenue series with its period-over-period growth and optional moving average."""
+    header(f"REVENUE BY {series.freq.upper()}")
+    avg = series.moving_average(window).values if window else {}
+    growth = series.growth().values
+    title = f"{'period':16s} {'revenue':>14s} {'growth %':>9s}"
+    print(title + (f" {f'avg({window})':>14s}" if window else ""))
+    for code, value in series.dense():
+        pct = f"{growth[code]:+.1f}" if code in growth else "-"
+        line = f"{period_label(code, series.freq):16s} {value:14,.2f} {pct:>9s}"
+        if window:
+            line += f" {avg[code]:14,.2f}" if code in avg else f" {'-':>14s}"
+        print(line)
+
+
+def print_customers(customers: CustomerAccumulator, months: int = 12) -> None:
+    """Print RFM segment sizes and the monthly cohort retention matrix."""
+    header(f"RFM SEGMENTS (Top {TOP_N} of {len(customers):,} customers; 5 = best)")
+    for segment, count in list(customers.segment_counts().items())[:TOP_N]:
+        print(f"R{segment[0]} F{segment[1]} M{segment[2]}   {count:,}")
+
+    header(f"COHORT RETENTION (% of cohort buying again, months 1-{months})")
+    sizes = customers.cohort_sizes()
+    print(f"{'cohort':8s} {'size':>6s} " + " ".join(f"{f'+{k}':>6s}" for k in range(1, months + 1)))
+    for cohort, row in customers.cohort_retention().items():
+        cells = " ".join(f"{pct:6.1f}" for pct in row[1:months + 1])
+        print(f"{cohort:8s} {sizes[cohort]:6,d} {cells}")
+
+
+def print_basket(basket: MarketBasket, min_support: float) -> None:
+    """Print the most frequent product pairs and the strongest association rules."""
+    header(f"TOP {TOP_N} PRODUCT PAIRS ({len(basket):,} baskets, support >= {min_support:.2%})")
+    for pair in basket.frequent_pairs(min_support, top=TOP_N):
+        print(f"{pair.a[:30]:30s} + {pair.b[:30]:30s} {pair.count:7,d} {pair.support:7.2%}")
+
+    header(f"TOP {TOP_N} ASSOCIATION RULES BY LIFT")
+    for rule in basket.rules(min_support, top=TOP_N):
+        print(
+            f"{rule.antecedent[:28]:28s} -> {rule.consequent[:28]:28s} "
+            f"conf {rule.confidence:6.1%}  lift {rule.lift:6.2f}"
+        )
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Online Retail CSV analysis using functional and streaming Python."
     )
-    parser.add_argument("csv", type=Path, help="Path to Online Retail CSV (e.g., data/online_retail.csv)")
+    parser.add_argument(
+        "csv",
+        type=Path,
+        nargs="+",
+        help="Online Retail CSV (e.g., data/online_retail.csv), a .parquet/.arrow export, "
+        "or several CSVs as files, directories or glob patterns",
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        metavar="DB",
+        help="Answer the report with SQL over a SQLite copy of the CSV (loaded on first use).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Single-pass streaming report; memory does not grow with the row count.",
+    )
+    parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="With --stream: fixed-memory sketches for invoice counts, plus p50/p90/p99 order value.",
+    )
+    parser.add_argument(
+        "--max-groups",
+        type=int,
+        metavar="N",
+        help="With --stream: exact report that spills product/customer/invoice groups to disk beyond N per grouping.",
+    )
+    parser.add_argument(
+        "--cube",
+        type=Path,
+        metavar="FILE",
+        help="Answer the report from a persisted aggregate cube of the CSV (built or extended as needed).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Worker processes for the report sections, or per input file with several CSVs "
+        "(default: one per CPU for inputs of 32 MiB or more, else 1).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="csv",
+        help="CSV reader: csv module (default) or the memory-mapped byte scanner (mmap, faster).",
+    )
+    parser.add_argument(
+        "--money",
+        choices=MONEY_MODES,
+        default="float",
+        help="exact: cent-exact total and per-country revenue, summed in integer pence "
+        "(default report on CSV input only).",
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=list(SECTIONS),
+        metavar="SECTION",
+        help="Compute just these report sections, parsing only the columns they need "
+        f"({', '.join(SECTIONS)}).",
+    )
+    parser.add_argument(
+        "--series",
+        choices=FREQUENCIES,
+        help="Print the revenue time series at this frequency instead of the report.",
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        metavar="N",
+        help="With --series: add an N-period moving average.",
+    )
+    parser.add_argument(
+        "--customers",
+        action="store_true",
+        help="Print RFM segments and monthly cohort retention instead of the report.",
+    )
+    parser.add_argument(
+        "--basket",
+        action="store_true",
+        help="Print frequent product pairs and association rules instead of the report.",
+    )
+    parser.add_argument(
+        "--min-support",
+        type=float,
+        default=0.01,
+        metavar="FRACTION",
+        help="With --basket: minimum share of invoices containing a pair (default 0.01).",
+    )
+    parser.add_argument("--reload", action="store_true", help="Rebuild the --sqlite database or --cube from the CSV.")
+    parser.add_argument(
+        "--export",
+        type=Path,
+        metavar="OUT",
+        help="Convert the input to Parquet (.parquet) or Arrow IPC (.arrow/.feather) and exit.",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="ADDR",
+        help="Keep the dataset warm and answer metric queries over HTTP on HOST:PORT or unix:/path.sock.",
+    )
     args = parser.parse_args()
 
-    raw_iter = load_transactions(args.csv)
-    valid_list: List[Transaction] = list(valid_transactions(raw_iter))
-
-    header("TOTAL REVENUE (Sales view)")
-    print(f"{total_revenue(valid_list):,.2f}")
-
-    header(f"REVENUE BY COUNTRY (Top {TOP_N})")
-    by_country = revenue_by_country(valid_list)
-    for country, amt in sorted(by_country.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
-        print(f"{country:20s} {amt:,.2f}")
-
-    header(f"MONTHLY REVENUE (Top {TOP_N} months by revenue)")
-    by_month = monthly_revenue(valid_list)
-    for month, amt in sorted(by_month.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
-        print(f"{month}  {amt:,.2f}")
-
-    header(f"TOP {TOP_N} PRODUCTS BY REVENUE")
-    for name, amt in top_n_products_by_revenue(valid_list, n=TOP_N):
-        print(f"{name[:40]:40s} {amt:,.2f}")
-
-    header(f"TOP {TOP_N} CUSTOMERS BY REVENUE")
-    for cust, amt in top_n_customers_by_revenue(valid_list, n=TOP_N):
-        print(f"{str(cust)[:12]:12s} {amt:,.2f}")
-
-    header("AVERAGE ORDER VALUE (Sales view)")
-    print(f"{avg_order_value(valid_list):,.2f}")
-
-    header(f"UNITS SOLD PER PRODUCT (Top {TOP_N})")
-    units_by_product = units_sold_per_product(valid_list)
-    for name, units in sorted(units_by_product.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]:
-        print(f"{name[:40]:40s} {units}")
-
-    header("SALES BY DAY OF WEEK")
-    weekday_totals = sales_by_weekday(valid_list)
-    for day in ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]:
-        print(f"{day:10s} {weekday_totals[day]:,.2f}")
-
-    header("CANCELLATION AND RETURNS SUMMARY")
-    raw_again = load_transactions(args.csv)
-    summary = cancellation_summary(raw_again)
-    for k in ["TotalCancellations", "CancellationRate", "CancelledNetAmount", "CancelledAbsAmount"]:
-        val = summary[k]
-        if k == "CancellationRate":
-            print(f"{k+':':20s} {val:.2f}%")
+    source: Source = args.csv[0] if len(args.csv) == 1 else args.csv
+    try:
+        columnar = _columnar_file(source) is not None
+    except ValueError as exc:
+        parser.error(str(exc))
+    if (args.serve or args.cube) and not (isinstance(source, Path) and source.is_file()):
+        parser.error("--serve and --cube need a single CSV file")
+    if args.money == "exact" and (
+        args.stream or args.approx or args.max_groups or args.sqlite or args.cube or columnar
+    ):
+        parser.error("--money exact works with the default report on CSV input only")
+    if args.max_groups is not None and (args.approx or args.max_groups < 1):
+        parser.error("--max-groups needs a positive N and cannot be combined with --approx")
+
+    if args.serve:
+        serve(source, args.serve, cube_path=args.cube)
+        return
+
+    if args.export:
+        rows = write_columnar(read_source(source, args.engine), args.export)
+        print(f"Wrote {rows:,} rows to {args.export}")
+        return
+
+    if args.series:
+        rows = read_source(source, args.engine, fields_for(monthly_revenue))
+        print_series(TimeSeries.from_transactions(rows, freq=args.series), window=args.window)
+        return
+
+    if args.basket:
+        basket = MarketBasket.from_transactions(read_source(source, args.engine, BASKET_FIELDS))
+        print_basket(basket, args.min_support)
+        return
+
+    if args.customers:
+        if columnar:
+            customers = CustomerAccumulator().update(read_source(source, fields=CUSTOMER_FIELDS))
         else:
-            print(f"{k+':':20s} {val}")
+            customers = analyze_customers(source, workers=_auto_workers(source, args.workers), engine=args.engine)
+        print_customers(customers)
+        return
+
+    if args.cube:
+        report = build_report_cube(source, args.cube, reload=args.reload)
+    elif args.sqlite:
+        report = build_report_sqlite(source, args.sqlite, reload=args.reload, engine=args.engine)
+    elif args.stream or args.approx or args.max_groups:
+        report = build_report_streaming(
+            source, approximate=args.approx, workers=args.workers, engine=args.engine, max_groups=args.max_groups
+        )
+    else:
+        report = build_report(source, engine=args.engine, sections=args.only, workers=args.workers, money=args.money)
+    if args.only:
+        report = {name: report[name] for name in args.only}
+    print_report(report)
 
 
 if __name__ == "__main__":
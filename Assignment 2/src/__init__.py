@@ -7,6 +7,7 @@ Public API for the retail analysis assignment.
 """
 
 from .models import Transaction
+from .grouping import WEEKDAYS, product_key, top_n
 from .analysis import (
     valid_transactions,
     returns_view,
@@ -20,11 +21,25 @@ from .analysis import (
     avg_order_value,
     units_sold_per_product,
     cancellation_rate,
+    fields_for,
 )
-from .io_utils import load_transactions
+from .io_utils import load_transactions, expand_sources
+from .sqlite_store import load_into_sqlite, SQLiteBackend
+from .columnar import write_columnar, read_columnar
+from .indexing import TransactionIndex, load_indexed
+from .basket import MarketBasket
+from .cube import SalesCube, load_or_build_cube
+from .customers import CustomerAccumulator, analyze_customers
+from .dataset import Dataset
+from .sketches import HyperLogLog, KLLSketch
+from .streaming import ReportAccumulator, stream_report
+from .timeseries import TimeSeries, revenue_series
 
 __all__ = [
     "Transaction",
+    "WEEKDAYS",
+    "product_key",
+    "top_n",
     "valid_transactions",
     "returns_view",
     "total_revenue",
@@ -37,5 +52,25 @@ __all__ = [
     "avg_order_value",
     "units_sold_per_product",
     "cancellation_rate",
+    "fields_for",
     "load_transactions",
+    "expand_sources",
+    "load_into_sqlite",
+    "SQLiteBackend",
+    "write_columnar",
+    "read_columnar",
+    "TransactionIndex",
+    "load_indexed",
+    "MarketBasket",
+    "SalesCube",
+    "load_or_build_cube",
+    "CustomerAccumulator",
+    "analyze_customers",
+    "Dataset",
+    "HyperLogLog",
+    "KLLSketch",
+    "ReportAccumulator",
+    "stream_report",
+    "TimeSeries",
+    "revenue_series",
 ]
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Dict, Iterable, Iterator, List, Tuple
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Tuple, Union
 
+from .grouping import WEEKDAYS, product_key, top_n
 from .models import Transaction
+from .timeseries import period_label
 
 __all__ = [
     "valid_transactions",
@@ -19,6 +21,7 @@ __all__ = [
     "avg_order_value",
     "units_sold_per_product",
     "cancellation_rate",
+    "fields_for",
 ]
 
 # -----------------------------
@@ -89,20 +92,11 @@ def monthly_revenue(records: Iterable[Transaction]) -> Dict[str, float]:
     Key format:
         "YYYY-MM"
     """
-    agg: Dict[str, float] = defaultdict(float)
+    # Bin by integer month code; keys are formatted once per month.
+    agg: Dict[int, float] = defaultdict(float)
     for t in valid_transactions(records):
-        key = f"{t.invoice_date.year:04d}-{t.invoice_date.month:02d}"
-        agg[key] += t.line_total
-    return {k: round(v, 2) for k, v in agg.items()}
-
-
-def _product_key(t: Transaction) -> str:
-    """
-    Determine the display key for product grouping.
-
-    Uses description when present, otherwise falls back to stock code.
-    """
-    return (t.description or t.stock_code).strip()
+        agg[t.invoice_date.year * 12 + t.invoice_date.month - 1] += t.line_total
+    return {period_label(k, "month"): round(v, 2) for k, v in agg.items()}
 
 
 def top_n_products_by_revenue(records: Iterable[Transaction], n: int = 10) -> List[Tuple[str, float]]:
@@ -119,9 +113,8 @@ def top_n_products_by_revenue(records: Iterable[Transaction], n: int = 10) -> Li
         return []
     agg: Dict[str, float] = defaultdict(float)
     for t in valid_transactions(records):
-        agg[_product_key(t)] += t.line_total
-    ranked = sorted(agg.items(), key=lambda kv: kv[1], reverse=True)
-    return [(name, round(amount, 2)) for name, amount in ranked[:n]]
+        agg[product_key(t)] += t.line_total
+    return top_n(agg.items(), n)
 
 
 def top_n_customers_by_revenue(records: Iterable[Transaction], n: int = 10) -> List[Tuple[str, float]]:
@@ -136,8 +129,7 @@ def top_n_customers_by_revenue(records: Iterable[Transaction], n: int = 10) -> L
     for t in valid_transactions(records):
         if t.customer_id:
             agg[t.customer_id] += t.line_total
-    ranked = sorted(agg.items(), key=lambda kv: kv[1], reverse=True)
-    return [(cust, round(amount, 2)) for cust, amount in ranked[:n]]
+    return top_n(agg.items(), n)
 
 
 def sales_by_weekday(records: Iterable[Transaction]) -> Dict[str, float]:
@@ -148,8 +140,7 @@ def sales_by_weekday(records: Iterable[Transaction]) -> Dict[str, float]:
         Dict mapping weekday -> revenue.
         Always includes all 7 days (Mon–Sun).
     """
-    order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    agg: Dict[str, float] = {d: 0.0 for d in order}
+    agg: Dict[str, float] = {d: 0.0 for d in WEEKDAYS}
 
     for t in valid_transactions(records):
         day = t.invoice_date.strftime("%A")
@@ -244,3 +235,51 @@ def cancellation_rate(records: Iterable[Transaction]) -> float:
             cancelled += lt_abs
 
     return (cancelled / gross * 100.0) if gross else 0.0
+
+
+# -----------------------------
+# Column requirements
+# -----------------------------
+
+# Fields the sales/returns views read (invoice prefix, quantity, price).
+_VIEW_FIELDS = frozenset({"invoice_no", "quantity", "unit_price"})
+
+# Transaction fields each function reads, for load_transactions(fields=...).
+FIELDS_USED: Dict[str, FrozenSet[str]] = {
+    "valid_transactions": _VIEW_FIELDS,
+    "returns_view": _VIEW_FIELDS,
+    "total_revenue": _VIEW_FIELDS,
+    "revenue_by_country": _VIEW_FIELDS | {"country"},
+    "monthly_revenue": _VIEW_FIELDS | {"invoice_date"},
+    "top_n_products_by_revenue": _VIEW_FIELDS | {"description", "stock_code"},
+    "top_n_customers_by_revenue": _VIEW_FIELDS | {"customer_id"},
+    "sales_by_weekday": _VIEW_FIELDS | {"invoice_date"},
+    "cancellation_summary": _VIEW_FIELDS,
+    "avg_order_value": _VIEW_FIELDS,
+    "units_sold_per_product": _VIEW_FIELDS | {"description", "stock_code"},
+    "cancellation_rate": _VIEW_FIELDS,
+}
+
+
+def fields_for(*metrics: Union[str, Callable[..., object]]) -> FrozenSet[str]:
+    """
+    Columns needed to compute the given analysis functions.
+
+    Pass the result to load_transactions(fields=...) so that unused columns
+    are left out of the rows, e.g. a revenue-only query never builds
+    descriptions or customer IDs. Rows are validated as in a full load.
+
+    Args:
+        *metrics: Functions from this module, or their names.
+
+    Returns:
+        Union of the Transaction fields they read.
+
+    Raises:
+        KeyError: For a function this module does not describe.
+    """
+    out: set = set()
+    for metric in metrics:
+        name = metric if isinstance(metric, str) else metric.__name__
+        out |= FIELDS_USED[name]
+    return frozenset(out)
@@ -0,0 +1,214 @@
+# src/basket.py
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter
+from itertools import combinations
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .grouping import product_key
+from .models import Transaction
+
+__all__ = [
+    "FIELDS_USED",
+    "Pair",
+    "Rule",
+    "MarketBasket",
+]
+
+# Transaction fields read, for load_transactions(fields=...).
+FIELDS_USED = frozenset({"invoice_no", "quantity", "unit_price", "description", "stock_code"})
+
+
+class Pair(NamedTuple):
+    """Two products bought together, with the number and share of baskets."""
+
+    a: str
+    b: str
+    count: int
+    support: float
+
+
+class Rule(NamedTuple):
+    """Association rule antecedent -> consequent."""
+
+    antecedent: str
+    consequent: str
+    count: int
+    support: float      # P(antecedent and consequent)
+    confidence: float   # P(consequent | antecedent)
+    lift: float         # confidence / P(consequent)
+
+
+class MarketBasket:
+    """
+    Product co-occurrence per invoice (market-basket analysis).
+
+    One pass over the sales view stores each invoice as a run of integer
+    product codes in a flat array (products are grouped with the same key as
+    top_n_products_by_revenue). Pair counting then works on those ints:
+    products below the support threshold are dropped first (a pair can
+    never be more frequent than either of its products), so only
+    combinations of frequent products are counted, in a Counter keyed by
+    a single int per pair.
+
+    An invoice's lines are expected to be adjacent, as in the exports.
+    """
+
+    def __init__(self, max_basket_size: Optional[int] = None) -> None:
+        """
+        Args:
+            max_basket_size: Leave baskets with more distinct products
+                than this out of the statistics (bulk/wholesale orders add
+                many pairs but say little about affinity). Item counts,
+                pair counts and the basket total behind support,
+                confidence and lift all use the remaining baskets. None
+                keeps all.
+        """
+        self.max_basket_size = max_basket_size
+        self.products: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.items = array("I")      # product codes, basket after basket
+        self.ends = array("I")       # end offset of each basket in items
+
+    @classmethod
+    def from_transactions(
+        cls,
+        records: Iterable[Transaction],
+        max_basket_size: Optional[int] = None,
+    ) -> "MarketBasket":
+        """Collect baskets from raw transactions in one pass."""
+        return cls(max_basket_size).update(records)
+
+    def __len__(self) -> int:
+        """Number of baskets (invoices with at least one valid sale line)."""
+        return len(self.ends)
+
+    def update(self, records: Iterable[Transaction]) -> "MarketBasket":
+        """Append the baskets in records; returns self."""
+        codes, products = self._codes, self.products
+        basket: set = set()
+        invoice: Optional[str] = None
+        for t in records:
+            if t.is_cancellation or t.quantity <= 0 or t.unit_price <= 0.0:
+                continue
+            if t.invoice_no != invoice:
+                self._flush(basket)
+                basket = set()
+                invoice = t.invoice_no
+            key = product_key(t)
+            code = codes.get(key)
+            if code is None:
+                code = codes[key] = len(products)
+                products.append(key)
+            basket.add(code)
+        self._flush(basket)
+        return self
+
+    def _flush(self, basket: set) -> None:
+        if basket:
+            self.items.extend(sorted(basket))
+            self.ends.append(len(self.items))
+
+    def _baskets(self) -> Iterable[array]:
+        """Baskets within max_basket_size, the population every statistic uses."""
+        limit = self.max_basket_size
+        start = 0
+        for end in self.ends:
+            if limit is None or end - start <= limit:
+                yield self.items[start:end]
+            start = end
+
+    def basket_count(self) -> int:
+        """Number of baskets the statistics are computed over."""
+        if self.max_basket_size is None:
+            return len(self.ends)
+        return sum(1 for _ in self._baskets())
+
+    # ---- counting ----
+
+    def item_counts(self) -> List[int]:
+        """Number of counted baskets containing each product, indexed by product code."""
+        counts = [0] * len(self.products)
+        baskets = [self.items] if self.max_basket_size is None else self._baskets()
+        for basket in baskets:
+            for code in basket:
+                counts[code] += 1
+        return counts
+
+    def _min_count(self, min_support: float, total: int) -> int:
+        if not 0.0 < min_support <= 1.0:
+            raise ValueError("min_support must be within (0, 1]")
+        return max(1, math.ceil(min_support * total - 1e-9))
+
+    def pair_counts(self, min_support: float = 0.01) -> Dict[int, int]:
+        """
+        Baskets containing each frequent pair.
+
+        Returns:
+            Dict mapping a * len(products) + b (a < b product codes) ->
+            count, for pairs with at least min_support of the counted
+            baskets.
+        """
+        min_count = self._min_count(min_support, self.basket_count())
+        counts = self.item_counts()
+        frequent = [c >= min_count for c in counts]
+        n = len(self.products)
+
+        pairs: Counter = Counter()
+        for basket in self._baskets():
+            kept = [code for code in basket if frequent[code]]
+            if len(kept) > 1:
+                pairs.update(a * n + b for a, b in combinations(kept, 2))
+        return {key: c for key, c in pairs.items() if c >= min_count}
+
+    def frequent_pairs(self, min_support: float = 0.01, top: Optional[int] = None) -> List[Pair]:
+        """
+        Product pairs bought together in at least min_support of baskets.
+
+        Returns:
+            Pairs sorted by count descending (then by name).
+        """
+        n, total, names = len(self.products), self.basket_count(), self.products
+        out = [
+            Pair(names[key // n], names[key % n], count, count / total)
+            for key, count in self.pair_counts(min_support).items()
+        ]
+        out.sort(key=lambda p: (-p.count, p.a, p.b))
+        return out[:top] if top is not None else out
+
+    def rules(
+        self,
+        min_support: float = 0.01,
+        min_confidence: float = 0.0,
+        min_lift: float = 0.0,
+        top: Optional[int] = None,
+    ) -> List[Rule]:
+        """
+        Association rules a -> b from the frequent pairs, in both directions.
+
+        Args:
+            min_support: Minimum share of baskets containing both products.
+            min_confidence: Minimum P(b | a).
+            min_lift: Minimum lift (> 1: bought together more than chance).
+            top: Keep the first top rules.
+
+        Returns:
+            Rules sorted by lift, then confidence, descending.
+        """
+        n, total, names = len(self.products), self.basket_count(), self.products
+        items = self.item_counts()
+        out: List[Rule] = []
+        for key, count in self.pair_counts(min_support).items():
+            a, b = divmod(key, n)
+            for x, y in ((a, b), (b, a)):
+                confidence = count / items[x]
+                lift = confidence / (items[y] / total)
+                if confidence >= min_confidence and lift >= min_lift:
+                    out.append(Rule(names[x], names[y], count, count / total, confidence, lift))
+        out.sort(key=lambda r: (-r.lift, -r.confidence, r.antecedent, r.consequent))
+        return out[:top] if top is not None else out
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(baskets={len(self.ends)}, products={len(self.products)})"
@@ -0,0 +1,252 @@
+# src/columnar.py
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .models import Transaction
+
+__all__ = [
+    "COLUMNS",
+    "write_columnar",
+    "read_columnar",
+]
+
+# Transaction fields in schema order.
+COLUMNS = [
+    "invoice_no",
+    "stock_code",
+    "description",
+    "quantity",
+    "invoice_date",
+    "unit_price",
+    "customer_id",
+    "country",
+]
+
+# Suffix -> on-disk format understood by pyarrow.dataset.
+_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+
+
+def _require_pyarrow():
+    """
+    Import pyarrow lazily so the rest of the package works without it.
+
+    Raises:
+        ImportError with an install hint if pyarrow is unavailable.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "Parquet/Arrow support requires pyarrow (pip install pyarrow)"
+        ) from exc
+    return pa, ds
+
+
+def _format_for(path: Path, fmt: Optional[str]) -> str:
+    """Resolve the columnar format from an explicit name or the file suffix."""
+    if fmt is not None:
+        if fmt not in ("parquet", "ipc"):
+            raise ValueError("fmt must be 'parquet' or 'ipc'")
+        return fmt
+    try:
+        return _FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Cannot infer columnar format from {path.name!r}") from None
+
+
+def _schema(pa):
+    """
+    Arrow schema for transactions.
+
+    Low-cardinality strings are dictionary-encoded (each distinct value is
+    stored once, rows hold small integer codes) and the date is a native
+    timestamp, so nothing needs re-parsing on read.
+    """
+    dict_str = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("invoice_no", dict_str),
+        ("stock_code", dict_str),
+        ("description", dict_str),
+        ("quantity", pa.int32()),
+        ("invoice_date", pa.timestamp("s")),
+        ("unit_price", pa.float64()),
+        ("customer_id", dict_str),
+        ("country", dict_str),
+    ])
+
+
+class _Dictionaries:
+    """
+    Per-column dictionaries for the string columns.
+
+    For IPC one instance is shared by every batch of a file: codes stay
+    stable and each batch's dictionary extends the previous one, which lets
+    the writer emit dictionary deltas (the IPC file format rejects
+    dictionary replacement between batches). Parquet stores a dictionary
+    per row group, so it gets a fresh instance per batch; a shared one
+    would make every row group carry (and re-encode) all earlier values.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in names}
+        self._values: Dict[str, List[str]] = {name: [] for name in names}
+
+    def encode(self, pa, name: str, values: Sequence[Optional[str]]):
+        codes = self._codes[name]
+        seen = self._values[name]
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+                continue
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(seen)
+                seen.append(value)
+            indices.append(code)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()), pa.array(seen, type=pa.string())
+        )
+
+
+def _to_batch(pa, schema, dicts: _Dictionaries, rows: Sequence[Transaction]):
+    """Build one RecordBatch from a chunk of transactions."""
+    arrays = []
+    for name, field in zip(COLUMNS, schema):
+        values = [getattr(t, name) for t in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(dicts.encode(pa, name, values))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+# -----------------------------
+# Export
+# -----------------------------
+
+def write_columnar(
+    records: Iterable[Transaction],
+    out_path: str | Path,
+    fmt: Optional[str] = None,
+    batch_size: int = 65_536,
+) -> int:
+    """
+    Convert transactions to Parquet or Arrow IPC.
+
+    The input is consumed in batches, so a streaming load_transactions()
+    iterator can be converted without materializing the dataset. Each batch
+    becomes a Parquet row group (whose min/max statistics enable predicate
+    pushdown) or an IPC record batch.
+
+    Args:
+        records: Transactions to write.
+        out_path: Destination file; ".parquet"/".pq" or ".arrow"/".feather"/".ipc".
+        fmt: Override the format ("parquet" or "ipc").
+        batch_size: Rows per row group / record batch.
+
+    Returns:
+        Number of rows written.
+    """
+    pa, _ = _require_pyarrow()
+    path = Path(out_path)
+    fmt = _format_for(path, fmt)
+    schema = _schema(pa)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(str(path), schema, compression="zstd")
+    else:
+        import pyarrow.ipc as ipc
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        writer = ipc.new_file(str(path), schema, options=options)
+    dict_columns = [f.name for f in schema if pa.types.is_dictionary(f.type)]
+    shared = _Dictionaries(dict_columns) if fmt == "ipc" else None
+
+    written = 0
+    it = iter(records)
+    try:
+        while True:
+            chunk = list(islice(it, batch_size))
+            if not chunk:
+                break
+            dicts = shared if shared is not None else _Dictionaries(dict_columns)
+            batch = _to_batch(pa, schema, dicts, chunk)
+            if fmt == "parquet":
+                writer.write_batch(batch, row_group_size=batch_size)
+            else:
+                writer.write_batch(batch)
+            written += len(chunk)
+    finally:
+        writer.close()
+    return written
+
+
+# -----------------------------
+# Import
+# -----------------------------
+
+def read_columnar(
+    path: str | Path,
+    columns: Optional[Sequence[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    countries: Optional[Sequence[str]] = None,
+    fmt: Optional[str] = None,
+) -> Iterator[Transaction]:
+    """
+    Stream transactions from a Parquet or Arrow IPC file.
+
+    Filters are pushed down to pyarrow.dataset: Parquet row groups whose
+    statistics cannot match are skipped without decoding, and only the
+    projected columns are read from disk.
+
+    Args:
+        path: Parquet or Arrow IPC file written by write_columnar().
+        columns: Transaction fields to load; the others are set to None.
+            valid_transactions() needs invoice_no, quantity and unit_price.
+        start: Inclusive lower bound on invoice_date.
+        end: Exclusive upper bound on invoice_date.
+        countries: Keep only these countries.
+        fmt: Override the format ("parquet" or "ipc").
+
+    Yields:
+        Transaction objects (fields outside the projection are None).
+    """
+    pa, ds = _require_pyarrow()
+    p = Path(path)
+    dataset = ds.dataset(str(p), format=_format_for(p, fmt))
+
+    wanted = list(COLUMNS if columns is None else columns)
+    unknown = set(wanted) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown columns: {sorted(unknown)}")
+
+    expr: Any = None
+
+    def _and(e):
+        return e if expr is None else expr & e
+
+    if start is not None:
+        expr = _and(ds.field("invoice_date") >= pa.scalar(start, type=pa.timestamp("s")))
+    if end is not None:
+        expr = _and(ds.field("invoice_date") < pa.scalar(end, type=pa.timestamp("s")))
+    if countries is not None:
+        expr = _and(ds.field("country").isin(pa.array(list(countries), type=pa.string())))
+
+    for batch in dataset.to_batches(columns=wanted, filter=expr):
+        data = batch.to_pydict()
+        cols = [data.get(name) or [None] * batch.num_rows for name in COLUMNS]
+        for values in zip(*cols):
+            yield Transaction(*values)
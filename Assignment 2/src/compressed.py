@@ -0,0 +1,182 @@
+# src/compressed.py
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
+
+__all__ = [
+    "COMPRESSION_SUFFIXES",
+    "detect_compression",
+    "open_text",
+]
+
+# File suffix -> codec name.
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+# Leading bytes of each container format, for files without a telling suffix.
+_MAGIC = [
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+]
+
+# Decompressed bytes handed over per read-ahead chunk, and chunks in flight.
+_CHUNK_SIZE = 1 << 20
+_QUEUE_DEPTH = 4
+
+
+def detect_compression(path: str | Path) -> Optional[str]:
+    """
+    Identify a compressed file by suffix, falling back to its magic bytes.
+
+    Returns:
+        "gzip", "bz2", "xz", "zstd", or None for an uncompressed file.
+    """
+    p = Path(path)
+    codec = COMPRESSION_SUFFIXES.get(p.suffix.lower())
+    if codec is not None:
+        return codec
+    with p.open("rb") as f:
+        head = f.read(6)
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def _open_zstd(path: Path) -> BinaryIO:
+    """
+    Open a zstd stream through the optional zstandard package.
+
+    Raises:
+        ImportError with an install hint if zstandard is unavailable.
+    """
+    try:
+        import zstandard
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError("Reading .zst files requires zstandard (pip install zstandard)") from exc
+    return zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+
+
+def _open_binary(path: Path, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if codec == "bz2":
+        return bz2.open(path, "rb")
+    if codec == "xz":
+        return lzma.open(path, "rb")
+    if codec == "zstd":
+        return _open_zstd(path)
+    raise ValueError(f"Unknown compression {codec!r}")
+
+
+class _ReadAhead(io.RawIOBase):
+    """
+    Raw stream fed by a background thread that decompresses ahead.
+
+    zlib, bz2, lzma and zstandard release the GIL while decompressing, so
+    the worker inflates the next chunks while the caller parses the current
+    one. At most _QUEUE_DEPTH chunks are buffered.
+    """
+
+    def __init__(self, source: BinaryIO, chunk_size: int = _CHUNK_SIZE, depth: int = _QUEUE_DEPTH) -> None:
+        super().__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, name="read-ahead", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self._chunk_size)
+                if not self._put(chunk) or not chunk:
+                    return
+        except BaseException as exc:  # re-raised in the reading thread
+            self._put(exc)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def open_text(
+    path: str | Path,
+    encoding: str = "ISO-8859-1",
+    read_ahead: bool = True,
+) -> TextIO:
+    """
+    Open a data file for text reading, decompressing transparently.
+
+    Plain files are opened directly. gzip, bz2, xz and zstd (the latter
+    needs the zstandard package) are decoded as a stream, so no
+    decompressed copy is written to disk. With read_ahead, decompression
+    runs on a background thread and overlaps with CSV parsing.
+
+    Args:
+        path: File to open.
+        encoding: Text encoding of the (decompressed) content.
+        read_ahead: Decompress on a background thread.
+
+    Returns:
+        Text stream opened with newline="" as the csv module expects.
+    """
+    p = Path(path)
+    codec = detect_compression(p)
+    if codec is None:
+        return p.open(newline="", encoding=encoding)
+    binary = _open_binary(p, codec)
+    if read_ahead:
+        binary = io.BufferedReader(_ReadAhead(binary), buffer_size=_CHUNK_SIZE)
+    return io.TextIOWrapper(binary, encoding=encoding, newline="")
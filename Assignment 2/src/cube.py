@@ -0,0 +1,381 @@
+# src/cube.py
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .compressed import detect_compression
+from .grouping import WEEKDAYS, product_key
+from .io_utils import load_transactions
+from .models import Transaction
+
+__all__ = [
+    "DIMENSIONS",
+    "MEASURES",
+    "SalesCube",
+    "cube_path_for",
+    "load_or_build_cube",
+]
+
+# Cell key layout; every cell key is a tuple in this order.
+DIMENSIONS = ("country", "month", "weekday", "product", "customer")
+
+# Per-cell measures, stored as [revenue, units, lines].
+MEASURES = ("revenue", "units", "lines")
+
+_FORMAT_VERSION = 1
+
+Cell = Tuple[str, str, str, str, Optional[str]]
+
+
+def _dim_index(dim: str) -> int:
+    try:
+        return DIMENSIONS.index(dim)
+    except ValueError:
+        raise ValueError(f"Unknown dimension {dim!r}; choose from {DIMENSIONS}") from None
+
+
+def _measure_index(measure: str) -> int:
+    try:
+        return MEASURES.index(measure)
+    except ValueError:
+        raise ValueError(f"Unknown measure {measure!r}; choose from {MEASURES}") from None
+
+
+# -----------------------------
+# Cube
+# -----------------------------
+
+class SalesCube:
+    """
+    Pre-aggregated sales facts over (country, month, weekday, product, customer).
+
+    Each cell holds revenue, units and line count for valid sales (same
+    criteria as valid_transactions()). The report sections are rollups of
+    the cells and never touch raw rows:
+
+        rollup("country")               -> revenue_by_country
+        rollup("month")                 -> monthly_revenue
+        rollup("product", "units")      -> units_sold_per_product
+        dice(country="France").rollup("month")
+
+    Invoice-level metrics (average order value, cancellation summary) are
+    not additive over cells, so the cube also keeps the invoice sets they
+    need. Those are available on the full cube only, not on slices.
+    """
+
+    def __init__(self) -> None:
+        self.cells: Dict[Cell, List[float]] = {}
+        # Invoice-level state; None on sliced/diced sub-cubes.
+        self._invoices: Optional[Dict[str, Any]] = {
+            "all": set(),
+            "sales": set(),
+            "returns": set(),
+            "returns_net": 0.0,
+        }
+
+    # -- building --------------------------------------------------------
+
+    def update(self, records: Iterable[Transaction]) -> int:
+        """
+        Fold more raw transactions into the cube (incremental build).
+
+        Args:
+            records: Raw transactions (not pre-filtered); returns feed the
+                cancellation summary, valid sales feed the cells.
+
+        Returns:
+            Number of records consumed.
+        """
+        inv = self._require_invoices("update")
+        cells = self.cells
+        all_invoices: Set[str] = inv["all"]
+        sale_invoices: Set[str] = inv["sales"]
+        return_invoices: Set[str] = inv["returns"]
+        returns_net = inv["returns_net"]
+
+        n = 0
+        for t in records:
+            n += 1
+            all_invoices.add(t.invoice_no)
+            if t.is_cancellation or t.quantity <= 0:
+                return_invoices.add(t.invoice_no)
+                returns_net += t.line_total
+            if t.is_cancellation or t.quantity <= 0 or t.unit_price <= 0.0:
+                continue
+
+            sale_invoices.add(t.invoice_no)
+            d = t.invoice_date
+            key = (
+                t.country,
+                f"{d.year:04d}-{d.month:02d}",
+                WEEKDAYS[d.weekday()],
+                product_key(t),
+                t.customer_id,
+            )
+            cell = cells.get(key)
+            if cell is None:
+                cells[key] = [t.line_total, t.quantity, 1]
+            else:
+                cell[0] += t.line_total
+                cell[1] += t.quantity
+                cell[2] += 1
+
+        inv["returns_net"] = returns_net
+        return n
+
+    @classmethod
+    def build(cls, records: Iterable[Transaction]) -> "SalesCube":
+        """Build a cube from raw transactions in one pass."""
+        cube = cls()
+        cube.update(records)
+        return cube
+
+    # -- OLAP queries ----------------------------------------------------
+
+    def dice(self, **criteria: Any) -> "SalesCube":
+        """
+        Sub-cube restricted on one or more dimensions.
+
+        Args:
+            **criteria: dimension=value (slice) or dimension=collection of
+                values (dice), e.g. country="France", month={"2011-03", "2011-04"}.
+        """
+        tests = []
+        for dim, want in criteria.items():
+            i = _dim_index(dim)
+            allowed = {want} if isinstance(want, str) or want is None else set(want)
+            tests.append((i, allowed))
+
+        sub = SalesCube()
+        sub._invoices = None
+        sub.cells = {
+            key: cell for key, cell in self.cells.items() if all(key[i] in allowed for i, allowed in tests)
+        }
+        return sub
+
+    def slice(self, dim: str, value: Optional[str]) -> "SalesCube":
+        """Sub-cube with one dimension fixed to a single value."""
+        return self.dice(**{dim: value})
+
+    def rollup(self, *dims: str, measure: str = "revenue") -> Dict[Any, float]:
+        """
+        Aggregate a measure over the given dimensions.
+
+        Args:
+            *dims: Dimensions to keep; the others are summed out. With one
+                dimension keys are plain values, otherwise tuples. With none,
+                the result is {(): grand_total}.
+            measure: "revenue", "units" or "lines".
+
+        Returns:
+            Dict of group -> total, in first-seen order.
+        """
+        idx = [_dim_index(d) for d in dims]
+        m = _measure_index(measure)
+        agg: Dict[Any, float] = defaultdict(float)
+        if len(idx) == 1:
+            i = idx[0]
+            for key, cell in self.cells.items():
+                agg[key[i]] += cell[m]
+        else:
+            for key, cell in self.cells.items():
+                agg[tuple(key[i] for i in idx)] += cell[m]
+        return dict(agg)
+
+    def total(self, measure: str = "revenue") -> float:
+        """Grand total of a measure."""
+        m = _measure_index(measure)
+        return sum(cell[m] for cell in self.cells.values())
+
+    # -- report sections (same shapes as src.analysis) -------------------
+
+    def total_revenue(self) -> float:
+        """Sum of line totals over valid sales."""
+        return self.total("revenue")
+
+    def revenue_by_country(self) -> Dict[str, float]:
+        """Rounded revenue per country."""
+        return {k: round(v, 2) for k, v in self.rollup("country").items()}
+
+    def monthly_revenue(self) -> Dict[str, float]:
+        """Rounded revenue per "YYYY-MM"."""
+        return {k: round(v, 2) for k, v in self.rollup("month").items()}
+
+    def top_n_products_by_revenue(self, n: int = 10) -> List[Tuple[str, float]]:
+        """Top N products by revenue."""
+        if n <= 0:
+            return []
+        ranked = sorted(self.rollup("product").items(), key=lambda kv: kv[1], reverse=True)
+        return [(name, round(amount, 2)) for name, amount in ranked[:n]]
+
+    def top_n_customers_by_revenue(self, n: int = 10) -> List[Tuple[str, float]]:
+        """Top N customers (non-null IDs only) by revenue."""
+        if n <= 0:
+            return []
+        by_customer = {k: v for k, v in self.rollup("customer").items() if k}
+        ranked = sorted(by_customer.items(), key=lambda kv: kv[1], reverse=True)
+        return [(cust, round(amount, 2)) for cust, amount in ranked[:n]]
+
+    def sales_by_weekday(self) -> Dict[str, float]:
+        """Rounded revenue per weekday, always including all 7 days."""
+        agg = {d: 0.0 for d in WEEKDAYS}
+        agg.update(self.rollup("weekday"))
+        return {k: round(v, 2) for k, v in agg.items()}
+
+    def units_sold_per_product(self) -> Dict[str, int]:
+        """Units sold per product."""
+        return {k: int(v) for k, v in self.rollup("product", measure="units").items()}
+
+    def avg_order_value(self) -> float:
+        """Mean per-invoice revenue over valid sales (full cube only)."""
+        inv = self._require_invoices("avg_order_value")
+        count = len(inv["sales"])
+        return self.total_revenue() / count if count else 0.0
+
+    def cancellation_summary(self) -> Dict[str, float | int]:
+        """Invoice-level cancellation counts and amounts (full cube only)."""
+        inv = self._require_invoices("cancellation_summary")
+        total_invoices = len(inv["all"])
+        total_cancels = len(inv["returns"])
+        net_amount = inv["returns_net"]
+        rate = (total_cancels / total_invoices * 100.0) if total_invoices else 0.0
+        return {
+            "TotalCancellations": int(total_cancels),
+            "CancellationRate": round(rate, 2),
+            "CancelledNetAmount": round(net_amount, 2),
+            "CancelledAbsAmount": round(abs(net_amount), 2),
+        }
+
+    def _require_invoices(self, what: str) -> Dict[str, Any]:
+        if self._invoices is None:
+            raise ValueError(f"{what} needs the full cube, not a slice")
+        return self._invoices
+
+    # -- persistence -----------------------------------------------------
+
+    def save(self, path: str | Path, source: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Write the cube to path.
+
+        The cube is written to a temporary file next to path and renamed
+        over it, so a concurrent load() sees either the old cube or the
+        new one, never a partial file.
+
+        Args:
+            path: Destination file.
+            source: Opaque description of the data the cube covers, returned
+                by load() so callers can decide whether to extend it.
+        """
+        out = Path(path)
+        payload = {
+            "version": _FORMAT_VERSION,
+            "cells": self.cells,
+            "invoices": self._invoices,
+            "source": source,
+        }
+        fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=out.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, out)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return out
+
+    @classmethod
+    def load(cls, path: str | Path) -> Tuple[Optional["SalesCube"], Optional[Dict[str, Any]]]:
+        """
+        Read a cube written by save().
+
+        Returns:
+            (cube, source), or (None, None) if the file is missing, corrupt
+            or from another format version.
+        """
+        p = Path(path)
+        if not p.exists():
+            return None, None
+        try:
+            with p.open("rb") as f:
+                payload = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, ValueError):
+            return None, None
+        if not isinstance(payload, dict) or payload.get("version") != _FORMAT_VERSION:
+            return None, None
+        cube = cls()
+        cube.cells = payload["cells"]
+        cube._invoices = payload["invoices"]
+        return cube, payload["source"]
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(cells={len(self.cells)})"
+
+
+# -----------------------------
+# Persistence helpers
+# -----------------------------
+
+# Bytes hashed just before the previously-read end of file, to check that
+# a grown file was appended to rather than rewritten.
+_TAIL_BYTES = 4096
+
+
+def _tail_signature(path: Path, end: int) -> bytes:
+    with path.open("rb") as f:
+        f.seek(max(0, end - _TAIL_BYTES))
+        return f.read(min(end, _TAIL_BYTES))
+
+
+def cube_path_for(data_path: str | Path) -> Path:
+    """Cube file stored next to a data file ("<name>.cube")."""
+    p = Path(data_path)
+    return p.with_name(p.name + ".cube")
+
+
+def load_or_build_cube(
+    csv_path: str | Path,
+    cube_path: Optional[str | Path] = None,
+    rebuild: bool = False,
+) -> SalesCube:
+    """
+    Return an up-to-date cube for a CSV, doing as little work as possible.
+
+    - Unchanged CSV: the saved cube is loaded as-is.
+    - Appended CSV (grown, same bytes up to the old end): only the new
+      rows are parsed and folded in (uncompressed CSVs only).
+    - Anything else (or rebuild=True): the cube is rebuilt from scratch.
+
+    Args:
+        csv_path: Source CSV file.
+        cube_path: Where the cube is persisted; defaults to "<csv>.cube".
+        rebuild: Ignore any saved cube.
+    """
+    src = Path(csv_path)
+    dest = Path(cube_path) if cube_path is not None else cube_path_for(src)
+    size = src.stat().st_size
+
+    cube, source = (None, None) if rebuild else SalesCube.load(dest)
+    if cube is not None and source is not None:
+        old_size = source.get("size", -1)
+        if 0 < old_size <= size and _tail_signature(src, old_size) == source.get("tail"):
+            if old_size == size:
+                return cube
+            if source.get("tail", b"").endswith(b"\n") and detect_compression(src) is None:
+                cube.update(load_transactions(src, offset=old_size))
+            else:
+                cube = None
+        else:
+            cube = None
+
+    if cube is None:
+        cube = SalesCube.build(load_transactions(src))
+    cube.save(dest, source={"size": size, "tail": _tail_signature(src, size)})
+    return cube
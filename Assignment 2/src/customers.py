@@ -0,0 +1,261 @@
+# src/customers.py
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .models import Transaction
+from .multifile import accumulate_many
+from .timeseries import period_label
+
+__all__ = [
+    "FIELDS_USED",
+    "RFM",
+    "CustomerAccumulator",
+    "analyze_customers",
+]
+
+# Transaction fields read, for load_transactions(fields=...).
+FIELDS_USED = frozenset({"invoice_no", "quantity", "unit_price", "invoice_date", "customer_id"})
+
+
+class RFM(NamedTuple):
+    """Recency/frequency/monetary values of one customer and their 1..bins scores."""
+
+    recency_days: int
+    frequency: int
+    monetary: float
+    r_score: int
+    f_score: int
+    m_score: int
+
+    @property
+    def segment(self) -> str:
+        """Score triple as a string, e.g. "545"."""
+        return f"{self.r_score}{self.f_score}{self.m_score}"
+
+
+def _scores(values: Sequence[float], bins: int, ascending: bool = True) -> List[int]:
+    """
+    Rank-based quantile scores 1..bins; ties share the score of their first rank.
+
+    With ascending, larger values score higher; otherwise smaller values do
+    (recency: the most recent customers get the top score).
+    """
+    n = len(values)
+    order = sorted(range(n), key=values.__getitem__, reverse=not ascending)
+    out = [0] * n
+    prev: Any = None
+    score = 1
+    for rank, i in enumerate(order):
+        value = values[i]
+        if value != prev:
+            score, prev = 1 + rank * bins // n, value
+        out[i] = score
+    return out
+
+
+class CustomerAccumulator:
+    """
+    Per-customer state for RFM scoring and cohort retention, in one pass.
+
+    Customer IDs are dictionary-encoded to dense ints, and the state lives
+    in typed arrays indexed by that code: first and last purchase day,
+    order count and revenue (20 bytes per customer), plus a bitmask of the
+    months with a purchase and the ID dictionary itself. Memory therefore
+    grows with the number of customers only, never with rows or invoices.
+
+    Only valid sales with a customer ID are counted (as in
+    top_n_customers_by_revenue). An order is one invoice, counted when the
+    customer's invoice number changes, so a customer's lines for one
+    invoice are expected to be adjacent (as in the exports); different
+    customers may interleave freely. Accumulators over inputs with disjoint
+    invoices (files, partitions, workers) combine with merge().
+    """
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.first_day = array("i")
+        self.last_day = array("i")
+        self.frequency = array("I")
+        self.monetary = array("d")
+        self.active: List[int] = []          # bit k: purchase in month base_month + k
+        self._last_invoice: List[str] = []   # to count each invoice once
+        self.base_month: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _rebase(self, month: int) -> None:
+        """Move base_month down to month, shifting every activity mask."""
+        shift = self.base_month - month
+        self.active = [mask << shift for mask in self.active]
+        self.base_month = month
+
+    def _code(self, customer_id: str) -> int:
+        code = self.ids.get(customer_id)
+        if code is None:
+            code = self.ids[customer_id] = len(self.names)
+            self.names.append(customer_id)
+            self.first_day.append(2**31 - 1)
+            self.last_day.append(0)
+            self.frequency.append(0)
+            self.monetary.append(0.0)
+            self.active.append(0)
+            self._last_invoice.append("")
+        return code
+
+    def update(self, records: Iterable[Transaction]) -> "CustomerAccumulator":
+        """Fold records into the per-customer state; returns self."""
+        first_day, last_day = self.first_day, self.last_day
+        frequency, monetary = self.frequency, self.monetary
+        active, last_invoice = self.active, self._last_invoice
+        last_ts: Optional[datetime] = None
+        day = month = 0
+        for t in records:
+            if not t.customer_id or t.is_cancellation or t.quantity <= 0 or t.unit_price <= 0.0:
+                continue
+            if t.invoice_date != last_ts:
+                last_ts = t.invoice_date
+                day = last_ts.toordinal()
+                month = last_ts.year * 12 + last_ts.month - 1
+                if self.base_month is None:
+                    self.base_month = month
+                elif month < self.base_month:
+                    self._rebase(month)
+                    active = self.active
+            c = self._code(t.customer_id)
+            monetary[c] += t.quantity * t.unit_price
+            if t.invoice_no != last_invoice[c]:
+                last_invoice[c] = t.invoice_no
+                frequency[c] += 1
+            if day < first_day[c]:
+                first_day[c] = day
+            if day > last_day[c]:
+                last_day[c] = day
+            active[c] |= 1 << (month - self.base_month)
+        return self
+
+    def merge(self, other: "CustomerAccumulator") -> "CustomerAccumulator":
+        """Add another accumulator's customers into this one; returns self."""
+        if other.base_month is None:
+            return self
+        if self.base_month is None:
+            self.base_month = other.base_month
+        elif other.base_month < self.base_month:
+            self._rebase(other.base_month)
+        shift = other.base_month - self.base_month
+        for j, customer_id in enumerate(other.names):
+            c = self._code(customer_id)
+            self.first_day[c] = min(self.first_day[c], other.first_day[j])
+            self.last_day[c] = max(self.last_day[c], other.last_day[j])
+            self.frequency[c] += other.frequency[j]
+            self.monetary[c] += other.monetary[j]
+            self.active[c] |= other.active[j] << shift
+            self._last_invoice[c] = other._last_invoice[j]
+        return self
+
+    # ---- RFM ----
+
+    def rfm(self, as_of: Optional[date] = None, bins: int = 5) -> Dict[str, RFM]:
+        """
+        Recency/frequency/monetary values and quantile scores per customer.
+
+        Args:
+            as_of: Reference date for recency; defaults to the day after
+                the last purchase in the data.
+            bins: Number of score levels (5: quintiles, scores 1..5, where 5
+                is most recent / most frequent / highest spend).
+
+        Returns:
+            Dict mapping customer ID -> RFM.
+        """
+        if not self.names:
+            return {}
+        ref = as_of.toordinal() if as_of is not None else max(self.last_day) + 1
+        recency = [ref - d for d in self.last_day]
+        r = _scores(recency, bins, ascending=False)
+        f = _scores(self.frequency, bins)
+        m = _scores(self.monetary, bins)
+        return {
+            name: RFM(recency[i], self.frequency[i], round(self.monetary[i], 2), r[i], f[i], m[i])
+            for i, name in enumerate(self.names)
+        }
+
+    def segment_counts(self, as_of: Optional[date] = None, bins: int = 5) -> Dict[str, int]:
+        """Number of customers per RFM segment ("555", ...), largest first."""
+        counts = Counter(v.segment for v in self.rfm(as_of, bins).values())
+        return dict(counts.most_common())
+
+    # ---- cohorts ----
+
+    def _cohort_counts(self) -> Dict[int, List[int]]:
+        """Cohort month code -> active customers per month offset."""
+        out: Dict[int, List[int]] = {}
+        for mask in self.active:
+            first = (mask & -mask).bit_length() - 1
+            counts = out.setdefault(self.base_month + first, [])
+            mask >>= first
+            k = 0
+            while mask:
+                if k >= len(counts):
+                    counts.extend([0] * (k + 1 - len(counts)))
+                if mask & 1:
+                    counts[k] += 1
+                mask >>= 1
+                k += 1
+        return out
+
+    def cohort_sizes(self) -> Dict[str, int]:
+        """Customers acquired per month ("YYYY-MM" -> count), in month order."""
+        return {period_label(m, "month"): counts[0] for m, counts in sorted(self._cohort_counts().items())}
+
+    def cohort_retention(self, as_percent: bool = True) -> Dict[str, List[float]]:
+        """
+        Monthly acquisition cohort retention matrix.
+
+        Each cohort is the set of customers whose first purchase fell in
+        that month; entry k is the share (or count) of them that bought
+        again k months later. Entry 0 is 100% by definition. Rows end at
+        the last month in the data.
+
+        Args:
+            as_percent: Percentages rounded to 2 decimals instead of counts.
+
+        Returns:
+            Dict mapping "YYYY-MM" cohort -> list indexed by month offset.
+        """
+        counts = self._cohort_counts()
+        if not counts:
+            return {}
+        last = self.base_month + max(mask.bit_length() for mask in self.active) - 1
+        out: Dict[str, List[float]] = {}
+        for month, row in sorted(counts.items()):
+            row = row + [0] * (last - month + 1 - len(row))
+            size = row[0]
+            out[period_label(month, "month")] = [round(c / size * 100.0, 2) for c in row] if as_percent else row
+        return out
+
+
+def analyze_customers(
+    sources: str | Path | Iterable[str | Path],
+    workers: Optional[int] = None,
+    **filters: Any,
+) -> CustomerAccumulator:
+    """
+    Build a CustomerAccumulator over one or many CSV files in parallel.
+
+    Args:
+        sources: Files, directories, glob patterns, or a list of them.
+        workers: Worker processes (None: one per CPU; 1: run in-process).
+        **filters: load_transactions() filters and engine.
+
+    Returns:
+        The merged accumulator (see src.multifile.accumulate_many).
+    """
+    filters.setdefault("fields", FIELDS_USED)
+    return accumulate_many(sources, CustomerAccumulator, workers, **filters)
@@ -0,0 +1,295 @@
+# src/dataset.py
+from __future__ import annotations
+
+import os
+from array import array
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import analysis
+from .io_utils import expand_sources, load_transactions
+from .models import Transaction
+
+__all__ = [
+    "VIEWS",
+    "Dataset",
+]
+
+VIEWS = ("rows", "valid", "returns")
+
+# View each analysis function is evaluated on by Dataset.query. The sales-view
+# functions re-apply valid_transactions, which is a no-op on the valid view,
+# so their results are unchanged; the rest read every row.
+_DEFAULT_VIEW: Dict[str, str] = {
+    name: "valid"
+    for name in (
+        "total_revenue",
+        "revenue_by_country",
+        "monthly_revenue",
+        "top_n_products_by_revenue",
+        "top_n_customers_by_revenue",
+        "sales_by_weekday",
+        "avg_order_value",
+        "units_sold_per_product",
+    )
+}
+
+Key = Union[str, Callable[[Transaction], Hashable]]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable stand-in for a query argument (lists/sets/dicts by content)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _copy(result: Any) -> Any:
+    """Shallow copy of a mutable result, so callers cannot alter the cache."""
+    if isinstance(result, (dict, list, set)):
+        return result.copy()
+    return result
+
+
+class Dataset:
+    """
+    In-memory transactions with memoized views and analysis results.
+
+    The analysis functions are pure functions of their input rows, so
+    calling several of them on the same data repeats the same work: each
+    re-filters the sales view and re-evaluates line_total per row. A
+    Dataset keeps the rows once and derives, on first use only:
+
+        - the sales view (valid_transactions) and the returns view,
+        - the line totals of the sales view, as a typed array,
+        - every query result, keyed by function and arguments.
+
+    Results live in an LRU cache of cache_size entries. Views depend only
+    on the rows and results on the views, so extend() updates the views
+    incrementally (only the new rows are filtered) and drops the results,
+    while replace() and refresh() start over. Rows are never mutated in
+    place (Transaction is frozen), which makes these the only changes.
+
+    Results are returned as shallow copies; treat nested values as
+    read-only.
+    """
+
+    def __init__(self, records: Iterable[Transaction] = (), cache_size: int = 256) -> None:
+        """
+        Args:
+            records: Initial rows.
+            cache_size: Maximum number of memoized query results.
+        """
+        self.cache_size = cache_size
+        self.rows: List[Transaction] = list(records)
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._views: Dict[str, Any] = {}
+        self._results: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._source: Any = None
+        self._load_kwargs: Dict[str, Any] = {}
+        self._stamp: Optional[Tuple] = None
+
+    @classmethod
+    def load(
+        cls,
+        source: str | Path | Iterable[str | Path],
+        cache_size: int = 256,
+        **load_kwargs: Any,
+    ) -> "Dataset":
+        """
+        Read a dataset with load_transactions, remembering the source.
+
+        Args:
+            source: File(s), directory or glob, as for load_transactions.
+            cache_size: Maximum number of memoized query results.
+            **load_kwargs: load_transactions() options (filters, engine,
+                fields, ...).
+
+        Returns:
+            A Dataset whose refresh() re-reads the source when it changes.
+        """
+        ds = cls(cache_size=cache_size)
+        ds._source = source
+        ds._load_kwargs = load_kwargs
+        ds._stamp = ds._file_stamp()
+        ds.rows = list(load_transactions(source, **load_kwargs))
+        return ds
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self.rows)
+
+    # ---- changes ----
+
+    def invalidate(self) -> None:
+        """Drop every derived view and memoized result."""
+        self._views.clear()
+        self._results.clear()
+        self.version += 1
+
+    def replace(self, records: Iterable[Transaction]) -> "Dataset":
+        """Swap in new rows (invalidates everything); returns self."""
+        self.rows = list(records)
+        self.invalidate()
+        return self
+
+    def extend(self, records: Iterable[Transaction]) -> "Dataset":
+        """
+        Append rows; returns self.
+
+        Views already built are extended with just the new rows; memoized
+        results are dropped.
+        """
+        new = list(records)
+        if not new:
+            return self
+        self.rows.extend(new)
+        views = self._views
+        if "valid" in views:
+            added = list(analysis.valid_transactions(new))
+            views["valid"].extend(added)
+            if "line_totals" in views:
+                views["line_totals"].extend(t.line_total for t in added)
+        if "returns" in views:
+            views["returns"].extend(analysis.returns_view(new))
+        self._results.clear()
+        self.version += 1
+        return self
+
+    def _file_stamp(self) -> Tuple:
+        stamp = []
+        for path in expand_sources(self._source):
+            st = os.stat(path)
+            stamp.append((str(path), st.st_size, st.st_mtime_ns))
+        return tuple(stamp)
+
+    def refresh(self) -> bool:
+        """
+        Re-read the source of a Dataset.load() if any of its files changed.
+
+        Returns:
+            True if the data was reloaded (and the caches invalidated).
+        """
+        if self._source is None:
+            return False
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        self.replace(load_transactions(self._source, **self._load_kwargs))
+        self._stamp = stamp
+        return True
+
+    # ---- views ----
+
+    def view(self, name: str) -> List[Transaction]:
+        """
+        One of VIEWS: "rows" (all), "valid" (sales view) or "returns".
+
+        The list is built once and shared; do not modify it.
+        """
+        if name == "rows":
+            return self.rows
+        if name not in ("valid", "returns"):
+            raise ValueError(f"Unknown view {name!r}; expected one of {VIEWS}")
+        rows = self._views.get(name)
+        if rows is None:
+            fn = analysis.valid_transactions if name == "valid" else analysis.returns_view
+            rows = self._views[name] = list(fn(self.rows))
+        return rows
+
+    def valid(self) -> List[Transaction]:
+        """The sales view (see valid_transactions), built once."""
+        return self.view("valid")
+
+    def returns(self) -> List[Transaction]:
+        """The returns/cancellations view (see returns_view), built once."""
+        return self.view("returns")
+
+    def line_totals(self) -> array:
+        """line_total of each row of the sales view, in order, computed once."""
+        totals = self._views.get("line_totals")
+        if totals is None:
+            totals = self._views["line_totals"] = array("d", (t.line_total for t in self.valid()))
+        return totals
+
+    # ---- queries ----
+
+    def _memo(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        try:
+            hit = self._results.get(key)
+        except TypeError:
+            self.misses += 1
+            return compute()   # unhashable arguments: not cached
+        if hit is not None or key in self._results:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return _copy(hit)
+        self.misses += 1
+        result = compute()
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return _copy(result)
+
+    def query(self, fn: Callable[..., Any], *args: Any, view: Optional[str] = None, **kwargs: Any) -> Any:
+        """
+        Memoized fn(view_rows, *args, **kwargs).
+
+        Args:
+            fn: An analysis function (or any pure function of a row list).
+            *args, **kwargs: Extra arguments, part of the cache key.
+            view: Rows to pass (one of VIEWS). Defaults to "valid" for the
+                sales-view functions of src.analysis and "rows" otherwise.
+
+        Returns:
+            The function's result, computed at most once per arguments
+            until the data changes.
+        """
+        view = view or _DEFAULT_VIEW.get(getattr(fn, "__name__", ""), "rows")
+        key = ("query", fn, view, _freeze(args), _freeze(kwargs))
+        return self._memo(key, lambda: fn(self.view(view), *args, **kwargs))
+
+    def revenue_by(self, key: Key, ndigits: Optional[int] = 2) -> Dict[Hashable, float]:
+        """
+        Sales-view revenue grouped by a Transaction field or key function.
+
+        Uses the cached line totals, so no line_total is recomputed.
+
+        Args:
+            key: Field name ("country", "stock_code", ...) or a function
+                of a Transaction returning the group key.
+            ndigits: Rounding of the totals (None: unrounded).
+
+        Returns:
+            Dict mapping group -> revenue.
+        """
+        def compute() -> Dict[Hashable, float]:
+            agg: Dict[Hashable, float] = defaultdict(float)
+            rows = self.valid()
+            if isinstance(key, str):
+                for t, total in zip(rows, self.line_totals()):
+                    agg[getattr(t, key)] += total
+            else:
+                for t, total in zip(rows, self.line_totals()):
+                    agg[key(t)] += total
+            if ndigits is None:
+                return dict(agg)
+            return {k: round(v, ndigits) for k, v in agg.items()}
+
+        return self._memo(("revenue_by", key, ndigits), compute)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss counters and current cache size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._results), "version": self.version}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(rows={len(self.rows)}, cached={len(self._results)}, version={self.version})"
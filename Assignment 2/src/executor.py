@@ -0,0 +1,227 @@
+# src/executor.py
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+__all__ = [
+    "Task",
+    "ReportExecutor",
+]
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    One node of a report graph: fn(*dependency values, **kwargs).
+
+    Fields:
+        fn: Function computing the node. For nodes run in the process pool
+            it must be picklable (a module-level function).
+        deps: Names of the nodes (or inputs) whose values are passed to fn,
+            in order.
+        kwargs: Extra keyword arguments.
+        shared: Computed in the calling process and shared read-only with
+            the workers (parsed rows, views) instead of being sent back and
+            forth. Shared nodes may depend on inputs and shared nodes only.
+    """
+
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    kwargs: Mapping[str, Any] = field(default_factory=dict)
+    shared: bool = False
+
+
+# -----------------------------
+# Workers (module level so they pickle)
+# -----------------------------
+
+# Values of the shared nodes, set in the parent before the pool starts (and
+# so inherited copy-on-write under "fork"), or installed by _init_shared
+# under the other start methods.
+_SHARED: Dict[str, Any] = {}
+
+
+def _init_shared(values: Dict[str, Any]) -> None:
+    _SHARED.update(values)
+
+
+def _run(task: Task, results: Dict[str, Any]) -> Any:
+    """Evaluate task with its dependencies from results or the shared values."""
+    args = [results[d] if d in results else _SHARED[d] for d in task.deps]
+    return task.fn(*args, **task.kwargs)
+
+
+# -----------------------------
+# Executor
+# -----------------------------
+
+class ReportExecutor:
+    """
+    Run a DAG of report nodes, with independent metrics in a process pool.
+
+    Shared nodes (the parsed rows and the views derived from them) are
+    evaluated once in this process. The pool then uses the platform's
+    default start method. Under "fork" (Linux), the workers see those values
+    through copy-on-write memory without pickling a single row, and
+    gc.freeze() keeps the collector from touching (and so copying) the
+    inherited pages. Under "spawn" or "forkserver" (macOS, Windows), each
+    worker receives one pickled copy at start-up.
+
+    The other nodes are submitted as soon as their dependencies are done,
+    with results of earlier metrics passed along by value, so independent
+    sections run concurrently and the report takes about as long as its
+    slowest chain. Results are returned in graph order whatever the
+    completion order, and every node is the same deterministic function of
+    the same input as in a serial run, so the output does not depend on
+    the number of workers.
+    """
+
+    def __init__(self, graph: Mapping[str, Task], workers: Optional[int] = None) -> None:
+        """
+        Args:
+            graph: Node name -> Task, in output order.
+            workers: Worker processes (None: one per CPU; 1: run serially
+                in this process).
+
+        Raises:
+            ValueError: If a shared node depends on a pool node, or the
+                graph has a cycle.
+        """
+        self.graph = dict(graph)
+        self.workers = workers
+        for name, task in self.graph.items():
+            for dep in task.deps:
+                if task.shared and dep in self.graph and not self.graph[dep].shared:
+                    raise ValueError(f"shared node {name!r} depends on pool node {dep!r}")
+        self.order = self._toposort(self.graph)
+
+    @staticmethod
+    def _toposort(graph: Mapping[str, Task]) -> List[str]:
+        """Dependency order, keeping graph order among independent nodes."""
+        order: List[str] = []
+        state: Dict[str, int] = {}   # 1: visiting, 2: done
+
+        def visit(name: str) -> None:
+            if state.get(name) == 2 or name not in graph:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"cycle in report graph at {name!r}")
+            state[name] = 1
+            for dep in graph[name].deps:
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in graph:
+            visit(name)
+        return order
+
+    def _closure(self, targets: Iterable[str]) -> Set[str]:
+        needed: Set[str] = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self.graph:
+                raise KeyError(f"Unknown report node {name!r}")
+            needed.add(name)
+            stack.extend(d for d in self.graph[name].deps if d in self.graph)
+        return needed
+
+    def run(
+        self,
+        inputs: Optional[Mapping[str, Any]] = None,
+        targets: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute the target nodes.
+
+        Args:
+            inputs: Values for dependencies that are not nodes (e.g. "rows").
+            targets: Nodes to return (default: every non-shared node).
+                Their dependencies are computed as needed.
+
+        Returns:
+            Dict mapping target -> value, in graph order.
+
+        Raises:
+            KeyError: Unknown target, or a dependency that is neither a
+                node nor an input.
+        """
+        inputs = dict(inputs or {})
+        if targets is None:
+            targets = [name for name, task in self.graph.items() if not task.shared]
+        needed = self._closure(targets)
+        for name in needed:
+            for dep in self.graph[name].deps:
+                if dep not in self.graph and dep not in inputs:
+                    raise KeyError(f"Missing input {dep!r} for report node {name!r}")
+
+        shared = dict(inputs)
+        pending: List[str] = []
+        for name in self.order:
+            if name not in needed:
+                continue
+            task = self.graph[name]
+            if task.shared:
+                shared[name] = task.fn(*(shared[d] for d in task.deps), **task.kwargs)
+            else:
+                pending.append(name)
+
+        workers = self.workers or os.cpu_count() or 1
+        workers = min(workers, len(pending))
+        if workers <= 1:
+            results = self._run_serial(pending, shared)
+        else:
+            results = self._run_pool(pending, shared, workers)
+        return {name: results[name] if name in results else shared[name] for name in self.graph if name in targets}
+
+    def _run_serial(self, pending: List[str], shared: Dict[str, Any]) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        saved = dict(_SHARED)
+        _SHARED.update(shared)
+        try:
+            for name in pending:   # already in dependency order
+                results[name] = _run(self.graph[name], results)
+        finally:
+            _SHARED.clear()
+            _SHARED.update(saved)
+        return results
+
+    def _run_pool(self, pending: List[str], shared: Dict[str, Any], workers: int) -> Dict[str, Any]:
+        # Forcing "fork" is unsafe where the platform default is not fork
+        # (e.g. macOS system frameworks), so only rely on it when it is.
+        context = multiprocessing.get_context()
+        if context.get_start_method() == "fork":
+            pool_args: Dict[str, Any] = {}
+        else:
+            pool_args = {"initializer": _init_shared, "initargs": (shared,)}
+
+        results: Dict[str, Any] = {}
+        remaining = list(pending)
+        running: Dict[Future, str] = {}
+        _SHARED.update(shared)
+        gc.freeze()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, **pool_args) as pool:
+                while remaining or running:
+                    for name in list(remaining):
+                        task = self.graph[name]
+                        deps = [d for d in task.deps if d in self.graph and not self.graph[d].shared]
+                        if all(d in results for d in deps):
+                            remaining.remove(name)
+                            running[pool.submit(_run, task, {d: results[d] for d in deps})] = name
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+        finally:
+            gc.unfreeze()
+            for name in shared:
+                _SHARED.pop(name, None)
+        return results
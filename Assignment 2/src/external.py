@@ -0,0 +1,280 @@
+# src/external.py
+from __future__ import annotations
+
+import heapq
+import operator
+import pickle
+import shutil
+import tempfile
+from collections import defaultdict
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from . import grouping
+from .grouping import WEEKDAYS, product_key
+from .models import Transaction
+from .timeseries import period_label
+
+__all__ = [
+    "COMBINERS",
+    "ExternalGroupBy",
+    "external_report",
+]
+
+# Associative, commutative ways to combine two partial values of a group.
+COMBINERS: Dict[str, Callable[[Any, Any], Any]] = {
+    "sum": operator.add,
+    "or": operator.or_,
+    "min": min,
+    "max": max,
+}
+
+# Invoice flags for external_report (combined with "or").
+_SEEN, _SALE, _RETURN = 0, 1, 2
+
+_HASH_MASK = 2**64 - 1
+
+
+class ExternalGroupBy:
+    """
+    Group-by aggregation that spills to disk beyond a memory budget.
+
+    Groups are combined in a dict until it holds more than max_groups
+    keys. The dict is then hash-partitioned into `partitions` spill files
+    (one pickled batch per partition per spill) and cleared. items()
+    merges the spills one partition at a time: every occurrence of a key
+    lands in the same partition, so each partition is combined on its own,
+    exactly, with about 1/partitions of the groups in memory. A partition
+    that is still over budget is split again on the next digits of the
+    key's hash, so the budget holds at every level.
+
+    Without spills this is a plain dict and nothing touches the disk.
+    Hash partitioning uses hash(), which is stable within one process;
+    spill files are private to the instance and removed by items() (once
+    exhausted) or close().
+    """
+
+    def __init__(
+        self,
+        combine: str | Callable[[Any, Any], Any] = "sum",
+        max_groups: int = 1_000_000,
+        partitions: int = 16,
+        tmpdir: Optional[str | Path] = None,
+        _level: int = 0,
+    ) -> None:
+        """
+        Args:
+            combine: A COMBINERS name or a function (old, new) -> combined.
+            max_groups: Groups kept in memory before spilling.
+            partitions: Spill files per spill level.
+            tmpdir: Parent directory for the spill files (default: the
+                system temporary directory).
+        """
+        if max_groups < 1 or partitions < 2:
+            raise ValueError("max_groups must be >= 1 and partitions >= 2")
+        self.combine = COMBINERS[combine] if isinstance(combine, str) else combine
+        self.max_groups = max_groups
+        self.partitions = partitions
+        self.tmpdir = tmpdir
+        self.groups: Dict[Hashable, Any] = {}
+        self.spills = 0
+        self._level = _level
+        self._div = partitions**_level   # level k partitions on base-n digit k of the hash
+        self._dir: Optional[Path] = None
+
+    def __enter__(self) -> "ExternalGroupBy":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def add(self, key: Hashable, value: Any) -> None:
+        """Combine value into the group key."""
+        groups = self.groups
+        old = groups.get(key)
+        groups[key] = value if old is None else self.combine(old, value)
+        if len(groups) > self.max_groups:
+            self.spill()
+
+    def update(self, items: Iterable[Tuple[Hashable, Any]]) -> "ExternalGroupBy":
+        """Combine (key, value) pairs; returns self."""
+        groups, combine, limit = self.groups, self.combine, self.max_groups
+        for key, value in items:
+            old = groups.get(key)
+            groups[key] = value if old is None else combine(old, value)
+            if len(groups) > limit:
+                self.spill()
+        return self
+
+    def maybe_spill(self) -> None:
+        """Spill if over budget, for callers that update .groups directly."""
+        if len(self.groups) > self.max_groups:
+            self.spill()
+
+    def _path(self, p: int) -> Path:
+        return self._dir / f"part-{p:03d}.pkl"
+
+    def spill(self) -> None:
+        """Write the in-memory groups to the partition files and clear them."""
+        if not self.groups or self._div > _HASH_MASK:
+            return   # nothing to spill, or only full hash collisions left: keep in memory
+        if self._dir is None:
+            self._dir = Path(tempfile.mkdtemp(prefix="groupby-", dir=self.tmpdir))
+        n, div = self.partitions, self._div
+        parts: List[List[Tuple[Hashable, Any]]] = [[] for _ in range(n)]
+        for item in self.groups.items():
+            parts[(hash(item[0]) & _HASH_MASK) // div % n].append(item)
+        for p, part in enumerate(parts):
+            if part:
+                with open(self._path(p), "ab") as f:
+                    pickle.dump(part, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.groups.clear()
+        self.spills += 1
+
+    def _batches(self, p: int) -> Iterator[List[Tuple[Hashable, Any]]]:
+        path = self._path(p)
+        if not path.exists():
+            return
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """
+        Yield every (key, combined value) once.
+
+        Without spills, keys come in first-seen order; otherwise in
+        partition order. Consumes the spill files.
+        """
+        if self._dir is None:
+            yield from self.groups.items()
+            return
+        self.spill()
+        try:
+            for p in range(self.partitions):
+                child = ExternalGroupBy(
+                    self.combine, self.max_groups, self.partitions, self._dir, _level=self._level + 1
+                )
+                with child:
+                    for batch in self._batches(p):
+                        child.update(batch)
+                    self._path(p).unlink(missing_ok=True)
+                    yield from child.items()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Remove the spill files and forget the groups."""
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
+        self.groups = {}
+
+
+def external_report(
+    records: Iterable[Transaction],
+    top_n: int = 10,
+    max_groups: int = 1_000_000,
+    partitions: int = 16,
+    tmpdir: Optional[str | Path] = None,
+) -> Dict[str, Any]:
+    """
+    Exact single-pass report whose memory is bounded by max_groups.
+
+    Like stream_report(), but the high-cardinality groups (revenue and
+    units per product, revenue per customer, and the invoice flags behind
+    avg_order_value and cancellation_summary) are ExternalGroupBy
+    instances, so they spill to disk instead of exhausting memory. The
+    invoice sets become one group per invoice with sale/return bits.
+    Countries, months and weekdays stay in memory.
+
+    Totals and counts are exact; sums that were split by a spill can
+    differ from an in-memory run in the last float digit, and equal values
+    in a top-N list may come out in another order. units_sold_per_product
+    holds the top_n products only (as printed), not every product.
+
+    Args:
+        records: Raw transactions, typically a load_transactions() generator.
+        top_n: Size of the top products/customers/units lists.
+        max_groups: In-memory groups per grouping before it spills.
+        partitions: Spill files per grouping.
+        tmpdir: Parent directory for spill files.
+
+    Returns:
+        Report dict with the same keys as main.build_report().
+    """
+    options = dict(max_groups=max_groups, partitions=partitions, tmpdir=tmpdir)
+    products = ExternalGroupBy("sum", **options)
+    units = ExternalGroupBy("sum", **options)
+    customers = ExternalGroupBy("sum", **options)
+    invoices = ExternalGroupBy("or", **options)
+    budgeted = (products, units, customers, invoices)
+
+    by_country: Dict[str, float] = defaultdict(float)
+    by_month: Dict[int, float] = defaultdict(float)
+    by_weekday = [0.0] * 7
+    revenue = returns_net = 0.0
+
+    # The dicts are updated inline and checked every `step` rows, so a
+    # budget can be exceeded by at most that many groups.
+    step = min(4096, max_groups)
+    by_product, by_units = products.groups, units.groups
+    by_customer, flags = customers.groups, invoices.groups
+    for i, t in enumerate(records):
+        if not i % step:
+            for g in budgeted:
+                g.maybe_spill()
+        invoice = t.invoice_no
+        line_total = t.quantity * t.unit_price
+        if t.is_cancellation or t.quantity <= 0:
+            flags[invoice] = flags.get(invoice, _SEEN) | _RETURN
+            returns_net += line_total
+            continue
+        if t.unit_price <= 0.0:
+            flags.setdefault(invoice, _SEEN)
+            continue
+
+        revenue += line_total
+        d = t.invoice_date
+        by_country[t.country] += line_total
+        by_month[d.year * 12 + d.month - 1] += line_total
+        by_weekday[d.weekday()] += line_total
+        product = product_key(t)
+        by_product[product] = by_product.get(product, 0.0) + line_total
+        by_units[product] = by_units.get(product, 0) + t.quantity
+        if t.customer_id:
+            by_customer[t.customer_id] = by_customer.get(t.customer_id, 0.0) + line_total
+        flags[invoice] = flags.get(invoice, _SEEN) | _SALE
+
+    total_invoices = n_sales = total_cancels = 0
+    for _, flag in invoices.items():
+        total_invoices += 1
+        n_sales += flag & _SALE
+        total_cancels += flag >> 1
+    rate = (total_cancels / total_invoices * 100.0) if total_invoices else 0.0
+
+    top_units = heapq.nlargest(top_n, units.items(), key=itemgetter(1)) if top_n > 0 else []
+    top_products = grouping.top_n(products.items(), top_n)
+    top_customers = grouping.top_n(customers.items(), top_n)
+    for g in budgeted:
+        g.close()   # items() cleans up when exhausted; this covers top_n <= 0
+    return {
+        "total_revenue": revenue,
+        "revenue_by_country": {k: round(v, 2) for k, v in by_country.items()},
+        "monthly_revenue": {period_label(k, "month"): round(v, 2) for k, v in by_month.items()},
+        "top_products": top_products,
+        "top_customers": top_customers,
+        "avg_order_value": revenue / n_sales if n_sales else 0.0,
+        "units_sold_per_product": dict(top_units),
+        "sales_by_weekday": {day: round(v, 2) for day, v in zip(WEEKDAYS, by_weekday)},
+        "cancellation_summary": {
+            "TotalCancellations": int(total_cancels),
+            "CancellationRate": round(rate, 2),
+            "CancelledNetAmount": round(returns_net, 2),
+            "CancelledAbsAmount": round(abs(returns_net), 2),
+        },
+    }
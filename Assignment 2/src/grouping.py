@@ -0,0 +1,40 @@
+# src/grouping.py
+from __future__ import annotations
+
+import heapq
+from operator import itemgetter
+from typing import Hashable, Iterable, List, Tuple, TypeVar
+
+from .models import Transaction
+
+__all__ = [
+    "WEEKDAYS",
+    "product_key",
+    "top_n",
+]
+
+# Report order of the weekday section; index i is datetime.weekday() == i.
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def product_key(t: Transaction) -> str:
+    """
+    Determine the display key for product grouping.
+
+    Uses description when present, otherwise falls back to stock code.
+    """
+    return (t.description or t.stock_code).strip()
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+def top_n(items: Iterable[Tuple[K, float]], n: int) -> List[Tuple[K, float]]:
+    """
+    The n (key, amount) pairs with the largest amounts, amounts rounded.
+
+    Ties keep their input order, as with a stable descending sort.
+    """
+    if n <= 0:
+        return []
+    return [(k, round(v, 2)) for k, v in heapq.nlargest(n, items, key=itemgetter(1))]
@@ -0,0 +1,281 @@
+# src/indexing.py
+from __future__ import annotations
+
+import pickle
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .io_utils import load_transactions
+from .models import Transaction
+
+__all__ = [
+    "INDEXED_FIELDS",
+    "TransactionIndex",
+    "index_path_for",
+    "load_indexed",
+]
+
+# Index name -> key extractor. Rows whose key is None are not indexed.
+_KEYS: Dict[str, Callable[[Transaction], Optional[str]]] = {
+    "customer_id": lambda t: t.customer_id,
+    "stock_code": lambda t: t.stock_code,
+    "country": lambda t: t.country,
+    # Same "YYYY-MM" format as monthly_revenue().
+    "month": lambda t: f"{t.invoice_date.year:04d}-{t.invoice_date.month:02d}",
+}
+
+INDEXED_FIELDS = tuple(_KEYS)
+
+_FORMAT_VERSION = 2
+
+# Row offsets are stored as unsigned 32-bit ints (4 bytes per entry).
+_OFFSET_TYPE = "I"
+
+
+def _contains(offsets: array, value: int) -> bool:
+    """Membership test on a sorted offset array."""
+    i = bisect_left(offsets, value)
+    return i < len(offsets) and offsets[i] == value
+
+
+def _fingerprint(path: Path) -> Tuple[int, int]:
+    """(size, mtime_ns) of a data file, used to detect a stale index."""
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def _loader_key(loader: Callable[..., Any], filters: Dict[str, Any]) -> Optional[str]:
+    """
+    Stable identity of a loader call, or None if it cannot be named.
+
+    Module-level functions are identified by their qualified name and the
+    filter arguments (sets sorted, so the key does not depend on hash
+    order). Lambdas and local functions have no stable name, so rows they
+    produce are never reused from disk.
+    """
+    name = f"{getattr(loader, '__module__', '')}.{getattr(loader, '__qualname__', '<?>')}"
+    if "<" in name:
+        return None
+    parts = []
+    for k, v in sorted(filters.items()):
+        if isinstance(v, (set, frozenset)):
+            v = sorted(v)
+        parts.append(f"{k}={v!r}")
+    return f"{name}({', '.join(parts)})"
+
+
+# -----------------------------
+# Index
+# -----------------------------
+
+class TransactionIndex:
+    """
+    Secondary indexes over a materialized list of transactions.
+
+    Each indexed field maps a key to a sorted array of row offsets into the
+    list the index was built from, so a lookup such as "rows for customer X"
+    is a dict access instead of a full scan. Combined lookups intersect the
+    offset arrays, starting from the smallest.
+
+    Indexed fields: customer_id, stock_code, country, month ("YYYY-MM").
+    """
+
+    def __init__(self, fields: Dict[str, Dict[str, array]], row_count: int) -> None:
+        self._fields = fields
+        self.row_count = row_count
+
+    @classmethod
+    def build(cls, records: Sequence[Transaction]) -> "TransactionIndex":
+        """
+        Build every index in one pass over records.
+
+        Args:
+            records: The materialized dataset; offsets refer to its positions.
+        """
+        fields: Dict[str, Dict[str, array]] = {name: {} for name in _KEYS}
+        extractors = [(fields[name], key_fn) for name, key_fn in _KEYS.items()]
+        for offset, t in enumerate(records):
+            for buckets, key_fn in extractors:
+                key = key_fn(t)
+                if key is None:
+                    continue
+                offsets = buckets.get(key)
+                if offsets is None:
+                    offsets = buckets[key] = array(_OFFSET_TYPE)
+                offsets.append(offset)
+        return cls(fields, len(records))
+
+    # -- lookups ---------------------------------------------------------
+
+    def keys(self, field: str) -> List[str]:
+        """Distinct keys of one indexed field."""
+        return list(self._index(field))
+
+    def _index(self, field: str) -> Dict[str, array]:
+        try:
+            return self._fields[field]
+        except KeyError:
+            raise ValueError(f"{field!r} is not indexed; choose from {INDEXED_FIELDS}") from None
+
+    def offsets(self, **criteria: str) -> array:
+        """
+        Row offsets matching every criterion, in ascending order.
+
+        Args:
+            **criteria: field=key pairs, e.g. customer_id="12345", month="2011-03".
+
+        Returns:
+            Sorted offset array (empty if nothing matches). A single-criterion
+            lookup returns the stored array itself; do not modify it.
+        """
+        if not criteria:
+            raise ValueError("at least one criterion is required")
+        empty = array(_OFFSET_TYPE)
+        lists = [self._index(field).get(key, empty) for field, key in criteria.items()]
+        lists.sort(key=len)
+        first, rest = lists[0], lists[1:]
+        if not rest:
+            return first
+        return array(_OFFSET_TYPE, (i for i in first if all(_contains(other, i) for other in rest)))
+
+    def count(self, **criteria: str) -> int:
+        """Number of rows matching every criterion."""
+        return len(self.offsets(**criteria))
+
+    def select(self, records: Sequence[Transaction], **criteria: str) -> Iterator[Transaction]:
+        """Yield the matching rows of records (the list the index was built from)."""
+        for i in self.offsets(**criteria):
+            yield records[i]
+
+    def subset(self, records: Sequence[Transaction], **criteria: str) -> List[Transaction]:
+        """
+        Index-driven subset, ready for any src.analysis function.
+
+        Example:
+            total_revenue(index.subset(rows, customer_id="12345"))
+        """
+        return list(self.select(records, **criteria))
+
+    # -- persistence -----------------------------------------------------
+
+    def save(
+        self,
+        path: str | Path,
+        source: Optional[str | Path] = None,
+        rows: Optional[Sequence[Transaction]] = None,
+        key: Optional[str] = None,
+    ) -> Path:
+        """
+        Write the index to path.
+
+        Args:
+            path: Destination file.
+            source: Data file the index was built from; its size and mtime
+                are recorded so load() can reject a stale index.
+            rows: The rows the index was built from, stored alongside it
+                so load_indexed() can skip parsing the data file.
+            key: Identity of the loader call that produced rows.
+        """
+        out = Path(path)
+        payload = {
+            "version": _FORMAT_VERSION,
+            "row_count": self.row_count,
+            "source": _fingerprint(Path(source)) if source is not None else None,
+            "key": key,
+            "fields": self._fields,
+            "rows": list(rows) if rows is not None else None,
+        }
+        with out.open("wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return out
+
+    @staticmethod
+    def _payload(
+        path: str | Path, source: Optional[str | Path] = None, key: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        p = Path(path)
+        if not p.exists():
+            return None
+        with p.open("rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != _FORMAT_VERSION:
+            return None
+        if source is not None and payload.get("source") != _fingerprint(Path(source)):
+            return None
+        if key is not None and payload.get("key") != key:
+            return None
+        return payload
+
+    @classmethod
+    def load(
+        cls, path: str | Path, source: Optional[str | Path] = None, key: Optional[str] = None
+    ) -> Optional["TransactionIndex"]:
+        """
+        Read an index written by save().
+
+        Returns:
+            The index, or None if the file is missing, from another format
+            version, (when source is given) built from a different version
+            of the data file, or (when key is given) from another loader
+            call.
+        """
+        payload = cls._payload(path, source, key)
+        if payload is None:
+            return None
+        return cls(payload["fields"], payload["row_count"])
+
+    def __repr__(self) -> str:
+        sizes = ", ".join(f"{name}={len(buckets)}" for name, buckets in self._fields.items())
+        return f"{self.__class__.__name__}(rows={self.row_count}, {sizes})"
+
+
+# -----------------------------
+# Load helpers
+# -----------------------------
+
+def index_path_for(data_path: str | Path) -> Path:
+    """Index file stored next to a data file ("<name>.idx")."""
+    p = Path(data_path)
+    return p.with_name(p.name + ".idx")
+
+
+def load_indexed(
+    data_path: str | Path,
+    loader: Callable[..., Iterable[Transaction]] = load_transactions,
+    rebuild: bool = False,
+    **filters: Any,
+) -> Tuple[List[Transaction], TransactionIndex]:
+    """
+    Load a dataset together with its secondary indexes.
+
+    The parsed rows and their index are saved together in "<data_path>.idx"
+    and read back from there while the data file, the loader and the
+    filters are unchanged, so later calls skip the CSV parse entirely.
+    Otherwise the file is loaded, indexed and saved once. Rows from a
+    loader without a stable name (a lambda or local function) are not
+    reused; the file is parsed on every call.
+
+    Args:
+        data_path: CSV (or other file understood by loader).
+        loader: Function streaming transactions from data_path.
+        rebuild: Ignore any saved index and rebuild it.
+        **filters: Keyword arguments for loader (e.g. start, countries).
+
+    Returns:
+        (rows, index) where index offsets refer to rows.
+    """
+    path = Path(data_path)
+    idx_path = index_path_for(path)
+    key = _loader_key(loader, filters)
+
+    if not rebuild and key is not None:
+        payload = TransactionIndex._payload(idx_path, source=path, key=key)
+        if payload is not None and payload.get("rows") is not None:
+            return payload["rows"], TransactionIndex(payload["fields"], payload["row_count"])
+
+    rows = list(loader(path, **filters))
+    index = TransactionIndex.build(rows)
+    index.save(idx_path, source=path, rows=rows if key is not None else None, key=key)
+    return rows, index
@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 import csv
+import dataclasses
+import glob
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Any, Collection, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
+from .compressed import COMPRESSION_SUFFIXES, detect_compression, open_text
 from .models import Transaction
 
 # Maps various messy CSV header variants to normalized canonical names.
@@ -23,6 +28,20 @@ HEADER_MAP = {
     "country": "Country",
 }
 
+# Transaction fields, in declaration order; the unit of column projection.
+FIELDS = tuple(f.name for f in dataclasses.fields(Transaction))
+
+# Row readers selectable with load_transactions(engine=...).
+ENGINES = ("csv", "mmap")
+
+# File suffixes picked up when a directory is given as input (optionally
+# followed by a compression suffix, e.g. ".csv.gz").
+DATA_SUFFIXES = {".csv"}
+
+# Distinct raw timestamps remembered by the readers before their date
+# cache is reset.
+_DATE_CACHE_SIZE = 1 << 16
+
 # Set of date formats observed in the Online Retail datasets.
 DATE_FORMATS = [
     "%m/%d/%y %H:%M",
@@ -81,36 +100,340 @@ def _opt_str(val: str | None) -> Optional[str]:
     return v or None
 
 
-def load_transactions(csv_path: str | Path, encoding: str = "ISO-8859-1") -> Iterator[Transaction]:
+def _projection(
+    fields: Optional[Collection[str]],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    countries: Optional[Iterable[str]] = None,
+    customers: Optional[Iterable[str]] = None,
+    cancellations: Optional[bool] = None,
+) -> FrozenSet[str]:
+    """
+    Resolve a column projection, adding the columns the filters read.
+
+    Raises:
+        ValueError: If a name is not a Transaction field.
+    """
+    if fields is None:
+        return frozenset(FIELDS)
+    wanted = set(fields)
+    unknown = wanted - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)}")
+    if start is not None or end is not None:
+        wanted.add("invoice_date")
+    if countries is not None:
+        wanted.add("country")
+    if customers is not None:
+        wanted.add("customer_id")
+    if cancellations is not None:
+        wanted.add("invoice_no")
+    return frozenset(wanted)
+
+
+def _is_data_file(path: Path) -> bool:
+    suffixes = [s.lower() for s in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSION_SUFFIXES:
+        suffixes.pop()
+    return path.is_file() and bool(suffixes) and suffixes[-1] in DATA_SUFFIXES
+
+
+def _is_pattern(source: str) -> bool:
+    return any(ch in source for ch in "*?[")
+
+
+def expand_sources(sources: str | Path | Iterable[str | Path]) -> List[Path]:
+    """
+    Resolve input specifications into an ordered list of data files.
+
+    Each source may be a file, a directory (its *.csv files, compressed or
+    not), or a glob
+    pattern ("data/2011-*.csv", "exports/**/*.csv"). Files are returned in
+    sorted order per source, without duplicates.
+
+    Args:
+        sources: One source or an iterable of sources.
+
+    Returns:
+        List of file paths.
+
+    Raises:
+        FileNotFoundError: If a directory or pattern matches no files.
+    """
+    if isinstance(sources, (str, Path)):
+        sources = [sources]
+
+    out: List[Path] = []
+    seen = set()
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            matches = sorted(p for p in path.iterdir() if _is_data_file(p))
+        elif not path.exists() and _is_pattern(str(source)):
+            matches = sorted(Path(p) for p in glob.glob(str(source), recursive=True) if Path(p).is_file())
+        else:
+            matches = [path]
+        if not matches:
+            raise FileNotFoundError(f"No input files match {str(source)!r}")
+        for match in matches:
+            key = match.resolve()
+            if key not in seen:
+                seen.add(key)
+                out.append(match)
+    return out
+
+
+# -----------------------------
+# Invoice ranges (cross-file dedupe)
+# -----------------------------
+
+def invoice_key(invoice_no: str) -> Tuple[int, str]:
+    """
+    Order key used to compare the invoice ranges of two files.
+
+    The cancellation prefix is dropped and shorter numbers sort first, so
+    "C536379" sits next to "536379" and "99999" comes before "100000".
+    """
+    number = invoice_no.strip().lstrip("cC")
+    return len(number), number
+
+
+class InvoiceRange:
+    """
+    Smallest and largest invoice_key() seen in one file.
+
+    Exports of different periods have disjoint ranges and so cannot share
+    an invoice. Cross-file dedupe only has to compare invoices one by one
+    inside the window where two ranges overlap (see overlap()). Keeping
+    every invoice number instead would make memory grow with the data.
     """
-    Stream transactions from a Retail CSV file.
+
+    __slots__ = ("lo", "hi")
+
+    def __init__(self) -> None:
+        self.lo: Optional[Tuple[int, str]] = None
+        self.hi: Optional[Tuple[int, str]] = None
+
+    def add(self, invoice_no: str) -> None:
+        """Widen the range to cover one invoice."""
+        key = invoice_key(invoice_no)
+        if self.lo is None or key < self.lo:
+            self.lo = key
+        if self.hi is None or key > self.hi:
+            self.hi = key
+
+    def update(self, invoices: Iterable[str]) -> "InvoiceRange":
+        """Widen the range to cover invoices; returns self."""
+        keys = [invoice_key(inv) for inv in set(invoices)]
+        if keys:
+            lo, hi = min(keys), max(keys)
+            if self.lo is None or lo < self.lo:
+                self.lo = lo
+            if self.hi is None or hi > self.hi:
+                self.hi = hi
+        return self
+
+    def overlap(self, other: "InvoiceRange") -> Optional[Tuple[Tuple[int, str], Tuple[int, str]]]:
+        """The (lo, hi) keys both ranges cover, or None if they are disjoint."""
+        if self.lo is None or other.lo is None:
+            return None
+        lo, hi = max(self.lo, other.lo), min(self.hi, other.hi)
+        return (lo, hi) if lo <= hi else None
+
+
+def load_transactions(
+    csv_path: str | Path | Iterable[str | Path],
+    encoding: str = "ISO-8859-1",
+    *,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    countries: Optional[Iterable[str]] = None,
+    customers: Optional[Iterable[str]] = None,
+    cancellations: Optional[bool] = None,
+    offset: int = 0,
+    dedupe_invoices: bool = True,
+    engine: str = "csv",
+    fields: Optional[Collection[str]] = None,
+) -> Iterator[Transaction]:
+    """
+    Stream transactions from one or more Retail CSV files.
 
     This function performs:
         - Header normalization.
+        - Predicate pushdown on raw fields (see filters below).
         - Type conversion for quantity and unit price.
         - Flexible date parsing.
         - Required-field validation.
         - Optional field cleaning.
 
+    Filters are checked as early as possible: invoice prefix, country and
+    customer are tested on the raw strings before any numeric or date
+    conversion, and the date range right after the date is parsed, so rows
+    outside a narrow query skip most of the parsing work.
+
+    Several inputs (a list of paths, a directory or a glob pattern; see
+    expand_sources()) are read in order as one stream. Exports that overlap
+    in time can repeat an invoice: with dedupe_invoices, an invoice already
+    read from an earlier file is skipped in later ones. The rows are
+    streamed, so this keeps every invoice number of the files read so far
+    (memory grows with the invoice count). src.multifile and
+    src.money.exact_revenue keep only the invoices where the files'
+    invoice ranges overlap (see InvoiceRange).
+
+    Compressed files (gzip, bz2, xz, zstd; detected by suffix or magic
+    bytes) are decompressed as they are read, on a read-ahead thread.
+
+    fields restricts the result to a subset of the Transaction fields (see
+    src.analysis.fields_for() to derive it from the metrics to compute).
+    The other fields are None. Every row is still validated as in a full
+    load (required invoice, stock code and country, a parseable date,
+    numeric quantity and price), so a projection keeps exactly the rows a
+    full load keeps. Only Description and Customer ID are skipped
+    entirely when they are left out.
+
+    engine="mmap" reads uncompressed files with the byte-level scanner in
+    src/scanner.py instead of the csv module: same rows, about twice as
+    fast. Compressed files always use the csv engine.
+
     Args:
-        csv_path: Path to the CSV file.
+        csv_path: Path to the CSV file, or a directory, glob or list of them.
         encoding: File encoding used when reading the CSV.
+        start: Keep rows with invoice_date >= start.
+        end: Keep rows with invoice_date < end.
+        countries: Keep only these countries.
+        customers: Keep only these customer IDs.
+        cancellations: None keeps every row, False drops cancellation
+            invoices ("C" prefix), True keeps only cancellation invoices.
+        offset: Resume reading at this byte offset, which must be a line
+            boundary (e.g., the file size when it was last read, for an
+            append-only file). The header is still read from the first line.
+            Single uncompressed file only.
+        dedupe_invoices: Drop invoices repeated across multiple files.
+        engine: "csv" (text I/O and csv.DictReader) or "mmap".
+        fields: Transaction fields to populate (None: all). Columns read
+            by the filters are always included.
 
     Yields:
-        Transaction objects constructed from valid rows.
+        Transaction objects constructed from valid rows that pass the filters.
 
     Notes:
         Rows with invalid numeric fields, missing required fields, or
         unparseable dates are skipped silently to keep streaming robust.
     """
-    path = Path(csv_path)
-    with path.open(newline="", encoding=encoding) as f:
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}")
+    filters = dict(
+        start=start, end=end, countries=countries, customers=customers, cancellations=cancellations,
+        engine=engine, fields=fields,
+    )
+    if isinstance(csv_path, (str, Path)):
+        path = Path(csv_path)
+        if path.is_file() or not (path.is_dir() or _is_pattern(str(csv_path))):
+            return _read_csv(path, encoding, offset=offset, **filters)
+    if offset:
+        raise ValueError("offset is only supported for a single file")
+    paths = expand_sources(csv_path)
+    if dedupe_invoices and fields is not None:
+        filters["fields"] = set(fields) | {"invoice_no"}
+    return _read_many(paths, encoding, dedupe_invoices, filters)
+
+
+def _read_many(
+    paths: List[Path],
+    encoding: str,
+    dedupe_invoices: bool,
+    filters: Dict[str, Any],
+) -> Iterator[Transaction]:
+    """Chain several files, skipping invoices already read from earlier ones."""
+    earlier: Set[str] = set()
+    for path in paths:
+        current: Set[str] = set()
+        for t in _read_csv(path, encoding, **filters):
+            if dedupe_invoices:
+                if t.invoice_no in earlier:
+                    continue
+                current.add(t.invoice_no)
+            yield t
+        earlier |= current
+
+
+def _read_csv(
+    path: Path,
+    encoding: str = "ISO-8859-1",
+    *,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    countries: Optional[Iterable[str]] = None,
+    customers: Optional[Iterable[str]] = None,
+    cancellations: Optional[bool] = None,
+    offset: int = 0,
+    engine: str = "csv",
+    fields: Optional[Collection[str]] = None,
+) -> Iterator[Transaction]:
+    """Stream one CSV file (see load_transactions for the arguments)."""
+    if engine == "mmap" and detect_compression(path) is None:
+        from .scanner import scan_transactions  # imports this module
+
+        yield from scan_transactions(
+            path, encoding, fields=fields, start=start, end=end, countries=countries,
+            customers=customers, cancellations=cancellations, offset=offset,
+        )
+        return
+
+    wanted = _projection(fields, start, end, countries, customers, cancellations)
+    p_invoice, p_stock, p_desc = "invoice_no" in wanted, "stock_code" in wanted, "description" in wanted
+    p_qty, p_date, p_price = "quantity" in wanted, "invoice_date" in wanted, "unit_price" in wanted
+    p_customer, p_country = "customer_id" in wanted, "country" in wanted
+    dates: Dict[str, Optional[datetime]] = {}
+
+    country_set = None if countries is None else frozenset(countries)
+    customer_set = None if customers is None else frozenset(customers)
+
+    if offset and detect_compression(path) is not None:
+        raise ValueError("offset is not supported for compressed files")
+
+    with open_text(path, encoding) as f:
         reader = csv.DictReader(f)
 
         # Normalize CSV headers so downstream code always sees canonical names.
         reader.fieldnames = [_norm_header(h) for h in (reader.fieldnames or [])]
+        if offset:
+            f.seek(offset)
 
         for row in reader:
+            # Raw-field predicates first; rejected rows are never converted.
+            # Every row is validated in full whatever the projection; only
+            # Description and Customer ID are skipped when not wanted.
+            invoice_no = (row.get("InvoiceNo") or "").strip()
+            if not invoice_no:
+                continue
+            if cancellations is not None and invoice_no.upper().startswith("C") != cancellations:
+                continue
+            country = (row.get("Country") or "").strip()
+            if not country:
+                continue
+            if country_set is not None and country not in country_set:
+                continue
+            customer_id = None
+            if p_customer:
+                customer_id = _opt_str(row.get("CustomerID"))
+                if customer_set is not None and customer_id not in customer_set:
+                    continue
+
+            # Parse date; skip row if unparseable or outside the range.
+            # Timestamps repeat for every line of an invoice, so they are cached.
+            date_raw = row.get("InvoiceDate") or ""
+            if date_raw in dates:
+                invoice_date = dates[date_raw]
+            else:
+                if len(dates) >= _DATE_CACHE_SIZE:
+                    dates.clear()
+                invoice_date = dates[date_raw] = _parse_date(date_raw)
+            if invoice_date is None:
+                continue
+            if (start is not None and invoice_date < start) or (end is not None and invoice_date >= end):
+                continue
+
             # Parse basic numeric fields; skip row if invalid.
             try:
                 quantity = int(row["Quantity"])
@@ -118,26 +441,72 @@ def load_transactions(csv_path: str | Path, encoding: str = "ISO-8859-1") -> Ite
             except Exception:
                 continue
 
-            # Parse date; skip row if unparseable.
-            invoice_date = _parse_date(row.get("InvoiceDate", ""))
-            if invoice_date is None:
-                continue
-
-            # Required fields: invoice_no, stock_code, country.
-            invoice_no = (row.get("InvoiceNo") or "").strip()
+            # Required fields: invoice_no, stock_code, country (checked above).
             stock_code = (row.get("StockCode") or "").strip()
-            country = (row.get("Country") or "").strip()
-            if not invoice_no or not stock_code or not country:
+            if not stock_code:
                 continue
+            description = _opt_str(row.get("Description")) if p_desc else None
 
-            # Construct an immutable Transaction instance.
+            # Construct an immutable Transaction instance; columns outside
+            # the projection are left as None.
             yield Transaction(
-                invoice_no=invoice_no,
-                stock_code=stock_code,
-                description=_opt_str(row.get("Description")),
-                quantity=quantity,
-                invoice_date=invoice_date,
-                unit_price=unit_price,
-                customer_id=_opt_str(row.get("CustomerID")),
-                country=country,
+                invoice_no=invoice_no if p_invoice else None,
+                stock_code=stock_code if p_stock else None,
+                description=description,
+                quantity=quantity if p_qty else None,
+                invoice_date=invoice_date if p_date else None,
+                unit_price=unit_price if p_price else None,
+                customer_id=customer_id,
+                country=country if p_country else None,
             )
+
+
+def iter_columns(
+    csv_path: str | Path,
+    columns: Sequence[str],
+    encoding: str = "ISO-8859-1",
+    chunk_size: int = 65536,
+) -> Iterator[Tuple[Tuple[str, ...], ...]]:
+    """
+    Stream raw string columns of one CSV, chunk_size rows at a time.
+
+    For batch conversion (see src.money): no Transaction is built and no
+    field is converted or validated here. Rows are picked and transposed
+    into columns with C-level itemgetter/zip. Rows too short to hold every
+    requested column (e.g. blank lines) are dropped.
+
+    Args:
+        csv_path: One CSV file, compressed or not.
+        columns: Canonical header names (see HEADER_MAP), e.g. "UnitPrice".
+        encoding: File encoding.
+        chunk_size: Rows per chunk.
+
+    Yields:
+        One tuple of strings per requested column, in the order requested.
+
+    Raises:
+        ValueError: If the file lacks a requested column.
+    """
+    with open_text(csv_path, encoding) as f:
+        reader = csv.reader(f)
+        header = [_norm_header(h) for h in next(reader, [])]
+        missing = [c for c in columns if c not in header]
+        if missing:
+            raise ValueError(f"{csv_path}: missing columns {missing}")
+        # A repeated column resolves to its last occurrence, as in csv.DictReader.
+        last = {name: i for i, name in enumerate(header)}
+        idx = [last[c] for c in columns]
+        width = max(idx) + 1
+        pick = itemgetter(*idx) if len(idx) > 1 else (lambda row, i=idx[0]: (row[i],))
+
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            try:
+                picked = list(map(pick, rows))
+            except IndexError:
+                picked = [pick(row) for row in rows if len(row) >= width]
+            if picked:
+                yield tuple(zip(*picked))
+
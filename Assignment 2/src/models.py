@@ -24,6 +24,8 @@ class Transaction:
     Notes:
         - Instances are frozen to maintain immutability once created.
         - Provides convenience properties for computing totals and detecting cancellations.
+        - Rows loaded with a column projection (load_transactions(fields=...))
+          have None in the fields that were not loaded.
     """
 
     invoice_no: str
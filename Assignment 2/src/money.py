@@ -0,0 +1,283 @@
+# src/money.py
+from __future__ import annotations
+
+from array import array
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .io_utils import _DATE_CACHE_SIZE, InvoiceRange, _parse_date, expand_sources, invoice_key, iter_columns
+
+__all__ = [
+    "MONEY_COLUMNS",
+    "to_pence",
+    "from_pence",
+    "parse_ints",
+    "parse_pence",
+    "MoneyTotals",
+    "exact_revenue",
+]
+
+# CSV columns read by exact_revenue, in iter_columns order (and the order
+# of MoneyTotals.update_columns). StockCode and InvoiceDate are only
+# validated, as load_transactions does.
+MONEY_COLUMNS = ("InvoiceNo", "StockCode", "Quantity", "InvoiceDate", "UnitPrice", "Country")
+
+# Distinct price strings remembered by parse_pence before the cache is reset.
+_CACHE_LIMIT = 1 << 16
+
+# -----------------------------
+# Conversion
+# -----------------------------
+
+def to_pence(text: str) -> int:
+    """
+    Parse a decimal amount into integer pence (hundredths), exactly.
+
+    With at most two decimals the float parse is exact after scaling and
+    rounding (the error stays far below half a penny for amounts under
+    2**44); anything else (more decimals, exponents, huge values) goes
+    through Decimal and is rounded half-even to the penny.
+
+    Raises:
+        ValueError: If text is not a finite number.
+    """
+    s = text.strip()
+    dot = s.find(".")
+    if (dot < 0 or len(s) - dot <= 3) and "e" not in s and "E" not in s:
+        value = float(s)
+        if -(2.0**44) < value < 2.0**44:
+            return round(value * 100)
+    try:
+        return int(Decimal(s).scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+    except (InvalidOperation, ValueError, OverflowError):
+        raise ValueError(f"not an amount: {text!r}") from None
+
+
+def from_pence(pence: int) -> Decimal:
+    """Integer pence as an exact two-decimal Decimal (1234 -> Decimal("12.34"))."""
+    return Decimal(pence).scaleb(-2)
+
+
+def parse_ints(values: Sequence[str]) -> array:
+    """
+    Convert a column chunk of integer strings in one C-level pass.
+
+    Returns:
+        array("q") (int64) of the values.
+
+    Raises:
+        ValueError: If any value is not an int64 integer.
+    """
+    try:
+        return array("q", map(int, values))
+    except OverflowError:
+        raise ValueError("integer out of int64 range") from None
+
+
+def parse_pence(values: Sequence[str], cache: Optional[Dict[str, int]] = None) -> array:
+    """
+    Convert a column chunk of amounts to integer pence.
+
+    Prices repeat heavily (a few hundred distinct strings per file), so
+    each distinct string is parsed once with to_pence and the chunk is
+    then mapped through the cache without a Python-level loop. Pass the
+    same cache for every chunk of a file.
+
+    Returns:
+        array("q") (int64) of pence.
+
+    Raises:
+        ValueError: If any value is not an amount.
+    """
+    if cache is None:
+        cache = {}
+    new = dict.fromkeys(values).keys() - cache.keys()
+    if len(cache) + len(new) > _CACHE_LIMIT:
+        cache.clear()
+        new = set(values)
+    for s in new:
+        cache[s] = to_pence(s)
+    try:
+        return array("q", map(cache.__getitem__, values))
+    except OverflowError:
+        raise ValueError("amount out of int64 range") from None
+
+
+# -----------------------------
+# Exact revenue
+# -----------------------------
+
+class MoneyTotals:
+    """
+    Cent-exact sales-view revenue, total and per country.
+
+    Prices are held as integer pence and line totals (quantity * pence)
+    are summed as Python integers, so the result is exact for any number
+    of rows; nothing is rounded until from_pence. The float functions in
+    src.analysis instead accumulate binary fractions and only round at
+    the end, which can drift by a cent or more over millions of lines.
+
+    A row counts when it would be in valid_transactions(): not a "C"
+    invoice, quantity > 0 and price > 0 (after rounding to the penny, so a
+    sub-penny price such as 0.004 is not a sale here). Rows that
+    load_transactions would skip (empty invoice, stock code or country,
+    unparseable date, quantity or price) are skipped here too.
+    """
+
+    def __init__(self) -> None:
+        self.revenue = 0                      # pence
+        self.by_country: Dict[str, int] = {}  # pence
+        self.skipped = 0
+        self._prices: Dict[str, int] = {}
+        self._dates: Dict[str, bool] = {}     # raw InvoiceDate -> parseable
+
+    def update_columns(
+        self,
+        invoices: Sequence[str],
+        stock_codes: Sequence[str],
+        quantities: Sequence[str],
+        dates: Sequence[str],
+        prices: Sequence[str],
+        countries: Sequence[str],
+    ) -> "MoneyTotals":
+        """Fold one chunk of raw MONEY_COLUMNS (see iter_columns); returns self."""
+        try:
+            qty = parse_ints(quantities)
+            pence = parse_pence(prices, self._prices)
+        except ValueError:
+            return self._update_rows(invoices, stock_codes, quantities, dates, prices, countries)
+        self._add(invoices, stock_codes, qty, dates, pence, countries)
+        return self
+
+    def _update_rows(self, invoices, stock_codes, quantities, dates, prices, countries) -> "MoneyTotals":
+        """Row-by-row fallback for a chunk with invalid numbers, skipping them."""
+        cache = self._prices
+        kept: List[int] = []
+        qty: List[int] = []
+        pence: List[int] = []
+        for i, (q, p) in enumerate(zip(quantities, prices)):
+            try:
+                p_value = cache.get(p)
+                if p_value is None:
+                    p_value = cache[p] = to_pence(p)
+                q_value = int(q)
+            except ValueError:
+                self.skipped += 1
+                continue
+            qty.append(q_value)
+            pence.append(p_value)
+            kept.append(i)
+        invoices, stock_codes, dates, countries = (
+            [col[i] for i in kept] for col in (invoices, stock_codes, dates, countries)
+        )
+        self._add(invoices, stock_codes, qty, dates, pence, countries)
+        return self
+
+    def _valid_date(self, raw: str) -> bool:
+        ok = self._dates.get(raw)
+        if ok is None:
+            if len(self._dates) >= _DATE_CACHE_SIZE:
+                self._dates.clear()
+            ok = self._dates[raw] = _parse_date(raw) is not None
+        return ok
+
+    def _add(self, invoices, stock_codes, qty, dates, pence, countries) -> None:
+        by_country = self.by_country
+        revenue = self.revenue
+        valid_date = self._valid_date
+        for inv, code, q, d, p, c in zip(invoices, stock_codes, qty, dates, pence, countries):
+            if q > 0 and p > 0:
+                inv = inv.strip()
+                if inv and inv[0] not in "cC" and code.strip() and valid_date(d):
+                    c = c.strip()
+                    if c:
+                        line = q * p
+                        revenue += line
+                        by_country[c] = by_country.get(c, 0) + line
+        self.revenue = revenue
+
+    def merge(self, other: "MoneyTotals") -> "MoneyTotals":
+        """Add another instance's totals into this one; returns self."""
+        self.revenue += other.revenue
+        self.skipped += other.skipped
+        for country, pence in other.by_country.items():
+            self.by_country[country] = self.by_country.get(country, 0) + pence
+        return self
+
+    def total_revenue(self) -> Decimal:
+        """Exact total revenue (cf. analysis.total_revenue)."""
+        return from_pence(self.revenue)
+
+    def revenue_by_country(self) -> Dict[str, Decimal]:
+        """Exact revenue per country (cf. analysis.revenue_by_country)."""
+        return {country: from_pence(pence) for country, pence in self.by_country.items()}
+
+
+def exact_revenue(
+    sources: str | Path | Iterable[str | Path],
+    encoding: str = "ISO-8859-1",
+    chunk_size: int = 65536,
+    dedupe_invoices: bool = True,
+) -> MoneyTotals:
+    """
+    Cent-exact revenue totals of one or many CSV files.
+
+    Reads only MONEY_COLUMNS, chunk_size rows at a time, with the numeric
+    columns converted per chunk (parse_ints/parse_pence) instead of one
+    int()/float() call per row. Stock codes and dates are checked (each
+    distinct timestamp parsed once) but not converted, so exactly the rows
+    load_transactions keeps are counted.
+
+    Args:
+        sources: Files, directories, glob patterns, or a list of them.
+        encoding: File encoding.
+        chunk_size: Rows converted per batch.
+        dedupe_invoices: As in load_transactions, count an invoice only
+            from the first file that contains it. Only per-file invoice
+            ranges are kept; a file whose range overlaps an earlier one
+            is re-read without the earlier invoices in the overlap.
+
+    Returns:
+        MoneyTotals; use total_revenue() / revenue_by_country().
+    """
+    paths = expand_sources(sources)
+    dedupe = dedupe_invoices and len(paths) > 1
+    totals = MoneyTotals()
+    ranges: List[InvoiceRange] = []
+    for i, path in enumerate(paths):
+        part = MoneyTotals()
+        invoices = InvoiceRange()
+        for columns in iter_columns(path, MONEY_COLUMNS, encoding, chunk_size):
+            if dedupe:
+                invoices.update(columns[0])
+            part.update_columns(*columns)
+        if dedupe:
+            # Invoices of earlier files inside the overlapping part of the
+            # ranges belong to those files; re-read this one without them.
+            exclude: Set[str] = set()
+            for j, earlier in enumerate(ranges):
+                window = invoices.overlap(earlier)
+                if window is not None:
+                    exclude |= _invoices_between(paths[j], encoding, chunk_size, *window)
+            if exclude:
+                part = MoneyTotals()
+                for columns in iter_columns(path, MONEY_COLUMNS, encoding, chunk_size):
+                    invoices_col = tuple(map(str.strip, columns[0]))
+                    keep = [k for k, inv in enumerate(invoices_col) if inv not in exclude]
+                    if len(keep) < len(invoices_col):
+                        columns = tuple([col[k] for k in keep] for col in columns)
+                    part.update_columns(*columns)
+            ranges.append(invoices)
+        totals.merge(part)
+    return totals
+
+
+def _invoices_between(
+    path: Path, encoding: str, chunk_size: int, lo: Tuple[int, str], hi: Tuple[int, str]
+) -> Set[str]:
+    """The stripped invoice numbers of one file whose invoice_key() lies in [lo, hi]."""
+    out: Set[str] = set()
+    for (invoices,) in iter_columns(path, ("InvoiceNo",), encoding, chunk_size):
+        out.update(inv for inv in map(str.strip, invoices) if lo <= invoice_key(inv) <= hi)
+    return out
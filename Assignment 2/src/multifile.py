@@ -0,0 +1,169 @@
+# src/multifile.py
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .io_utils import InvoiceRange, _read_csv, expand_sources, invoice_key
+from .streaming import ReportAccumulator
+
+__all__ = [
+    "accumulate_many",
+    "report_many",
+]
+
+
+# -----------------------------
+# Workers (module level so they pickle)
+# -----------------------------
+
+def _scan(
+    path: Path,
+    factory: Callable[[], Any],
+    filters: Dict[str, Any],
+) -> Tuple[Any, InvoiceRange]:
+    """Accumulate one file and report the range of invoices it contained."""
+    invoices = InvoiceRange()
+
+    def tap(records):
+        last = None
+        for t in records:
+            if t.invoice_no != last:
+                last = t.invoice_no
+                invoices.add(last)
+            yield t
+
+    acc = factory().update(tap(_read_csv(path, **filters)))
+    return acc, invoices
+
+
+def _invoices_between(
+    path: Path,
+    filters: Dict[str, Any],
+    lo: Tuple[int, str],
+    hi: Tuple[int, str],
+) -> FrozenSet[str]:
+    """The invoices of one file whose invoice_key() lies in [lo, hi]."""
+    return frozenset(t.invoice_no for t in _read_csv(path, **filters) if lo <= invoice_key(t.invoice_no) <= hi)
+
+
+def _rescan(
+    path: Path,
+    factory: Callable[[], Any],
+    filters: Dict[str, Any],
+    exclude: FrozenSet[str],
+) -> Any:
+    """Accumulate one file, skipping invoices owned by an earlier file."""
+    records = (t for t in _read_csv(path, **filters) if t.invoice_no not in exclude)
+    return factory().update(records)
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+
+def accumulate_many(
+    sources: str | Path | Iterable[str | Path],
+    factory: Callable[[], Any],
+    workers: Optional[int] = None,
+    dedupe_invoices: bool = True,
+    **filters: Any,
+) -> Any:
+    """
+    Fold many files into one accumulator, one worker process per file.
+
+    Each file is reduced to factory().update(rows) in parallel and the
+    results are merged in file order. Overlapping exports are deduplicated
+    at invoice level: an invoice belongs to the first file (in
+    expand_sources() order) that contains it.
+
+    Only each file's invoice range (see InvoiceRange) is kept, so exports
+    of different periods cost a single pass and no memory per invoice.
+    Where a file's range overlaps an earlier one, the earlier file's
+    invoices inside the overlap are collected and the file is re-read
+    once without them; memory then grows with the invoices in the
+    overlapping window only.
+
+    Args:
+        sources: Files, directories, glob patterns, or a list of them.
+        factory: Picklable zero-argument callable returning an empty
+            accumulator with update(records) and merge(other), both
+            returning the accumulator (e.g. ReportAccumulator, or a
+            functools.partial of it).
+        workers: Worker processes (None: one per CPU; 1: run in-process).
+        dedupe_invoices: Skip invoices repeated across files.
+        **filters: load_transactions() filters (start, end, countries,
+            customers, cancellations) and engine, applied in every worker.
+
+    Returns:
+        The merged accumulator.
+    """
+    paths = expand_sources(sources)
+    pool = None if workers == 1 or len(paths) == 1 else ProcessPoolExecutor(max_workers=workers)
+    try:
+        scans = _map(pool, _scan, [(p, factory, filters) for p in paths])
+        accumulators = [acc for acc, _ in scans]
+        if dedupe_invoices and len(paths) > 1:
+            # An invoice belongs to the first file that contains it, so a
+            # file loses the invoices of earlier files inside their overlap.
+            ranges = [r for _, r in scans]
+            owners: List[int] = []
+            windows: List[Tuple[Any, ...]] = []
+            for i in range(1, len(paths)):
+                for j in range(i):
+                    window = ranges[i].overlap(ranges[j])
+                    if window is not None:
+                        owners.append(i)
+                        windows.append((paths[j], filters, *window))
+            exclude: Dict[int, Set[str]] = {}
+            for i, invoices in zip(owners, _map(pool, _invoices_between, windows)):
+                exclude.setdefault(i, set()).update(invoices)
+            redo = {i: (paths[i], factory, filters, frozenset(inv)) for i, inv in exclude.items() if inv}
+            for i, acc in zip(redo, _map(pool, _rescan, list(redo.values()))):
+                accumulators[i] = acc
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    total = factory()
+    for acc in accumulators:
+        total.merge(acc)
+    return total
+
+
+def report_many(
+    sources: str | Path | Iterable[str | Path],
+    top_n: int = 10,
+    approximate: bool = False,
+    workers: Optional[int] = None,
+    dedupe_invoices: bool = True,
+    **filters: Any,
+) -> Dict[str, Any]:
+    """
+    Streaming report over many files, one worker process per file.
+
+    See accumulate_many() for how files are scanned, merged and
+    deduplicated.
+
+    Args:
+        sources: Files, directories, glob patterns, or a list of them.
+        top_n: Size of the top products/customers lists.
+        approximate: Use sketch-based invoice metrics (see ReportAccumulator).
+        workers: Worker processes (None: one per CPU; 1: run in-process).
+        dedupe_invoices: Skip invoices repeated across files.
+        **filters: load_transactions() filters and engine.
+
+    Returns:
+        Report dict with the same keys as main.build_report().
+    """
+    factory = partial(ReportAccumulator, approximate=approximate)
+    return accumulate_many(sources, factory, workers, dedupe_invoices, **filters).report(top_n)
+
+
+def _map(pool: Optional[ProcessPoolExecutor], fn: Callable[..., Any], args: List[Tuple[Any, ...]]) -> List[Any]:
+    """Apply fn to each argument tuple, in the pool if there is one; order is kept."""
+    if pool is None:
+        return [fn(*a) for a in args]
+    return list(pool.map(fn, *zip(*args))) if args else []
@@ -0,0 +1,323 @@
+# src/scanner.py
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import mmap
+from datetime import datetime
+from pathlib import Path
+from typing import Collection, Dict, Iterable, Iterator, List, Optional
+
+from .io_utils import _DATE_CACHE_SIZE, _norm_header, _parse_date, _projection
+from .models import Transaction
+
+__all__ = [
+    "OPTIONAL_FIELDS",
+    "scan_transactions",
+]
+
+# Transaction fields that may be absent from the file (None in every row).
+OPTIONAL_FIELDS = ("description", "customer_id")
+
+# Transaction field -> canonical CSV column (see io_utils.HEADER_MAP).
+_COLUMNS = {
+    "invoice_no": "InvoiceNo",
+    "stock_code": "StockCode",
+    "description": "Description",
+    "quantity": "Quantity",
+    "invoice_date": "InvoiceDate",
+    "unit_price": "UnitPrice",
+    "customer_id": "CustomerID",
+    "country": "Country",
+}
+
+# Bytes copied out of the mapping per step; rows are split within a block.
+_BLOCK_SIZE = 1 << 22
+
+
+# -----------------------------
+# Byte-level parsing
+# -----------------------------
+
+def _lines(mm: mmap.mmap, pos: int) -> Iterator[bytes]:
+    """Yield the lines of mm from pos on, split on b"\n" (b"\r" is kept)."""
+    size = len(mm)
+    tail = b""
+    while pos < size:
+        block = mm[pos:pos + _BLOCK_SIZE]
+        pos += len(block)
+        if tail:
+            block = tail + block
+        if pos >= size:
+            tail = b""
+        else:
+            cut = block.rfind(b"\n")
+            if cut < 0:
+                tail = block
+                continue
+            block, tail = block[:cut], block[cut + 1:]
+        yield from block.split(b"\n")
+    if tail:
+        yield tail
+
+
+def _records(mm: mmap.mmap, pos: int) -> Iterator[bytes]:
+    """Join lines into records, keeping newlines inside quoted fields."""
+    # Quoted fields keep their line breaks verbatim, as the csv module does;
+    # only the record terminator's b"\r" is dropped.
+    pending: Optional[bytes] = None
+    for line in _lines(mm, pos):
+        if pending is not None:
+            line = pending + b"\n" + line
+            pending = None
+        if line.count(b'"') % 2:
+            pending = line
+            continue
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        if line:
+            yield line
+    if pending:
+        yield pending.rstrip(b"\r")
+
+
+def _split(record: bytes) -> List[bytes]:
+    """Split a record on commas that are not inside double quotes."""
+    parts = record.split(b",")
+    if b'"' not in record:
+        return parts
+    fields: List[bytes] = []
+    open_field: Optional[bytes] = None
+    for part in parts:
+        if open_field is None:
+            if part.count(b'"') % 2:
+                open_field = part
+            else:
+                fields.append(part)
+        else:
+            open_field += b"," + part
+            if part.count(b'"') % 2:
+                fields.append(open_field)
+                open_field = None
+    if open_field is not None:
+        fields.append(open_field)
+    return fields
+
+
+def _unquote(field: bytes) -> bytes:
+    field = field.strip()
+    if len(field) >= 2 and field[:1] == b'"' and field[-1:] == b'"':
+        field = field[1:-1].replace(b'""', b'"').strip()
+    return field
+
+
+def _regular(row: List[bytes]) -> bool:
+    """True if every quote in row belongs to a field quoted end to end."""
+    for field in row:
+        if b'"' in field:
+            if len(field) < 2 or field[:1] != b'"' or field[-1:] != b'"':
+                return False
+            if b'"' in field[1:-1].replace(b'""', b""):
+                return False
+    return True
+
+
+def _csv_rows(record: bytes, encoding: str) -> List[List[bytes]]:
+    """
+    Split an irregularly quoted record with the csv module.
+
+    Quotes that do not wrap a whole field (`"q" trailing`, `ab"c`, a quote
+    after leading spaces) follow the csv module's rules, which the byte
+    splitter does not implement. Its fields are re-quoted so _unquote()
+    returns them unchanged (apart from the usual strip). A stray quote may
+    have made _records() join lines the csv module keeps apart, so this
+    can return several rows.
+    """
+    text = record.decode(encoding)
+    return [
+        [b'"' + f.encode(encoding).replace(b'"', b'""') + b'"' for f in row]
+        for row in csv.reader(io.StringIO(text, newline=""))
+        if row
+    ]
+
+
+def _rows(mm: mmap.mmap, pos: int, encoding: str) -> Iterator[List[bytes]]:
+    """Yield the split rows of mm from pos on (see _records and _split)."""
+    for record in _records(mm, pos):
+        row = _split(record)
+        if b'"' in record and not _regular(row):
+            yield from _csv_rows(record, encoding)
+        else:
+            yield row
+
+
+# -----------------------------
+# Scanner
+# -----------------------------
+
+def scan_transactions(
+    csv_path: str | Path,
+    encoding: str = "ISO-8859-1",
+    *,
+    fields: Optional[Collection[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    countries: Optional[Iterable[str]] = None,
+    customers: Optional[Iterable[str]] = None,
+    cancellations: Optional[bool] = None,
+    offset: int = 0,
+) -> Iterator[Transaction]:
+    """
+    Stream transactions from a memory-mapped CSV, decoding only what is used.
+
+    Rows and fields are located on the raw bytes: the file is mapped,
+    copied out in 4 MiB blocks and split on newlines and commas (quoted
+    fields, including embedded commas and newlines, are handled). Filters
+    are tested on the undecoded bytes, quantity and price are converted
+    straight from bytes, and repeated values (timestamps, countries,
+    products) are decoded once and reused. Every row is validated as in
+    load_transactions() whatever the projection; Description and Customer
+    ID are never decoded when left out of it. A record with a quote that does not wrap a
+    whole field is handed to the csv module instead, so it is split the
+    same way load_transactions() splits it.
+
+    The result is identical to load_transactions() for the same file and
+    filters, except that fields left out of the projection are None. One
+    known difference remains. Records are joined across lines by quote
+    parity, so a stray quote inside an unquoted field that balances a
+    quoted field left open at the end of the line (`A"x,"ab` followed by a
+    line break) ends the record there. The csv module would continue the
+    quoted field on the next line.
+
+    Args:
+        csv_path: Path to an uncompressed CSV file.
+        encoding: File encoding; must be ASCII-compatible (e.g., ISO-8859-1,
+            cp1252, UTF-8) so delimiters can be found on the bytes.
+        fields: Transaction fields to decode (None: all), as in
+            load_transactions().
+        start, end, countries, customers, cancellations, offset: As in
+            load_transactions().
+
+    Yields:
+        Transaction objects for valid rows that pass the filters.
+
+    Raises:
+        ValueError: For an unknown field name or a non-ASCII-compatible
+            encoding.
+    """
+    wanted = _projection(fields, start, end, countries, customers, cancellations)
+    if codecs.lookup(encoding).name.startswith(("utf-16", "utf-32")):
+        raise ValueError(f"{encoding} is not ASCII-compatible")
+
+    path = Path(csv_path)
+    if path.stat().st_size == 0:
+        return
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b"\n")
+        header_line = mm[:header_end if header_end >= 0 else len(mm)].rstrip(b"\r")
+        header_row = _split(header_line)
+        if b'"' in header_line and not _regular(header_row):
+            header_row = (_csv_rows(header_line, encoding) or [[]])[0]
+        header = [_norm_header(_unquote(h).decode(encoding)) for h in header_row]
+        # A repeated column resolves to its last occurrence, as in csv.DictReader.
+        col = {name: i for i, name in enumerate(header)}
+        # Required columns are read (and validated) whatever the projection.
+        read = wanted | (set(_COLUMNS) - set(OPTIONAL_FIELDS))
+        index = {name: col.get(_COLUMNS[name]) for name in read}
+        if any(i is None for name, i in index.items() if name not in OPTIONAL_FIELDS):
+            return  # load_transactions() would reject every row as well
+        if customers is not None and index["customer_id"] is None:
+            return
+        i_inv, i_stock, i_desc, i_qty = (index.get(n) for n in ("invoice_no", "stock_code", "description", "quantity"))
+        i_date, i_price, i_cust, i_country = (index.get(n) for n in ("invoice_date", "unit_price", "customer_id", "country"))
+        # Rows too short for a required column are invalid; a short row
+        # simply lacks the optional columns past its end.
+        width = max(i for name, i in index.items() if name not in OPTIONAL_FIELDS) + 1
+        p_inv, p_stock, p_qty = "invoice_no" in wanted, "stock_code" in wanted, "quantity" in wanted
+        p_date, p_price, p_country = "invoice_date" in wanted, "unit_price" in wanted, "country" in wanted
+
+        country_set = None if countries is None else {c.encode(encoding) for c in countries}
+        customer_set = None if customers is None else {c.encode(encoding) for c in customers if c}
+
+        # Decoded-value caches; retail columns repeat heavily. Invoice
+        # numbers are only compared with the previous row (an invoice's
+        # lines are adjacent), so the string cache is bounded by the number
+        # of distinct products, customers and countries.
+        strings: Dict[bytes, str] = {}
+        last_invoice_raw, last_invoice = b"", ""
+        dates: Dict[bytes, Optional[datetime]] = {}
+
+        def text(raw: bytes) -> str:
+            value = strings.get(raw)
+            if value is None:
+                value = strings[raw] = raw.decode(encoding)
+            return value
+
+        pos = offset if offset else (header_end + 1 if header_end >= 0 else len(mm))
+        for row in _rows(mm, pos, encoding):
+            if len(row) < width:
+                continue
+            invoice_raw = _unquote(row[i_inv])
+            if not invoice_raw:
+                continue
+            if cancellations is not None and (invoice_raw[:1] in (b"C", b"c")) != cancellations:
+                continue
+            country_raw = _unquote(row[i_country])
+            if not country_raw:
+                continue
+            if country_set is not None and country_raw not in country_set:
+                continue
+            customer_id = None
+            if i_cust is not None and i_cust < len(row):
+                customer_raw = _unquote(row[i_cust])
+                if customer_set is not None and customer_raw not in customer_set:
+                    continue
+                customer_id = text(customer_raw) if customer_raw else None
+            elif customer_set is not None:
+                continue
+
+            date_raw = row[i_date]
+            if date_raw in dates:
+                invoice_date = dates[date_raw]
+            else:
+                if len(dates) >= _DATE_CACHE_SIZE:
+                    dates.clear()
+                invoice_date = dates[date_raw] = _parse_date(_unquote(date_raw).decode(encoding))
+            if invoice_date is None:
+                continue
+            if (start is not None and invoice_date < start) or (end is not None and invoice_date >= end):
+                continue
+
+            try:
+                quantity = int(_unquote(row[i_qty]))
+                unit_price = float(_unquote(row[i_price]))
+            except ValueError:
+                continue
+
+            stock_raw = _unquote(row[i_stock])
+            if not stock_raw:
+                continue
+            description = None
+            if i_desc is not None and i_desc < len(row):
+                desc_raw = _unquote(row[i_desc])
+                description = text(desc_raw) if desc_raw else None
+
+            # Strings are decoded only for projected columns.
+            if p_inv:
+                if invoice_raw != last_invoice_raw:
+                    last_invoice_raw, last_invoice = invoice_raw, invoice_raw.decode(encoding)
+                invoice_no = last_invoice
+            else:
+                invoice_no = None
+
+            yield Transaction(
+                invoice_no=invoice_no,
+                stock_code=text(stock_raw) if p_stock else None,
+                description=description,
+                quantity=quantity if p_qty else None,
+                invoice_date=invoice_date if p_date else None,
+                unit_price=unit_price if p_price else None,
+                customer_id=customer_id,
+                country=text(country_raw) if p_country else None,
+            )
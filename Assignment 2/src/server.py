@@ -0,0 +1,309 @@
+# src/server.py
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .cube import DIMENSIONS, SalesCube, load_or_build_cube
+
+__all__ = [
+    "METRICS",
+    "SourceUnavailable",
+    "AnalysisService",
+    "make_server",
+    "serve",
+]
+
+# Query-string values for these dimensions are comma-separated lists.
+_FILTERS = DIMENSIONS
+
+
+def _sections(cube: SalesCube, n: int) -> Dict[str, Callable[[], Any]]:
+    """Metric name -> zero-argument callable on a (possibly diced) cube."""
+    return {
+        "total_revenue": cube.total_revenue,
+        "revenue_by_country": cube.revenue_by_country,
+        "monthly_revenue": cube.monthly_revenue,
+        "top_products": lambda: cube.top_n_products_by_revenue(n=n),
+        "top_customers": lambda: cube.top_n_customers_by_revenue(n=n),
+        "avg_order_value": cube.avg_order_value,
+        "units_sold_per_product": cube.units_sold_per_product,
+        "sales_by_weekday": cube.sales_by_weekday,
+        "cancellation_summary": cube.cancellation_summary,
+    }
+
+
+METRICS = tuple(_sections(SalesCube(), 0)) + ("report", "rollup")
+
+
+# -----------------------------
+# Service (transport-independent)
+# -----------------------------
+
+class SourceUnavailable(OSError):
+    """The source CSV cannot be read right now (missing, unreadable)."""
+
+
+class AnalysisService:
+    """
+    Warm, memoized query layer over the sales cube of one CSV.
+
+    The dataset is loaded once as a SalesCube (see src.cube), which is far
+    smaller than the raw rows and answers every report section. Each
+    distinct query is computed once and its JSON encoding cached, so a
+    repeated dashboard request is a dict lookup. The source file is
+    re-checked at most every check_interval seconds; when it changed, the
+    cube is refreshed (incrementally for appends) and the cache cleared.
+
+    If the file cannot be stat'ed or read during a check (deleted, being
+    replaced, permissions), the last cube is kept and queries raise
+    SourceUnavailable until a later check succeeds.
+    """
+
+    def __init__(
+        self,
+        csv_path: str | Path,
+        cube_path: Optional[str | Path] = None,
+        check_interval: float = 1.0,
+        cache_size: int = 1024,
+    ) -> None:
+        self.csv_path = Path(csv_path)
+        self.cube_path = cube_path
+        self.check_interval = check_interval
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        # Serializes reloads so concurrent checks build the cube once.
+        self._refresh_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._cube: Optional[SalesCube] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self.reloads = 0
+        self.error: Optional[str] = None
+        self._refresh()
+
+    # -- freshness -------------------------------------------------------
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        st = os.stat(self.csv_path)
+        return st.st_size, st.st_mtime_ns
+
+    def _refresh(self) -> None:
+        """
+        (Re)load the cube and drop memoized results. Caller holds no lock.
+
+        Threads that saw the same change queue on the refresh lock; the
+        stamp is compared again inside it, so only the first one reloads.
+        """
+        with self._refresh_lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return
+            cube = load_or_build_cube(self.csv_path, self.cube_path)
+            with self._lock:
+                self._cube = cube
+                self._stamp = stamp
+                self._cache.clear()
+                self.reloads += 1
+
+    def check(self) -> Optional[str]:
+        """
+        Reload the cube if the source changed (at most every check_interval).
+
+        Returns:
+            None when the source is readable, else the error message; the
+            previous cube stays loaded in that case.
+        """
+        now = monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            try:
+                if self._file_stamp() != self._stamp:
+                    self._refresh()
+            except OSError as exc:
+                self.error = f"source unavailable: {exc}"
+            else:
+                self.error = None
+        return self.error
+
+    def _ensure_fresh(self) -> None:
+        error = self.check()
+        if error is not None:
+            raise SourceUnavailable(error)
+
+    # -- queries ---------------------------------------------------------
+
+    def query(self, metric: str, params: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        Answer one metric as UTF-8 JSON.
+
+        Args:
+            metric: One of METRICS.
+            params: Optional filters (country, month, weekday, product,
+                customer; comma-separated for several values), n for the
+                top-N sections, and dims/measure for "rollup".
+
+        Returns:
+            JSON-encoded result (cached per metric and parameters).
+
+        Raises:
+            KeyError: Unknown metric.
+            ValueError: Invalid parameters.
+            SourceUnavailable: The source file could not be checked or
+                reloaded at the last freshness check.
+        """
+        if metric not in METRICS:
+            raise KeyError(metric)
+        params = params or {}
+        self._ensure_fresh()
+        key = (metric, tuple(sorted(params.items())))
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit
+            cube = self._cube
+
+        body = json.dumps(self._compute(cube, metric, params)).encode("utf-8")
+        with self._lock:
+            if cube is self._cube:
+                self._cache[key] = body
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return body
+
+    def _compute(self, cube: SalesCube, metric: str, params: Dict[str, str]) -> Any:
+        unknown = set(params) - set(_FILTERS) - {"n", "dims", "measure"}
+        if unknown:
+            raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+
+        criteria = {dim: params[dim].split(",") for dim in _FILTERS if dim in params}
+        view = cube.dice(**criteria) if criteria else cube
+        try:
+            n = int(params.get("n", 10))
+        except ValueError:
+            raise ValueError("n must be an integer") from None
+
+        if metric == "rollup":
+            dims = [d for d in params.get("dims", "").split(",") if d]
+            totals = view.rollup(*dims, measure=params.get("measure", "revenue"))
+            if len(dims) == 1:
+                return totals
+            return [[*k, v] for k, v in totals.items()]
+
+        sections = _sections(view, n)
+        if metric == "report":
+            if criteria:
+                sections.pop("avg_order_value")
+                sections.pop("cancellation_summary")
+            return {name: fn() for name, fn in sections.items()}
+        return sections[metric]()
+
+
+# -----------------------------
+# HTTP transport
+# -----------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    """GET /metrics/<name>?filters, GET /metrics, GET /health."""
+
+    server_version = "RetailAnalysis/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        service: AnalysisService = self.server.service  # type: ignore[attr-defined]
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if parts == ["health"]:
+            error = service.check()
+            if error is None:
+                self._send(200, b'{"status": "ok"}')
+            else:
+                self._error(503, error)
+        elif parts == ["metrics"]:
+            self._send(200, json.dumps(list(METRICS)).encode("utf-8"))
+        elif len(parts) == 2 and parts[0] == "metrics":
+            if parts[1] not in METRICS:
+                self._error(404, f"unknown metric {parts[1]!r}")
+                return
+            try:
+                self._send(200, service.query(parts[1], params))
+            except ValueError as exc:
+                self._error(400, str(exc))
+            except SourceUnavailable as exc:
+                self._error(503, str(exc))
+        else:
+            self._error(404, "not found")
+
+    def _send(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}).encode("utf-8"))
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Per-request logging would dominate a sub-millisecond response.
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: AnalysisService, address: str) -> socketserver.BaseServer:
+    """
+    Create (but do not start) an HTTP server for service.
+
+    Args:
+        service: The warm query service.
+        address: "HOST:PORT" for TCP, or "unix:/path/to.sock" for a Unix
+            domain socket (a stale socket file is replaced).
+    """
+    if address.startswith("unix:"):
+        sock_path = address[len("unix:"):]
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        server: socketserver.BaseServer = _UnixHTTPServer(sock_path, _Handler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _Handler)
+        server.daemon_threads = True
+    server.service = service  # type: ignore[attr-defined]
+    return server
+
+
+def serve(csv_path: str | Path, address: str, cube_path: Optional[str | Path] = None) -> None:
+    """Load csv_path once and answer queries on address until interrupted."""
+    service = AnalysisService(csv_path, cube_path)
+    server = make_server(service, address)
+    print(f"Serving {csv_path} on {address} (GET /metrics for the list)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if address.startswith("unix:"):
+            try:
+                os.unlink(address[len("unix:"):])
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,218 @@
+# src/sketches.py
+from __future__ import annotations
+
+import math
+import random
+from hashlib import blake2b
+from typing import Any, Dict, List, Sequence, Tuple
+
+__all__ = [
+    "HyperLogLog",
+    "KLLSketch",
+]
+
+_MASK64 = (1 << 64) - 1
+
+
+def _hash64(value: Any) -> int:
+    """Process-independent 64-bit hash (unlike hash(), stable across runs)."""
+    return int.from_bytes(blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# -----------------------------
+# Distinct counts
+# -----------------------------
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch.
+
+    Memory is 2**precision one-byte registers regardless of how many items
+    are added; the relative standard error is about 1.04 / sqrt(2**precision)
+    (precision 14: 16 KiB, ~0.8%). Sketches with the same precision merge
+    losslessly, so chunks or workers can be counted independently.
+
+    Supports the subset of the set API used by the report accumulators:
+    add(), len() (the estimate) and |= (merge).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._suffix_bits = 64 - precision
+
+    @classmethod
+    def from_error(cls, relative_error: float) -> "HyperLogLog":
+        """Smallest sketch whose standard error is at most relative_error."""
+        if relative_error <= 0:
+            raise ValueError("relative_error must be positive")
+        precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(min(18, max(4, precision)))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: Any) -> None:
+        """Record one (possibly repeated) item."""
+        h = _hash64(value)
+        idx = h >> self._suffix_bits
+        rest = h & ((1 << self._suffix_bits) - 1)
+        # Position of the leftmost 1-bit in the remaining bits (1-based).
+        rank = self._suffix_bits - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct items added."""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting).
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Union another sketch into this one; returns self."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __ior__(self, other: "HyperLogLog") -> "HyperLogLog":
+        return self.merge(other)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(precision={self.precision}, estimate={self.count()})"
+
+
+# -----------------------------
+# Quantiles
+# -----------------------------
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Keeps a hierarchy of compactors; level h items each stand for 2**h
+    inputs. When full, a level is sorted and every other item is promoted,
+    so memory stays O(k) while rank error is roughly 1.7 / k (k=200: ~1%).
+    Sketches merge by concatenating levels and re-compacting.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 0) -> None:
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.n = 0
+        self._c = 2.0 / 3.0
+        self._rng = random.Random(seed)
+        self._levels: List[List[float]] = []
+        self._size = 0
+        self._max_size = 0
+        self._grow()
+
+    @classmethod
+    def from_error(cls, rank_error: float, seed: int = 0) -> "KLLSketch":
+        """Sketch sized for an approximate normalized rank error."""
+        if rank_error <= 0:
+            raise ValueError("rank_error must be positive")
+        return cls(max(8, math.ceil(1.7 / rank_error)), seed=seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return int(math.ceil(self.k * self._c ** depth)) + 1
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compact(self) -> None:
+        for h in range(len(self._levels)):
+            level = self._levels[h]
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 == len(self._levels):
+                self._grow()
+            level.sort()
+            # An odd item out stays behind; the rest are halved.
+            keep = [level.pop()] if len(level) % 2 else []
+            self._levels[h + 1].extend(level[self._rng.randrange(2)::2])
+            self._levels[h] = keep
+            self._size = sum(len(lv) for lv in self._levels)
+            if self._size < self._max_size:
+                break
+
+    def add(self, value: float) -> None:
+        """Record one value."""
+        self._levels[0].append(value)
+        self._size += 1
+        self.n += 1
+        if self._size >= self._max_size:
+            self._compact()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch into this one; returns self."""
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for h, level in enumerate(other._levels):
+            self._levels[h].extend(level)
+        self.n += other.n
+        self._size = sum(len(lv) for lv in self._levels)
+        while self._size >= self._max_size:
+            self._compact()
+        return self
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        items = [(v, 1 << h) for h, level in enumerate(self._levels) for v in level]
+        items.sort()
+        return items
+
+    def quantiles(self, qs: Sequence[float]) -> List[float]:
+        """
+        Approximate values at the given ranks (0 <= q <= 1).
+
+        Returns:
+            One value per q (NaN for an empty sketch).
+        """
+        items = self._weighted()
+        if not items:
+            return [math.nan for _ in qs]
+        total = sum(w for _, w in items)
+        out = []
+        for q in qs:
+            if not 0.0 <= q <= 1.0:
+                raise ValueError("quantiles must be within [0, 1]")
+            target = q * total
+            cum = 0
+            value = items[-1][0]
+            for v, w in items:
+                cum += w
+                if cum >= target:
+                    value = v
+                    break
+            out.append(value)
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Approximate value at rank q."""
+        return self.quantiles([q])[0]
+
+    def summary(self, percentiles: Sequence[int] = (50, 90, 99)) -> Dict[str, float]:
+        """{"p50": ..., "p90": ..., "p99": ...} rounded to 2 decimals."""
+        values = self.quantiles([p / 100.0 for p in percentiles])
+        return {f"p{p}": round(v, 2) for p, v in zip(percentiles, values)}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(k={self.k}, n={self.n}, retained={self._size})"
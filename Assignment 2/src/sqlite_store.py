@@ -0,0 +1,304 @@
+# src/sqlite_store.py
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .grouping import WEEKDAYS
+from .models import Transaction
+
+__all__ = [
+    "load_into_sqlite",
+    "SQLiteBackend",
+]
+
+# -----------------------------
+# Schema
+# -----------------------------
+
+# invoice_date is stored as ISO text ("YYYY-MM-DD HH:MM:SS") so that it sorts
+# chronologically, range predicates use the index, and strftime() works.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    invoice_no      TEXT    NOT NULL,
+    stock_code      TEXT    NOT NULL,
+    description     TEXT,
+    quantity        INTEGER NOT NULL,
+    invoice_date    TEXT    NOT NULL,
+    unit_price      REAL    NOT NULL,
+    customer_id     TEXT,
+    country         TEXT    NOT NULL,
+    is_cancellation INTEGER NOT NULL
+)
+"""
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_tx_invoice_date ON transactions (invoice_date)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_country ON transactions (country)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_customer_id ON transactions (customer_id)",
+    "CREATE INDEX IF NOT EXISTS ix_tx_stock_code ON transactions (stock_code)",
+]
+
+_INSERT = "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Mirrors valid_transactions(): not a cancellation, quantity > 0, price > 0.
+_VALID = "is_cancellation = 0 AND quantity > 0 AND unit_price > 0"
+
+# Mirrors returns_view(): cancellation invoice or non-positive quantity.
+_RETURN = "(is_cancellation = 1 OR quantity <= 0)"
+
+# Mirrors grouping.product_key(): description when present, else stock code.
+_PRODUCT = "TRIM(COALESCE(description, stock_code))"
+
+_DATE_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _row(t: Transaction) -> Tuple:
+    """Convert a Transaction into an INSERT parameter tuple."""
+    return (
+        t.invoice_no,
+        t.stock_code,
+        t.description,
+        t.quantity,
+        t.invoice_date.strftime(_DATE_FMT),
+        t.unit_price,
+        t.customer_id,
+        t.country,
+        int(t.is_cancellation),
+    )
+
+
+# -----------------------------
+# Ingestion
+# -----------------------------
+
+def load_into_sqlite(
+    records: Iterable[Transaction],
+    db_path: str | Path,
+    batch_size: int = 10_000,
+    replace: bool = False,
+) -> int:
+    """
+    Bulk-load transactions into a SQLite database.
+
+    Rows are inserted with executemany() in batches, each batch inside a
+    single transaction. Indexes on invoice_date, country, customer_id and
+    stock_code are created after the load, which is much faster than
+    maintaining them row by row.
+
+    Args:
+        records: Transactions to store (e.g., load_transactions(...) output).
+        db_path: SQLite database file (created if missing).
+        batch_size: Rows per executemany() call / transaction.
+        replace: Drop existing rows before loading.
+
+    Returns:
+        Number of rows inserted.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        # Bulk-load settings: durability is restored by the final commit.
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute(_SCHEMA)
+        if replace:
+            conn.execute("DELETE FROM transactions")
+            conn.commit()
+
+        inserted = 0
+        rows = map(_row, records)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with conn:
+                conn.executemany(_INSERT, batch)
+            inserted += len(batch)
+
+        with conn:
+            for stmt in _INDEXES:
+                conn.execute(stmt)
+        conn.execute("ANALYZE")
+        return inserted
+    finally:
+        conn.close()
+
+
+# -----------------------------
+# Query backend
+# -----------------------------
+
+class SQLiteBackend:
+    """
+    Answer the analysis metrics with SQL aggregates over a loaded database.
+
+    Each method returns the same shape (and rounding) as its counterpart in
+    src.analysis. All methods accept optional keyword filters that are
+    pushed into the WHERE clause and served by the indexes:
+
+        start / end: inclusive / exclusive datetime bounds on invoice_date.
+        countries:   restrict to these countries.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        self.db_path = Path(db_path)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "SQLiteBackend":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- helpers ---------------------------------------------------------
+
+    @staticmethod
+    def _where(
+        base: Optional[str],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        countries: Optional[Sequence[str]] = None,
+    ) -> Tuple[str, List]:
+        clauses: List[str] = [base] if base else []
+        params: List = []
+        if start is not None:
+            clauses.append("invoice_date >= ?")
+            params.append(start.strftime(_DATE_FMT))
+        if end is not None:
+            clauses.append("invoice_date < ?")
+            params.append(end.strftime(_DATE_FMT))
+        if countries:
+            clauses.append(f"country IN ({', '.join('?' for _ in countries)})")
+            params.extend(countries)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[Tuple]:
+        return self._conn.execute(sql, params).fetchall()
+
+    # -- metrics ---------------------------------------------------------
+
+    def row_count(self) -> int:
+        """Total rows stored."""
+        return self._query("SELECT COUNT(*) FROM transactions")[0][0]
+
+    def total_revenue(self, **filters) -> float:
+        """Sum of line totals over valid sales."""
+        where, params = self._where(_VALID, **filters)
+        value = self._query(f"SELECT SUM(quantity * unit_price) FROM transactions {where}", params)[0][0]
+        return value or 0.0
+
+    def revenue_by_country(self, **filters) -> Dict[str, float]:
+        """Rounded revenue per country over valid sales."""
+        where, params = self._where(_VALID, **filters)
+        rows = self._query(
+            f"SELECT country, SUM(quantity * unit_price) FROM transactions {where} GROUP BY country",
+            params,
+        )
+        return {k: round(v, 2) for k, v in rows}
+
+    def monthly_revenue(self, **filters) -> Dict[str, float]:
+        """Rounded revenue per "YYYY-MM" over valid sales."""
+        where, params = self._where(_VALID, **filters)
+        rows = self._query(
+            f"SELECT substr(invoice_date, 1, 7) AS ym, SUM(quantity * unit_price) "
+            f"FROM transactions {where} GROUP BY ym ORDER BY ym",
+            params,
+        )
+        return {k: round(v, 2) for k, v in rows}
+
+    def top_n_products_by_revenue(self, n: int = 10, **filters) -> List[Tuple[str, float]]:
+        """Top N products by revenue (description, falling back to stock code)."""
+        if n <= 0:
+            return []
+        where, params = self._where(_VALID, **filters)
+        rows = self._query(
+            f"SELECT {_PRODUCT} AS product, SUM(quantity * unit_price) AS rev "
+            f"FROM transactions {where} GROUP BY product ORDER BY rev DESC LIMIT ?",
+            params + [n],
+        )
+        return [(name, round(amount, 2)) for name, amount in rows]
+
+    def top_n_customers_by_revenue(self, n: int = 10, **filters) -> List[Tuple[str, float]]:
+        """Top N customers (non-null IDs only) by revenue."""
+        if n <= 0:
+            return []
+        where, params = self._where(_VALID + " AND customer_id IS NOT NULL", **filters)
+        rows = self._query(
+            f"SELECT customer_id, SUM(quantity * unit_price) AS rev "
+            f"FROM transactions {where} GROUP BY customer_id ORDER BY rev DESC LIMIT ?",
+            params + [n],
+        )
+        return [(cust, round(amount, 2)) for cust, amount in rows]
+
+    def sales_by_weekday(self, **filters) -> Dict[str, float]:
+        """Rounded revenue per weekday name, always including all 7 days."""
+        where, params = self._where(_VALID, **filters)
+        rows = self._query(
+            f"SELECT CAST(strftime('%w', invoice_date) AS INTEGER) AS wd, SUM(quantity * unit_price) "
+            f"FROM transactions {where} GROUP BY wd",
+            params,
+        )
+        agg = {d: 0.0 for d in WEEKDAYS}
+        for wd, amount in rows:
+            # SQLite %w: 0 = Sunday; Python weekday(): 0 = Monday.
+            agg[WEEKDAYS[(wd - 1) % 7]] = amount
+        return {k: round(v, 2) for k, v in agg.items()}
+
+    def cancellation_summary(self, **filters) -> Dict[str, float | int]:
+        """Invoice-level cancellation counts and amounts over all rows."""
+        where, params = self._where(None, **filters)
+        total_invoices, total_cancels, net_amount = self._query(
+            f"SELECT COUNT(DISTINCT invoice_no), "
+            f"COUNT(DISTINCT CASE WHEN {_RETURN} THEN invoice_no END), "
+            f"SUM(CASE WHEN {_RETURN} THEN quantity * unit_price ELSE 0 END) "
+            f"FROM transactions {where}",
+            params,
+        )[0]
+        net_amount = net_amount or 0.0
+        rate = (total_cancels / total_invoices * 100.0) if total_invoices else 0.0
+        return {
+            "TotalCancellations": int(total_cancels),
+            "CancellationRate": round(rate, 2),
+            "CancelledNetAmount": round(net_amount, 2),
+            "CancelledAbsAmount": round(abs(net_amount), 2),
+        }
+
+    def avg_order_value(self, **filters) -> float:
+        """Mean per-invoice revenue over valid sales."""
+        where, params = self._where(_VALID, **filters)
+        value = self._query(
+            f"SELECT AVG(total) FROM (SELECT SUM(quantity * unit_price) AS total "
+            f"FROM transactions {where} GROUP BY invoice_no)",
+            params,
+        )[0][0]
+        return value or 0.0
+
+    def units_sold_per_product(self, **filters) -> Dict[str, int]:
+        """Units sold per product over valid sales."""
+        where, params = self._where(_VALID, **filters)
+        rows = self._query(
+            f"SELECT {_PRODUCT} AS product, SUM(quantity) FROM transactions {where} GROUP BY product",
+            params,
+        )
+        return dict(rows)
+
+    def cancellation_rate(self, **filters) -> float:
+        """Percent of absolute value attributable to cancellations/returns."""
+        where, params = self._where(None, **filters)
+        gross, cancelled = self._query(
+            f"SELECT SUM(ABS(quantity * unit_price)), "
+            f"SUM(CASE WHEN {_RETURN} THEN ABS(quantity * unit_price) ELSE 0 END) "
+            f"FROM transactions {where}",
+            params,
+        )[0]
+        return (cancelled / gross * 100.0) if gross else 0.0
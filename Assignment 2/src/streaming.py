@@ -0,0 +1,221 @@
+# src/streaming.py
+from __future__ import annotations
+
+import copy
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import grouping
+from .grouping import WEEKDAYS, product_key
+from .models import Transaction
+from .sketches import HyperLogLog, KLLSketch
+from .timeseries import period_label
+
+__all__ = [
+    "ReportAccumulator",
+    "stream_report",
+]
+
+
+class ReportAccumulator:
+    """
+    Incremental state for every report section, filled in one pass.
+
+    Each record updates a handful of running aggregates, so memory is
+    bounded by group cardinality (countries, months, products, customers,
+    invoices) rather than by row count, and the input can be a generator
+    over a file of any size. Accumulators over disjoint inputs can be
+    combined with merge(), e.g. one per file or per worker.
+
+    With approximate=True the invoice-keyed sets (the only state that grows
+    with the number of orders) are replaced by HyperLogLog sketches, and
+    two extra sections are produced: distinct_customers (HyperLogLog) and
+    order_value_quantiles (p50/p90/p99 per-invoice revenue, KLL). Memory is
+    then fixed apart from the product/customer/country/month groups.
+    Order totals are assembled in a FIFO of at most max_open_invoices
+    invoices, which relies on an invoice's lines being close together in
+    the input (as in the Online Retail exports).
+    """
+
+    def __init__(
+        self,
+        approximate: bool = False,
+        distinct_error: float = 0.01,
+        rank_error: float = 0.01,
+        max_open_invoices: int = 4096,
+    ) -> None:
+        """
+        Args:
+            approximate: Use sketches for invoice/customer distinct counts
+                and order-value quantiles.
+            distinct_error: Target relative error of the distinct counts.
+            rank_error: Target rank error of the order-value quantiles.
+            max_open_invoices: Invoices whose total is still being summed
+                before it is added to the quantile sketch.
+        """
+        self.approximate = approximate
+        self.rows = 0
+        self.revenue = 0.0
+        self.by_country: Dict[str, float] = defaultdict(float)
+        self.by_month: Dict[int, float] = defaultdict(float)  # year * 12 + month - 1
+        self.by_product: Dict[str, float] = defaultdict(float)
+        self.units_by_product: Dict[str, int] = defaultdict(int)
+        self.by_customer: Dict[str, float] = defaultdict(float)
+        self.by_weekday: List[float] = [0.0] * 7
+        self.returns_net = 0.0
+
+        self.customers: Optional[HyperLogLog] = None
+        self.order_values: Optional[KLLSketch] = None
+        self._open_orders: "OrderedDict[str, float]" = OrderedDict()
+        self._max_open = max_open_invoices
+        if approximate:
+            self.sale_invoices: Any = HyperLogLog.from_error(distinct_error)
+            self.all_invoices: Any = HyperLogLog.from_error(distinct_error)
+            self.return_invoices: Any = HyperLogLog.from_error(distinct_error)
+            self.customers = HyperLogLog.from_error(distinct_error)
+            self.order_values = KLLSketch.from_error(rank_error)
+        else:
+            self.sale_invoices = set()
+            self.all_invoices = set()
+            self.return_invoices = set()
+
+    def update(self, records: Iterable[Transaction]) -> "ReportAccumulator":
+        """Fold records into the running aggregates; returns self."""
+        # Local aliases keep the per-row loop tight.
+        by_country, by_month = self.by_country, self.by_month
+        by_product, units_by_product = self.by_product, self.units_by_product
+        by_customer, by_weekday = self.by_customer, self.by_weekday
+        sale_invoices, all_invoices = self.sale_invoices, self.all_invoices
+        return_invoices = self.return_invoices
+        customers, order_values = self.customers, self.order_values
+        open_orders, max_open = self._open_orders, self._max_open
+        revenue, returns_net, rows = self.revenue, self.returns_net, self.rows
+
+        for t in records:
+            rows += 1
+            invoice = t.invoice_no
+            all_invoices.add(invoice)
+            if customers is not None and t.customer_id:
+                customers.add(t.customer_id)
+            line_total = t.quantity * t.unit_price
+            cancelled = t.is_cancellation
+            if cancelled or t.quantity <= 0:
+                return_invoices.add(invoice)
+                returns_net += line_total
+                continue
+            if t.unit_price <= 0.0:
+                continue
+
+            # Valid sale (same criteria as valid_transactions()).
+            revenue += line_total
+            d = t.invoice_date
+            by_country[t.country] += line_total
+            by_month[d.year * 12 + d.month - 1] += line_total
+            by_weekday[d.weekday()] += line_total
+            product = product_key(t)
+            by_product[product] += line_total
+            units_by_product[product] += t.quantity
+            if t.customer_id:
+                by_customer[t.customer_id] += line_total
+            sale_invoices.add(invoice)
+            if order_values is not None:
+                order_total = open_orders.get(invoice)
+                if order_total is None:
+                    open_orders[invoice] = line_total
+                    if len(open_orders) > max_open:
+                        order_values.add(open_orders.popitem(last=False)[1])
+                else:
+                    open_orders[invoice] = order_total + line_total
+
+        self.revenue, self.returns_net, self.rows = revenue, returns_net, rows
+        return self
+
+    def merge(self, other: "ReportAccumulator") -> "ReportAccumulator":
+        """Add another accumulator's state into this one; returns self."""
+        if other.approximate != self.approximate:
+            raise ValueError("cannot merge exact and approximate accumulators")
+        self.rows += other.rows
+        self.revenue += other.revenue
+        self.returns_net += other.returns_net
+        for mine, theirs in (
+            (self.by_country, other.by_country),
+            (self.by_month, other.by_month),
+            (self.by_product, other.by_product),
+            (self.units_by_product, other.units_by_product),
+            (self.by_customer, other.by_customer),
+        ):
+            for k, v in theirs.items():
+                mine[k] += v
+        for i, v in enumerate(other.by_weekday):
+            self.by_weekday[i] += v
+        self.sale_invoices |= other.sale_invoices
+        self.all_invoices |= other.all_invoices
+        self.return_invoices |= other.return_invoices
+        if self.approximate:
+            self.customers |= other.customers
+            self.order_values.merge(other.order_values)
+            # An invoice split across the two inputs is still summed as one.
+            for invoice, amount in other._open_orders.items():
+                self._open_orders[invoice] = self._open_orders.get(invoice, 0.0) + amount
+            while len(self._open_orders) > self._max_open:
+                self.order_values.add(self._open_orders.popitem(last=False)[1])
+        return self
+
+    def _order_value_quantiles(self) -> Dict[str, float]:
+        sketch = copy.deepcopy(self.order_values)
+        for amount in self._open_orders.values():
+            sketch.add(amount)
+        return sketch.summary()
+
+    def report(self, top_n: int = 10) -> Dict[str, Any]:
+        """
+        Finalize into the report dict used by main.print_report().
+
+        Values have the same shape and rounding as the src.analysis
+        functions. Approximate accumulators add "distinct_customers" and
+        "order_value_quantiles".
+        """
+        total_invoices = len(self.all_invoices)
+        total_cancels = len(self.return_invoices)
+        rate = (total_cancels / total_invoices * 100.0) if total_invoices else 0.0
+        n_sales = len(self.sale_invoices)
+        report: Dict[str, Any] = {
+            "total_revenue": self.revenue,
+            "revenue_by_country": {k: round(v, 2) for k, v in self.by_country.items()},
+            "monthly_revenue": {period_label(k, "month"): round(v, 2) for k, v in self.by_month.items()},
+            "top_products": grouping.top_n(self.by_product.items(), top_n),
+            "top_customers": grouping.top_n(self.by_customer.items(), top_n),
+            "avg_order_value": self.revenue / n_sales if n_sales else 0.0,
+            "units_sold_per_product": dict(self.units_by_product),
+            "sales_by_weekday": {day: round(v, 2) for day, v in zip(WEEKDAYS, self.by_weekday)},
+            "cancellation_summary": {
+                "TotalCancellations": int(total_cancels),
+                "CancellationRate": round(rate, 2),
+                "CancelledNetAmount": round(self.returns_net, 2),
+                "CancelledAbsAmount": round(abs(self.returns_net), 2),
+            },
+        }
+        if self.approximate:
+            report["distinct_customers"] = len(self.customers)
+            report["order_value_quantiles"] = self._order_value_quantiles()
+        return report
+
+
+def stream_report(
+    records: Iterable[Transaction],
+    top_n: int = 10,
+    approximate: bool = False,
+) -> Dict[str, Any]:
+    """
+    Compute every report section in a single pass over records.
+
+    Args:
+        records: Raw transactions, typically a load_transactions() generator.
+        top_n: Size of the top products/customers lists.
+        approximate: Use fixed-memory sketches for invoice-level metrics
+            (see ReportAccumulator).
+
+    Returns:
+        Report dict with the same keys as main.build_report().
+    """
+    return ReportAccumulator(approximate=approximate).update(records).report(top_n)
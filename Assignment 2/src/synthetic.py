@@ -0,0 +1,206 @@
+# src/synthetic.py
+from __future__ import annotations
+
+import argparse
+import csv
+import random
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+__all__ = [
+    "CSV_HEADER",
+    "generate_rows",
+    "write_synthetic_csv",
+]
+
+# Online Retail II CSV header (normalized by io_utils.HEADER_MAP on load).
+CSV_HEADER = ["Invoice", "StockCode", "Description", "Quantity", "InvoiceDate", "Price", "Customer ID", "Country"]
+
+# Approximate line share per country in Online Retail II (UK dominates).
+_COUNTRIES: List[Tuple[str, float]] = [
+    ("United Kingdom", 0.915), ("EIRE", 0.017), ("Germany", 0.017), ("France", 0.014),
+    ("Netherlands", 0.005), ("Spain", 0.004), ("Switzerland", 0.003), ("Belgium", 0.003),
+    ("Portugal", 0.003), ("Australia", 0.002), ("Channel Islands", 0.002), ("Italy", 0.002),
+    ("Norway", 0.002), ("Sweden", 0.002), ("Cyprus", 0.001), ("Finland", 0.001),
+    ("Austria", 0.001), ("Denmark", 0.001), ("Greece", 0.001), ("Japan", 0.001),
+    ("Poland", 0.001), ("USA", 0.001), ("Unspecified", 0.0005), ("Israel", 0.0005),
+    ("Singapore", 0.0005), ("Iceland", 0.0003), ("Canada", 0.0003), ("Malta", 0.0003),
+    ("Lithuania", 0.0002), ("Bahrain", 0.0002), ("Brazil", 0.0002), ("RSA", 0.0002),
+]
+
+_ADJECTIVES = ["VINTAGE", "RETRO", "WHITE", "RED", "PINK", "BLUE", "JUMBO", "SMALL", "HANGING", "REGENCY",
+               "PAPER", "GLASS", "WOODEN", "HEART", "SPOTTY", "FLORAL", "CHRISTMAS", "SET OF 3", "PARTY", "LUNCH"]
+_NOUNS = ["MUG", "CLOCK", "T-LIGHT HOLDER", "BAG", "LANTERN", "CAKE STAND", "BUNTING", "BOX", "DOORMAT",
+          "TEACUP", "CANDLE", "NAPKINS", "SIGN", "PURSE", "ALARM CLOCK", "BOWL", "JAR", "FRAME", "CUSHION", "TIN"]
+
+# Units per line and their relative frequency (pack sizes dominate).
+_QUANTITIES = [1, 2, 3, 4, 6, 8, 10, 12, 24, 25, 36, 48, 72, 96, 144]
+_QTY_WEIGHTS = list(accumulate([14, 12, 8, 6, 10, 4, 6, 20, 8, 3, 2, 3, 1, 1, 1]))
+
+# Trading calendar: 2009-12-01 (a Tuesday) onwards, 07:00-20:00, closed on
+# Saturdays; ~632 trading days cover the real dataset's 738 calendar days.
+_START_DAY = datetime(2009, 12, 1)
+_TRADING_DAYS = 632
+_OPEN_HOUR = 7
+_DAY_MINUTES = 13 * 60
+# Calendar offset of each trading day within a week starting on Tuesday.
+_WEEK_OFFSETS = [0, 1, 2, 3, 5, 6]
+
+# Fraction of invoices that are cancellations ("C" prefix, negative qty).
+_CANCEL_RATE = 0.017
+# Fraction of lines with no customer ID.
+_ANON_RATE = 0.22
+# Fraction of invoices that are stock adjustments (one line, no description,
+# negative quantity, price 0).
+_ADJUST_RATE = 0.01
+
+
+def _cardinalities(n_rows: int) -> Tuple[int, int, int]:
+    """(products, customers, invoices) scaled from the real dataset's ratios."""
+    products = max(50, min(50_000, int(4_600 * (n_rows / 1_000_000) ** 0.5)))
+    customers = max(20, n_rows // 180)
+    invoices = max(1, n_rows // 19)  # ~19 lines per invoice on average
+    return products, customers, invoices
+
+
+def _catalogue(rng: random.Random, n_products: int) -> Tuple[List[str], List[str], List[float]]:
+    codes, names, prices = [], [], []
+    for i in range(n_products):
+        codes.append(f"{20000 + i}" if i % 7 else f"{20000 + i}{chr(65 + i % 26)}")
+        names.append(f"{rng.choice(_ADJECTIVES)} {rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)}")
+        prices.append(round(rng.lognormvariate(0.9, 0.8), 2) or 0.01)
+    return codes, names, prices
+
+
+def generate_rows(
+    n_rows: int,
+    seed: int = 0,
+    date_format: str = "%m/%d/%Y %H:%M",
+) -> Iterator[List[str]]:
+    """
+    Yield deterministic synthetic Online Retail II rows (without header).
+
+    The same (n_rows, seed) always produces identical output. Shape follows
+    the real dataset: ~20 lines per invoice, Zipf-like product popularity,
+    UK-dominated country mix with customers tied to one country, ~22% of
+    lines without a customer, ~1.7% cancellation invoices, ~1% stock
+    adjustment invoices, trading hours 07:00-20:00 and no Saturday trading.
+
+    Args:
+        n_rows: Number of rows to produce (memory use is independent of it).
+        seed: Random seed.
+        date_format: strftime format for InvoiceDate; any of
+            io_utils.DATE_FORMATS round-trips through load_transactions.
+
+    Yields:
+        Rows as lists of strings in CSV_HEADER order.
+    """
+    rng = random.Random(seed)
+    n_products, n_customers, n_invoices = _cardinalities(n_rows)
+    codes, names, prices = _catalogue(rng, n_products)
+    product_cum = list(accumulate(1.0 / (rank + 1) for rank in range(n_products)))
+
+    countries = [c for c, _ in _COUNTRIES]
+    country_cum = list(accumulate(w for _, w in _COUNTRIES))
+    customer_country = rng.choices(countries, cum_weights=country_cum, k=n_customers)
+
+    step = _TRADING_DAYS * _DAY_MINUTES / n_invoices
+    minute = 0.0
+    invoice_no = 489_434
+    emitted = 0
+    recent: List[Tuple[int, str, str]] = []  # (product, customer_id, country) for cancellations
+
+    while emitted < n_rows:
+        invoice_no += 1
+        minute += step * rng.uniform(0.5, 1.5)
+        day, of_day = divmod(int(minute), _DAY_MINUTES)
+        week, weekday = divmod(day, len(_WEEK_OFFSETS))
+        when = _START_DAY + timedelta(days=week * 7 + _WEEK_OFFSETS[weekday], minutes=_OPEN_HOUR * 60 + of_day)
+        stamp = when.strftime(date_format)
+
+        if rng.random() < _ADJUST_RATE:
+            product = rng.randrange(n_products)
+            yield [str(invoice_no), codes[product], "", str(-rng.randint(1, 50)), stamp, "0.00", "",
+                   "United Kingdom"]
+            emitted += 1
+            continue
+
+        if recent and rng.random() < _CANCEL_RATE:
+            # Cancellation: reverse a few lines of a recent order.
+            product, customer, country = rng.choice(recent)
+            for _ in range(min(rng.randint(1, 3), n_rows - emitted)):
+                qty = -rng.choices(_QUANTITIES, cum_weights=_QTY_WEIGHTS)[0]
+                yield [f"C{invoice_no}", codes[product], names[product], str(qty), stamp,
+                       f"{prices[product]:.2f}", customer, country]
+                emitted += 1
+            continue
+
+        if rng.random() < _ANON_RATE:
+            customer, country = "", rng.choices(countries, cum_weights=country_cum)[0]
+        else:
+            cust = rng.randrange(n_customers)
+            customer, country = f"{12346 + cust}", customer_country[cust]
+
+        lines = min(max(1, int(rng.expovariate(1 / 20))), n_rows - emitted)
+        for product in rng.choices(range(n_products), cum_weights=product_cum, k=lines):
+            qty = rng.choices(_QUANTITIES, cum_weights=_QTY_WEIGHTS)[0]
+            price = prices[product] if rng.random() > 0.1 else prices[product] * 0.85
+            yield [str(invoice_no), codes[product], names[product], str(qty), stamp,
+                   f"{price:.2f}", customer, country]
+            emitted += 1
+
+        if customer:
+            recent.append((product, customer, country))
+            if len(recent) > 256:
+                recent.pop(0)
+
+
+def write_synthetic_csv(
+    path: str | Path,
+    n_rows: int,
+    seed: int = 0,
+    date_format: str = "%m/%d/%Y %H:%M",
+    encoding: str = "ISO-8859-1",
+) -> Path:
+    """
+    Write a synthetic Online Retail II CSV (header + n_rows rows).
+
+    Args:
+        path: Destination file (parent directories are created).
+        n_rows: Number of data rows.
+        seed: Random seed; identical arguments give byte-identical files.
+        date_format: strftime format for InvoiceDate.
+        encoding: File encoding (matches load_transactions' default).
+
+    Returns:
+        The written path.
+    """
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", newline="", encoding=encoding) as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        rows = generate_rows(n_rows, seed=seed, date_format=date_format)
+        while True:
+            chunk = [row for _, row in zip(range(10_000), rows)]
+            if not chunk:
+                break
+            writer.writerows(chunk)
+    return out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Online Retail II CSV.")
+    parser.add_argument("out", type=Path, help="Output CSV path")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of data rows (default 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default 0)")
+    parser.add_argument("--date-format", default="%m/%d/%Y %H:%M", help="strftime format for InvoiceDate")
+    args = parser.parse_args(argv)
+    write_synthetic_csv(args.out, args.rows, seed=args.seed, date_format=args.date_format)
+    print(f"Wrote {args.rows:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
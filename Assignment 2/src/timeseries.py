@@ -0,0 +1,268 @@
+# src/timeseries.py
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .grouping import WEEKDAYS
+from .models import Transaction
+
+__all__ = [
+    "FREQUENCIES",
+    "period_code",
+    "period_start",
+    "period_label",
+    "TimeSeries",
+    "revenue_series",
+]
+
+# Supported bin widths, finest first.
+FREQUENCIES = ("hour", "day", "week", "month", "quarter")
+
+# Row measures a series can accumulate (sales view only).
+MEASURES: Dict[str, Callable[[Transaction], float]] = {
+    "revenue": lambda t: t.quantity * t.unit_price,
+    "units": lambda t: t.quantity,
+    "lines": lambda t: 1,
+}
+
+
+# -----------------------------
+# Integer period codes
+# -----------------------------
+#
+# Each period is a single int, consecutive periods differ by 1, and a coarser
+# code is derived from a finer one arithmetically:
+#   hour    = day * 24 + hour of day
+#   day     = date.toordinal() (day 1 is Monday 0001-01-01)
+#   week    = (day - 1) // 7, weeks start on Monday
+#   month   = year * 12 + month - 1
+#   quarter = year * 4 + (month - 1) // 3
+
+def period_code(ts: datetime, freq: str) -> int:
+    """Integer code of the period containing ts."""
+    if freq == "hour":
+        return ts.toordinal() * 24 + ts.hour
+    if freq == "day":
+        return ts.toordinal()
+    if freq == "week":
+        return (ts.toordinal() - 1) // 7
+    if freq == "month":
+        return ts.year * 12 + ts.month - 1
+    if freq == "quarter":
+        return ts.year * 4 + (ts.month - 1) // 3
+    raise ValueError(f"freq must be one of {FREQUENCIES}")
+
+
+def period_start(code: int, freq: str) -> datetime:
+    """First instant of the period with this code."""
+    if freq == "hour":
+        return datetime.fromordinal(code // 24) + timedelta(hours=code % 24)
+    if freq == "day":
+        return datetime.fromordinal(code)
+    if freq == "week":
+        return datetime.fromordinal(code * 7 + 1)
+    if freq == "month":
+        return datetime(code // 12, code % 12 + 1, 1)
+    if freq == "quarter":
+        return datetime(code // 4, (code % 4) * 3 + 1, 1)
+    raise ValueError(f"freq must be one of {FREQUENCIES}")
+
+
+def period_label(code: int, freq: str) -> str:
+    """
+    Display label: "2011-03-05 14:00" (hour), "2011-03-05" (day, and week
+    by its Monday), "2011-03" (month), "2011-Q1" (quarter).
+    """
+    if freq == "month":
+        return f"{code // 12:04d}-{code % 12 + 1:02d}"
+    if freq == "quarter":
+        return f"{code // 4:04d}-Q{code % 4 + 1}"
+    start = period_start(code, freq)
+    return start.strftime("%Y-%m-%d %H:00" if freq == "hour" else "%Y-%m-%d")
+
+
+def _coarsen(code: int, src: str, dst: str) -> int:
+    """Map a code at frequency src to the enclosing period at dst."""
+    if src == dst:
+        return code
+    if src == "hour":
+        code, src = code // 24, "day"
+        if dst == "day":
+            return code
+    if src == "day":
+        if dst == "week":
+            return (code - 1) // 7
+        d = date.fromordinal(code)
+        code, src = d.year * 12 + d.month - 1, "month"
+        if dst == "month":
+            return code
+    if src == "month" and dst == "quarter":
+        return (code // 12) * 4 + (code % 12) // 3
+    raise ValueError(f"cannot resample {src} to {dst}")
+
+
+# -----------------------------
+# Series
+# -----------------------------
+
+class TimeSeries:
+    """
+    Sparse series of values keyed by integer period code.
+
+    Built once at a fine frequency (one pass over the rows), then resampled,
+    smoothed and compared without touching the rows again. Hourly bins over
+    a year are fewer than 9,000 entries, so multi-year daily and hourly
+    curves stay cheap.
+    """
+
+    def __init__(self, freq: str, values: Optional[Dict[int, float]] = None) -> None:
+        if freq not in FREQUENCIES:
+            raise ValueError(f"freq must be one of {FREQUENCIES}")
+        self.freq = freq
+        self.values: Dict[int, float] = dict(values or {})
+
+    @classmethod
+    def from_transactions(
+        cls,
+        records: Iterable[Transaction],
+        freq: str = "hour",
+        measure: str = "revenue",
+    ) -> "TimeSeries":
+        """
+        Bin valid sales by period in one pass.
+
+        Args:
+            records: Raw transactions (cancellations and non-positive lines
+                are skipped, as in valid_transactions()).
+            freq: Bin width.
+            measure: "revenue", "units" or "lines".
+        """
+        value_of = MEASURES[measure]
+        agg: Dict[int, float] = defaultdict(float)
+        # An invoice's lines share a timestamp, so the code is rarely recomputed.
+        last_ts: Optional[datetime] = None
+        code = 0
+        for t in records:
+            if t.is_cancellation or t.quantity <= 0 or t.unit_price <= 0.0:
+                continue
+            if t.invoice_date != last_ts:
+                last_ts = t.invoice_date
+                code = period_code(last_ts, freq)
+            agg[code] += value_of(t)
+        return cls(freq, agg)
+
+    # ---- shape ----
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Tuple[int, float]]:
+        return iter(sorted(self.values.items()))
+
+    def span(self) -> Tuple[int, int]:
+        """First and last period code (raises ValueError when empty)."""
+        if not self.values:
+            raise ValueError("empty series")
+        return min(self.values), max(self.values)
+
+    def dense(self) -> List[Tuple[int, float]]:
+        """Every period from first to last, with 0.0 for periods without sales."""
+        if not self.values:
+            return []
+        lo, hi = self.span()
+        get = self.values.get
+        return [(code, get(code, 0.0)) for code in range(lo, hi + 1)]
+
+    def resample(self, freq: str) -> "TimeSeries":
+        """
+        Sum into a coarser frequency (e.g. hour -> day, day -> month).
+
+        Raises:
+            ValueError: If freq is finer than the series, or week -> month.
+        """
+        if FREQUENCIES.index(freq) < FREQUENCIES.index(self.freq):
+            raise ValueError(f"cannot resample {self.freq} to finer {freq}")
+        out: Dict[int, float] = defaultdict(float)
+        for code, value in self.values.items():
+            out[_coarsen(code, self.freq, freq)] += value
+        return TimeSeries(freq, out)
+
+    # ---- windows ----
+
+    def rolling_sum(self, window: int) -> "TimeSeries":
+        """
+        Sum over the trailing window periods (gaps count as 0).
+
+        Periods with fewer than window predecessors are omitted.
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        out: Dict[int, float] = {}
+        buf: deque = deque()
+        total = 0.0
+        for code, value in self.dense():
+            buf.append(value)
+            total += value
+            if len(buf) > window:
+                total -= buf.popleft()
+            if len(buf) == window:
+                out[code] = total
+        return TimeSeries(self.freq, out)
+
+    def moving_average(self, window: int) -> "TimeSeries":
+        """Mean over the trailing window periods (see rolling_sum)."""
+        sums = self.rolling_sum(window)
+        return TimeSeries(self.freq, {code: v / window for code, v in sums.values.items()})
+
+    def growth(self, periods: int = 1) -> "TimeSeries":
+        """
+        Percent change against the value periods earlier (gaps count as 0).
+
+        Periods whose base is 0 have no defined growth and are omitted.
+        """
+        if periods < 1:
+            raise ValueError("periods must be >= 1")
+        dense = self.dense()
+        out: Dict[int, float] = {}
+        for i in range(periods, len(dense)):
+            base = dense[i - periods][1]
+            if base:
+                code, value = dense[i]
+                out[code] = (value - base) / abs(base) * 100.0
+        return TimeSeries(self.freq, out)
+
+    # ---- profiles and output ----
+
+    def profile(self, by: str = "weekday") -> Dict[str, float]:
+        """
+        Fold the series onto a cycle: "weekday" (day or hour series) or
+        "hour" of day (hour series).
+        """
+        out: Dict[str, float] = {}
+        if by == "weekday" and self.freq in ("hour", "day"):
+            out = {day: 0.0 for day in WEEKDAYS}
+            for code, value in self.values.items():
+                day = code // 24 if self.freq == "hour" else code
+                out[WEEKDAYS[(day - 1) % 7]] += value
+        elif by == "hour" and self.freq == "hour":
+            out = {f"{h:02d}:00": 0.0 for h in range(24)}
+            for code, value in self.values.items():
+                out[f"{code % 24:02d}:00"] += value
+        else:
+            raise ValueError(f"cannot profile a {self.freq} series by {by}")
+        return {k: round(v, 2) for k, v in out.items()}
+
+    def to_dict(self, dense: bool = False) -> Dict[str, float]:
+        """{label: value rounded to 2 decimals}, in period order."""
+        items = self.dense() if dense else list(self)
+        return {period_label(code, self.freq): round(v, 2) for code, v in items}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(freq={self.freq!r}, periods={len(self.values)})"
+
+
+def revenue_series(records: Iterable[Transaction], freq: str = "day") -> TimeSeries:
+    """Revenue of valid sales binned at freq (see TimeSeries.from_transactions)."""
+    return TimeSeries.from_transactions(records, freq=freq)
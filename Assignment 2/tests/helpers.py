@@ -0,0 +1,34 @@
+# tests/helpers.py
+"""Shared fixtures for the unit tests."""
+from datetime import datetime
+from typing import Optional
+
+from src import Transaction
+
+
+def make_tx(
+    invoice_no: str = "1",
+    stock_code: str = "A",
+    description: Optional[str] = None,
+    quantity: int = 1,
+    invoice_date: datetime = datetime(2011, 1, 3, 10),
+    unit_price: float = 1.0,
+    customer_id: Optional[str] = None,
+    country: str = "United Kingdom",
+) -> Transaction:
+    """
+    Build a Transaction for a test.
+
+    Positional arguments follow the Transaction field order; every field
+    has a default, so a test names only the fields it cares about.
+    """
+    return Transaction(
+        invoice_no=invoice_no,
+        stock_code=stock_code,
+        description=description,
+        quantity=quantity,
+        invoice_date=invoice_date,
+        unit_price=unit_price,
+        customer_id=customer_id,
+        country=country,
+    )
@@ -0,0 +1,87 @@
+# tests/test_basket.py
+import unittest
+
+from src.basket import MarketBasket
+from tests.helpers import make_tx
+
+
+def _rows(baskets):
+    return [make_tx(str(i), item[:3], item) for i, basket in enumerate(baskets) for item in basket]
+
+
+# 10 baskets: bread+butter in 4, bread+jam in 2, milk alone in 3, one big order.
+BASKETS = (
+    [["BREAD", "BUTTER"]] * 3
+    + [["BREAD", "BUTTER", "JAM"]]
+    + [["BREAD", "JAM"]]
+    + [["MILK"]] * 3
+    + [["BUTTER", "MILK"]]
+    + [["BREAD", "BUTTER", "JAM", "MILK", "EGGS"]]
+)
+
+
+class MarketBasketTests(unittest.TestCase):
+    """
+    Pair support, confidence and lift must match hand-counted values.
+
+    Covers:
+        - Basket collection (sales only, duplicate lines counted once)
+        - Support threshold pruning
+        - Rules in both directions with confidence and lift
+        - max_basket_size
+    """
+
+    def setUp(self) -> None:
+        rows = _rows(BASKETS)
+        rows.insert(1, make_tx("0", "BRE", "BREAD"))         # duplicate line, same basket
+        rows.append(make_tx("C99", "BRE", "BREAD", -1))   # cancellation: not a basket
+        self.basket = MarketBasket.from_transactions(rows)
+
+    def test_baskets(self):
+        self.assertEqual(len(self.basket), 10)
+        counts = dict(zip(self.basket.products, self.basket.item_counts()))
+        self.assertEqual(counts, {"BREAD": 6, "BUTTER": 6, "JAM": 3, "MILK": 5, "EGGS": 1})
+
+    def test_frequent_pairs(self):
+        pairs = self.basket.frequent_pairs(min_support=0.3)
+        self.assertEqual([(p.a, p.b, p.count) for p in pairs], [("BREAD", "BUTTER", 5), ("BREAD", "JAM", 3)])
+        self.assertAlmostEqual(pairs[0].support, 0.5)
+        # EGGS is below the threshold, so none of its pairs are counted.
+        low = {(p.a, p.b) for p in self.basket.frequent_pairs(min_support=0.2)}
+        self.assertIn(("BUTTER", "MILK"), low)
+        self.assertNotIn(("MILK", "EGGS"), low)
+        with self.assertRaises(ValueError):
+            self.basket.frequent_pairs(min_support=0)
+
+    def test_rules(self):
+        rules = {(r.antecedent, r.consequent): r for r in self.basket.rules(min_support=0.3)}
+        jam_bread = rules[("JAM", "BREAD")]
+        self.assertAlmostEqual(jam_bread.confidence, 1.0)
+        self.assertAlmostEqual(jam_bread.lift, 1.0 / 0.6)
+        self.assertAlmostEqual(rules[("BREAD", "JAM")].confidence, 0.5)
+        self.assertEqual(len(rules), 4)
+
+        strong = self.basket.rules(min_support=0.3, min_confidence=0.8)
+        self.assertEqual(
+            {(r.antecedent, r.consequent) for r in strong}, {("JAM", "BREAD"), ("BUTTER", "BREAD"), ("BREAD", "BUTTER")}
+        )
+
+    def test_max_basket_size(self):
+        small = MarketBasket.from_transactions(_rows(BASKETS), max_basket_size=3)
+        pairs = {(p.a, p.b): p.count for p in small.frequent_pairs(min_support=0.1)}
+        self.assertEqual(pairs[("BREAD", "BUTTER")], 4)
+        self.assertNotIn(("MILK", "EGGS"), pairs)
+
+        # The 5-product order is left out of item counts and the total too.
+        self.assertEqual(len(small), 10)
+        self.assertEqual(small.basket_count(), 9)
+        counts = dict(zip(small.products, small.item_counts()))
+        self.assertEqual(counts, {"BREAD": 5, "BUTTER": 5, "JAM": 2, "MILK": 4, "EGGS": 0})
+        self.assertAlmostEqual(small.frequent_pairs(min_support=0.1)[0].support, 4 / 9)
+        jam_bread = {(r.antecedent, r.consequent): r for r in small.rules(min_support=0.1)}[("JAM", "BREAD")]
+        self.assertAlmostEqual(jam_bread.confidence, 1.0)
+        self.assertAlmostEqual(jam_bread.lift, 9 / 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_columnar.py
+import importlib.util
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import (
+    read_columnar,
+    revenue_by_country,
+    total_revenue,
+    valid_transactions,
+    write_columnar,
+)
+from tests.helpers import make_tx
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+class ColumnarRoundTripTests(unittest.TestCase):
+    """
+    Parquet / Arrow IPC export must round-trip transactions exactly.
+
+    Covers:
+        - Lossless round trip for both formats (including None fields)
+        - Date and country filter pushdown
+        - Column projection
+        - Parquet row groups carry only their own dictionary values
+    """
+
+    def setUp(self) -> None:
+        self.raw = [
+            make_tx("540001", "A111", "VINTAGE MUG", 10, datetime(2011, 3, 5, 10, 15), 1.99, "10001", "United Kingdom"),
+            make_tx("540001", "B222", "RETRO CLOCK", 3, datetime(2011, 3, 5, 10, 15), 9.50, "10001", "United Kingdom"),
+            make_tx("C540050", "A111", "VINTAGE MUG", -10, datetime(2011, 3, 5, 10, 45), 1.99, "10001", "United Kingdom"),
+            make_tx("540010", "C333", "GLASS VASE", 2, datetime(2011, 3, 5, 11, 0), 15.00, "20002", "Germany"),
+            make_tx("540200", "D444", None, 5, datetime(2011, 4, 4, 9, 0), 3.00, None, "France"),
+        ]
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def test_round_trip_both_formats(self):
+        for name in ("retail.parquet", "retail.arrow"):
+            with self.subTest(name=name):
+                path = self._path(name)
+                self.assertEqual(write_columnar(self.raw, path, batch_size=2), len(self.raw))
+                self.assertEqual(list(read_columnar(path)), self.raw)
+
+    def test_filter_pushdown(self):
+        path = self._path("retail.parquet")
+        write_columnar(self.raw, path, batch_size=2)
+
+        march = list(read_columnar(path, start=datetime(2011, 3, 1), end=datetime(2011, 4, 1)))
+        self.assertEqual(march, self.raw[:4])
+
+        germany = list(read_columnar(path, countries=["Germany"]))
+        self.assertEqual(germany, [self.raw[3]])
+
+        # An empty country list is a filter that matches nothing.
+        self.assertEqual(list(read_columnar(path, countries=[])), [])
+
+    def test_projection_supports_metrics(self):
+        path = self._path("retail.parquet")
+        write_columnar(self.raw, path)
+
+        rows = list(read_columnar(path, columns=["invoice_no", "quantity", "unit_price", "country"]))
+        self.assertTrue(all(t.description is None and t.invoice_date is None for t in rows))
+
+        valid = list(valid_transactions(rows))
+        expected = list(valid_transactions(self.raw))
+        self.assertAlmostEqual(total_revenue(valid), total_revenue(expected), places=6)
+        self.assertEqual(revenue_by_country(valid), revenue_by_country(expected))
+
+    def test_parquet_dictionaries_per_row_group(self):
+        import pyarrow.parquet as pq
+
+        unique = [
+            make_tx(f"5{i:05d}", f"S{i}", f"ITEM {i}", 1, datetime(2011, 3, 5), 1.0, str(i), "France")
+            for i in range(400)
+        ]
+        path = self._path("unique.parquet")
+        write_columnar(unique, path, batch_size=100)
+        meta = pq.ParquetFile(path).metadata
+        sizes = [meta.row_group(i).column(0).total_uncompressed_size for i in range(meta.num_row_groups)]
+        self.assertEqual(len(sizes), 4)
+        self.assertLess(max(sizes), 1.5 * min(sizes))   # no growing cumulative dictionary
+        self.assertEqual(list(read_columnar(path)), unique)
+
+    def test_rejects_unknown_inputs(self):
+        with self.assertRaises(ValueError):
+            write_columnar(self.raw, self._path("retail.csv"))
+        path = self._path("retail.parquet")
+        write_columnar(self.raw, path)
+        with self.assertRaises(ValueError):
+            list(read_columnar(path, columns=["nope"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# tests/test_compressed.py
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+
+from src import expand_sources, load_transactions
+from src.compressed import detect_compression, open_text
+
+CSV = """Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country
+540001,A111,VINTAGE MUG,10,03/05/2011 10:15,1.99,10001,United Kingdom
+C540050,A111,VINTAGE MUG,-10,03/05/2011 10:45,1.99,10001,United Kingdom
+540010,C333,GLASS VASE,2,03/05/2011 11:00,15.00,20002,Germany
+"""
+
+CODECS = {".gz": gzip.compress, ".bz2": bz2.compress, ".xz": lzma.compress}
+
+
+class CompressedInputTests(unittest.TestCase):
+    """
+    Compressed exports must load exactly like the plain CSV.
+
+    Covers:
+        - gzip, bz2 and xz by suffix
+        - Detection by magic bytes
+        - Large inputs spanning many read-ahead chunks
+        - Errors from the read-ahead thread reach the reader
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.plain = self._write("retail.csv", CSV.encode("ISO-8859-1"))
+        self.expected = list(load_transactions(self.plain))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_codecs_by_suffix(self):
+        for suffix, compress in CODECS.items():
+            with self.subTest(suffix=suffix):
+                path = self._write("retail.csv" + suffix, compress(CSV.encode("ISO-8859-1")))
+                self.assertEqual(list(load_transactions(path)), self.expected)
+                self.assertEqual(list(load_transactions(path, countries=["Germany"])), self.expected[-1:])
+
+    def test_magic_bytes(self):
+        path = self._write("export.dat", gzip.compress(CSV.encode("ISO-8859-1")))
+        self.assertEqual(detect_compression(path), "gzip")
+        self.assertIsNone(detect_compression(self.plain))
+        self.assertEqual(list(load_transactions(path)), self.expected)
+
+    def test_directory_includes_compressed_files(self):
+        self._write("more.csv.gz", gzip.compress(CSV.encode("ISO-8859-1")))
+        names = [os.path.basename(p) for p in expand_sources(self.tmp.name)]
+        self.assertEqual(names, ["more.csv.gz", "retail.csv"])
+
+    def test_large_input_round_trip(self):
+        lines = CSV.splitlines(keepends=True)
+        text = lines[0] + "".join(lines[1:]) * 20_000
+        path = self._write("big.csv.gz", gzip.compress(text.encode("ISO-8859-1")))
+        with open_text(path) as f:
+            self.assertEqual(f.read(), text)
+        self.assertEqual(sum(1 for _ in load_transactions(path)), 60_000)
+
+    def test_offset_rejected(self):
+        path = self._write("retail.csv.gz", gzip.compress(CSV.encode("ISO-8859-1")))
+        with self.assertRaises(ValueError):
+            list(load_transactions(path, offset=10))
+
+    def test_corrupt_stream_raises(self):
+        data = gzip.compress(CSV.encode("ISO-8859-1"))
+        path = self._write("broken.csv.gz", data[: len(data) // 2])
+        with self.assertRaises(EOFError):
+            list(load_transactions(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
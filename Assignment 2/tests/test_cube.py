@@ -0,0 +1,137 @@
+# tests/test_cube.py
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from src import (
+    SalesCube,
+    avg_order_value,
+    cancellation_summary,
+    load_or_build_cube,
+    load_transactions,
+    monthly_revenue,
+    revenue_by_country,
+    sales_by_weekday,
+    top_n_customers_by_revenue,
+    top_n_products_by_revenue,
+    total_revenue,
+    units_sold_per_product,
+)
+from tests.helpers import make_tx
+
+
+HEADER = "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\n"
+ROWS = [
+    "540001,A111,VINTAGE MUG,10,03/05/2011 10:15,1.99,10001,United Kingdom\n",
+    "C540050,A111,VINTAGE MUG,-10,03/05/2011 10:45,1.99,10001,United Kingdom\n",
+    "540010,C333,GLASS VASE,2,03/05/2011 11:00,15.00,20002,Germany\n",
+]
+APPENDED = [
+    "540200,D444,,5,04/04/2011 09:00,3.00,,France\n",
+    "540201,A111,VINTAGE MUG,4,04/04/2011 09:30,2.10,20002,Germany\n",
+]
+
+
+class SalesCubeTests(unittest.TestCase):
+    """
+    Cube rollups must reproduce the src.analysis report sections.
+
+    Covers:
+        - Every report section against its analysis counterpart
+        - Slice/dice/rollup queries
+        - Persistence and incremental extension of an appended CSV
+        - Rebuild from a truncated cube file
+    """
+
+    def setUp(self) -> None:
+        self.raw = [
+            make_tx("540001", "A111", "VINTAGE MUG", 10, datetime(2011, 3, 5, 10, 15), 1.99, "10001", "United Kingdom"),
+            make_tx("540001", "B222", "RETRO CLOCK", 3, datetime(2011, 3, 5, 10, 15), 9.50, "10001", "United Kingdom"),
+            make_tx("C540050", "A111", "VINTAGE MUG", -10, datetime(2011, 3, 5, 10, 45), 1.99, "10001", "United Kingdom"),
+            make_tx("540010", "C333", "GLASS VASE", 2, datetime(2011, 3, 5, 11, 0), 15.00, "20002", "Germany"),
+            make_tx("540200", "D444", None, 5, datetime(2011, 4, 4, 9, 0), 3.00, None, "France"),
+        ]
+        self.cube = SalesCube.build(self.raw)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_report_sections_match_analysis(self):
+        self.assertAlmostEqual(self.cube.total_revenue(), total_revenue(self.raw), places=6)
+        self.assertEqual(self.cube.revenue_by_country(), revenue_by_country(self.raw))
+        self.assertEqual(self.cube.monthly_revenue(), monthly_revenue(self.raw))
+        self.assertEqual(self.cube.top_n_products_by_revenue(3), top_n_products_by_revenue(self.raw, 3))
+        self.assertEqual(self.cube.top_n_customers_by_revenue(3), top_n_customers_by_revenue(self.raw, 3))
+        self.assertEqual(self.cube.sales_by_weekday(), sales_by_weekday(self.raw))
+        self.assertEqual(self.cube.units_sold_per_product(), units_sold_per_product(self.raw))
+        self.assertAlmostEqual(self.cube.avg_order_value(), avg_order_value(self.raw), places=6)
+        self.assertEqual(self.cube.cancellation_summary(), cancellation_summary(self.raw))
+
+    def test_slice_dice_rollup(self):
+        uk = self.cube.slice("country", "United Kingdom")
+        self.assertAlmostEqual(uk.total_revenue(), 10 * 1.99 + 3 * 9.50, places=6)
+
+        march_eu = self.cube.dice(month="2011-03", country={"Germany", "France"})
+        self.assertEqual(march_eu.revenue_by_country(), {"Germany": 30.0})
+
+        by_country_month = self.cube.rollup("country", "month", measure="lines")
+        self.assertEqual(by_country_month[("United Kingdom", "2011-03")], 2)
+
+        with self.assertRaises(ValueError):
+            uk.avg_order_value()
+        with self.assertRaises(ValueError):
+            self.cube.rollup("invoice")
+
+    def test_incremental_extension(self):
+        csv_path = os.path.join(self.tmp.name, "retail.csv")
+        cube_path = os.path.join(self.tmp.name, "retail.cube")
+        with open(csv_path, "w", encoding="ISO-8859-1") as f:
+            f.write(HEADER + "".join(ROWS))
+        load_or_build_cube(csv_path, cube_path)
+
+        with open(csv_path, "a", encoding="ISO-8859-1") as f:
+            f.write("".join(APPENDED))
+
+        # Only the appended rows are parsed; no full rebuild happens.
+        with mock.patch.object(SalesCube, "build", side_effect=AssertionError("full rebuild")):
+            extended = load_or_build_cube(csv_path, cube_path)
+
+        full = list(load_transactions(csv_path))
+        self.assertEqual(extended.revenue_by_country(), revenue_by_country(full))
+        self.assertEqual(extended.cancellation_summary(), cancellation_summary(full))
+
+        reloaded, _ = SalesCube.load(cube_path)
+        self.assertEqual(reloaded.monthly_revenue(), monthly_revenue(full))
+
+    def test_rewritten_file_rebuilds(self):
+        csv_path = os.path.join(self.tmp.name, "retail.csv")
+        cube_path = os.path.join(self.tmp.name, "retail.cube")
+        with open(csv_path, "w", encoding="ISO-8859-1") as f:
+            f.write(HEADER + "".join(ROWS))
+        load_or_build_cube(csv_path, cube_path)
+
+        with open(csv_path, "w", encoding="ISO-8859-1") as f:
+            f.write(HEADER + "".join(APPENDED))
+        cube = load_or_build_cube(csv_path, cube_path)
+        self.assertEqual(cube.revenue_by_country(), revenue_by_country(load_transactions(csv_path)))
+
+    def test_corrupt_cube_file_rebuilds(self):
+        csv_path = os.path.join(self.tmp.name, "retail.csv")
+        cube_path = os.path.join(self.tmp.name, "retail.cube")
+        with open(csv_path, "w", encoding="ISO-8859-1") as f:
+            f.write(HEADER + "".join(ROWS))
+        load_or_build_cube(csv_path, cube_path)
+        with open(cube_path, "r+b") as f:
+            f.truncate(os.path.getsize(cube_path) // 2)
+
+        self.assertEqual(SalesCube.load(cube_path), (None, None))
+        cube = load_or_build_cube(csv_path, cube_path)
+        self.assertEqual(cube.revenue_by_country(), revenue_by_country(load_transactions(csv_path)))
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["retail.csv", "retail.cube"])
+
+
+if __name__ == "__main__":
+    unittest.main()
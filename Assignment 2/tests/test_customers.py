@@ -0,0 +1,92 @@
+# tests/test_customers.py
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from src.customers import CustomerAccumulator, analyze_customers
+from tests.helpers import make_tx
+
+
+ROWS = [
+    # c1: Jan, Feb, Apr; two lines on the first invoice
+    make_tx("1", invoice_date=datetime(2011, 1, 5), quantity=2, unit_price=10.0, customer_id="c1"),
+    make_tx("1", invoice_date=datetime(2011, 1, 5), unit_price=10.0, customer_id="c1"),
+    make_tx("4", invoice_date=datetime(2011, 2, 9), unit_price=10.0, customer_id="c1"),
+    make_tx("7", invoice_date=datetime(2011, 4, 20), unit_price=10.0, customer_id="c1"),
+    # c2: Jan only, big spender
+    make_tx("2", invoice_date=datetime(2011, 1, 7), quantity=50, unit_price=10.0, customer_id="c2"),
+    # c3: Feb and Mar
+    make_tx("5", invoice_date=datetime(2011, 2, 1), unit_price=10.0, customer_id="c3"),
+    make_tx("6", invoice_date=datetime(2011, 3, 3), unit_price=10.0, customer_id="c3"),
+    # ignored: cancellation, anonymous, zero price
+    make_tx("C8", invoice_date=datetime(2011, 4, 1), quantity=-1, unit_price=10.0, customer_id="c2"),
+    make_tx("9", invoice_date=datetime(2011, 4, 1), unit_price=10.0, customer_id=None),
+    make_tx("10", invoice_date=datetime(2011, 4, 1), unit_price=0.0, customer_id="c4"),
+]
+
+
+class CustomerAccumulatorTests(unittest.TestCase):
+    """
+    RFM values, scores and cohort retention from one pass, mergeable.
+
+    Covers:
+        - Recency/frequency/monetary per customer and score ordering
+        - Cohort sizes and retention matrix
+        - Merge of partitions equals a single pass
+        - Parallel analyze_customers over files
+    """
+
+    def setUp(self) -> None:
+        self.acc = CustomerAccumulator().update(ROWS)
+
+    def test_rfm_values(self):
+        rfm = self.acc.rfm(as_of=date(2011, 5, 1))
+        self.assertEqual(set(rfm), {"c1", "c2", "c3"})
+        self.assertEqual(rfm["c1"][:3], (11, 3, 50.0))
+        self.assertEqual(rfm["c2"][:3], (114, 1, 500.0))
+        self.assertEqual(rfm["c3"][:3], (59, 2, 20.0))
+
+        scores = self.acc.rfm(as_of=date(2011, 5, 1), bins=3)
+        self.assertEqual(scores["c1"].segment, "332")
+        self.assertEqual(scores["c2"].segment, "113")
+        self.assertEqual(scores["c3"].segment, "221")
+        self.assertEqual(sum(self.acc.segment_counts(bins=3).values()), 3)
+
+    def test_cohorts(self):
+        self.assertEqual(self.acc.cohort_sizes(), {"2011-01": 2, "2011-02": 1})
+        self.assertEqual(
+            self.acc.cohort_retention(as_percent=False),
+            {"2011-01": [2, 1, 0, 1], "2011-02": [1, 1, 0]},
+        )
+        self.assertEqual(self.acc.cohort_retention()["2011-01"], [100.0, 50.0, 0.0, 50.0])
+
+    def test_merge_matches_single_pass(self):
+        # The later partition is folded first so that merge has to rebase.
+        late = CustomerAccumulator().update(ROWS[5:])
+        early = CustomerAccumulator().update(ROWS[:5])
+        merged = late.merge(early)
+        self.assertEqual(merged.rfm(), self.acc.rfm())
+        self.assertEqual(merged.cohort_retention(), self.acc.cohort_retention())
+        self.assertEqual(CustomerAccumulator().merge(CustomerAccumulator()).rfm(), {})
+
+    def test_analyze_customers_files(self):
+        header = "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, rows in (("a.csv", ROWS[:5]), ("b.csv", ROWS[5:])):
+                with open(os.path.join(tmp, name), "w", encoding="ISO-8859-1") as f:
+                    f.write(header)
+                    for t in rows:
+                        f.write(
+                            f"{t.invoice_no},{t.stock_code},,{t.quantity},"
+                            f"{t.invoice_date:%m/%d/%Y %H:%M},{t.unit_price},{t.customer_id or ''},{t.country}\n"
+                        )
+            for workers in (1, 2):
+                with self.subTest(workers=workers):
+                    got = analyze_customers(tmp, workers=workers)
+                    self.assertEqual(got.rfm(), self.acc.rfm())
+                    self.assertEqual(got.cohort_sizes(), self.acc.cohort_sizes())
+
+
+if __name__ == "__main__":
+    unittest.main()
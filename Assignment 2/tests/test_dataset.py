@@ -0,0 +1,100 @@
+# tests/test_dataset.py
+import os
+import tempfile
+import unittest
+
+from src import (
+    cancellation_summary,
+    revenue_by_country,
+    top_n_products_by_revenue,
+    total_revenue,
+)
+from src.dataset import Dataset
+from tests.helpers import make_tx
+
+
+ROWS = [
+    make_tx("1", quantity=2, unit_price=5.0, stock_code="A"),
+    make_tx("1", quantity=1, unit_price=3.0, stock_code="B"),
+    make_tx("2", quantity=4, unit_price=1.5, country="France", stock_code="A"),
+    make_tx("C3", quantity=-1, unit_price=5.0),
+    make_tx("4", quantity=1, unit_price=0.0),
+]
+
+
+class DatasetTests(unittest.TestCase):
+    """
+    Memoized views and results must equal direct calls and follow data changes.
+
+    Covers:
+        - query() results equal the analysis functions on the raw rows
+        - Hits, parameter keys and LRU eviction
+        - extend() updates views incrementally and drops results
+        - refresh() reloads a changed source file
+    """
+
+    def setUp(self) -> None:
+        self.data = Dataset(ROWS)
+
+    def test_matches_direct_calls(self):
+        self.assertEqual(len(self.data.valid()), 3)
+        self.assertEqual(len(self.data.returns()), 1)
+        self.assertEqual(list(self.data.line_totals()), [10.0, 3.0, 6.0])
+        for fn in (total_revenue, revenue_by_country, cancellation_summary):
+            with self.subTest(fn=fn.__name__):
+                self.assertEqual(self.data.query(fn), fn(ROWS))
+        self.assertEqual(self.data.revenue_by("country"), revenue_by_country(ROWS))
+        self.assertEqual(self.data.revenue_by("stock_code"), {"A": 16.0, "B": 3.0})
+
+    def test_memoization(self):
+        self.data.query(top_n_products_by_revenue, n=1)
+        first = self.data.query(top_n_products_by_revenue, n=1)
+        self.assertEqual(first, [("A", 16.0)])
+        self.assertEqual(self.data.query(top_n_products_by_revenue, n=2), [("A", 16.0), ("B", 3.0)])
+        self.assertEqual(self.data.cache_info()["hits"], 1)
+        self.assertEqual(self.data.cache_info()["misses"], 2)
+
+        first.append("mutated")   # callers get copies
+        self.assertEqual(self.data.query(top_n_products_by_revenue, n=1), [("A", 16.0)])
+
+        small = Dataset(ROWS, cache_size=2)
+        for n in (1, 2, 3):
+            small.query(top_n_products_by_revenue, n=n)
+        self.assertEqual(small.cache_info()["size"], 2)
+        small.query(top_n_products_by_revenue, n=1)   # evicted: recomputed
+        self.assertEqual(small.cache_info()["hits"], 0)
+
+    def test_extend_invalidates(self):
+        self.assertEqual(self.data.query(total_revenue), 19.0)
+        valid = self.data.valid()
+        self.data.line_totals()
+        self.data.extend([make_tx("5", quantity=1, unit_price=7.0, country="France"), make_tx("C6", quantity=-2, unit_price=1.0)])
+        self.assertIs(self.data.valid(), valid)   # extended in place, not rebuilt
+        self.assertEqual(list(self.data.line_totals()), [10.0, 3.0, 6.0, 7.0])
+        self.assertEqual(len(self.data.returns()), 2)
+        self.assertEqual(self.data.query(total_revenue), 26.0)
+        self.assertEqual(self.data.revenue_by("country"), {"United Kingdom": 13.0, "France": 13.0})
+        self.assertEqual(self.data.version, 1)
+
+        self.data.replace(ROWS[:1])
+        self.assertEqual(self.data.query(total_revenue), 10.0)
+
+    def test_refresh_from_source(self):
+        header = "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\n"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.csv")
+            with open(path, "w", encoding="ISO-8859-1") as f:
+                f.write(header + "1,A,,2,01/03/2011 10:00,5.0,,France\n")
+            data = Dataset.load(path)
+            self.assertEqual(data.query(total_revenue), 10.0)
+            self.assertFalse(data.refresh())
+
+            with open(path, "a", encoding="ISO-8859-1") as f:
+                f.write("2,B,,1,01/03/2011 11:00,4.0,,France\n")
+            os.utime(path, ns=(0, 1))   # make the change visible on coarse clocks
+            self.assertTrue(data.refresh())
+            self.assertEqual(data.query(total_revenue), 14.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# tests/test_executor.py
+import unittest
+from datetime import datetime, timedelta
+
+from src import Dataset, cancellation_summary, monthly_revenue, total_revenue, valid_transactions
+from src.executor import ReportExecutor, Task
+from tests.helpers import make_tx
+
+
+def _valid(rows):
+    return list(valid_transactions(rows))
+
+
+def _share(total, months):
+    return {month: round(v / total * 100.0, 2) for month, v in months.items()}
+
+
+GRAPH = {
+    "valid": Task(_valid, ("rows",), shared=True),
+    "total_revenue": Task(total_revenue, ("valid",)),
+    "monthly_revenue": Task(monthly_revenue, ("valid",)),
+    "cancellation_summary": Task(cancellation_summary, ("rows",)),
+    "month_share": Task(_share, ("total_revenue", "monthly_revenue")),
+}
+
+
+class ReportExecutorTests(unittest.TestCase):
+    """
+    The DAG executor must give the serial result for any worker count.
+
+    Covers:
+        - Shared nodes, pool nodes and node-to-node dependencies
+        - A shared Dataset queried by pool nodes
+        - Deterministic output order and targets with their closure
+        - Graph validation (cycles, missing inputs, shared-on-pool)
+    """
+
+    def setUp(self) -> None:
+        start = datetime(2010, 12, 1, 8)
+        self.rows = [make_tx(str(i), quantity=1 + i % 3, unit_price=2.5, invoice_date=start + timedelta(days=i)) for i in range(90)]
+        self.rows.append(make_tx("C1", quantity=-2, unit_price=2.5, invoice_date=start))
+
+    def test_parallel_matches_serial(self):
+        serial = ReportExecutor(GRAPH, workers=1).run({"rows": self.rows})
+        self.assertEqual(list(serial), ["total_revenue", "monthly_revenue", "cancellation_summary", "month_share"])
+        self.assertEqual(serial["total_revenue"], total_revenue(self.rows))
+        self.assertEqual(serial["cancellation_summary"], cancellation_summary(self.rows))
+        self.assertAlmostEqual(sum(serial["month_share"].values()), 100.0, places=1)
+        for workers in (2, 4):
+            with self.subTest(workers=workers):
+                parallel = ReportExecutor(GRAPH, workers=workers).run({"rows": self.rows})
+                self.assertEqual(list(parallel), list(serial))
+                self.assertEqual(parallel, serial)
+
+    def test_shared_dataset(self):
+        graph = {
+            "data": Task(Dataset, ("rows",), shared=True),
+            "total_revenue": Task(Dataset.query, ("data",), {"fn": total_revenue}),
+            "cancellation_summary": Task(Dataset.query, ("data",), {"fn": cancellation_summary}),
+        }
+        expected = {"total_revenue": total_revenue(self.rows), "cancellation_summary": cancellation_summary(self.rows)}
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.assertEqual(ReportExecutor(graph, workers=workers).run({"rows": self.rows}), expected)
+
+    def test_targets(self):
+        got = ReportExecutor(GRAPH, workers=2).run({"rows": self.rows}, targets=["month_share", "valid"])
+        self.assertEqual(list(got), ["valid", "month_share"])
+        self.assertEqual(len(got["valid"]), 90)
+        with self.assertRaises(KeyError):
+            ReportExecutor(GRAPH).run({"rows": self.rows}, targets=["nope"])
+
+    def test_validation(self):
+        with self.assertRaises(KeyError):
+            ReportExecutor(GRAPH, workers=1).run({})
+        with self.assertRaises(ValueError):
+            ReportExecutor({"a": Task(_valid, ("b",)), "b": Task(_valid, ("a",))})
+        with self.assertRaises(ValueError):
+            ReportExecutor({"a": Task(total_revenue, ("rows",)), "b": Task(_valid, ("a",), shared=True)})
+
+
+if __name__ == "__main__":
+    unittest.main()
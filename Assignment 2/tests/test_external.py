@@ -0,0 +1,85 @@
+# tests/test_external.py
+import os
+import random
+import tempfile
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+
+from src.external import ExternalGroupBy, external_report
+from src.streaming import stream_report
+from tests.helpers import make_tx
+
+
+class ExternalGroupByTests(unittest.TestCase):
+    """
+    Spilled aggregation must equal the in-memory result exactly.
+
+    Covers:
+        - Sum and "or" combiners across many spills
+        - Re-partitioning of partitions that are still over budget
+        - No files without spills; cleanup after items()
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        rng = random.Random(7)
+        self.pairs = [(f"k{rng.randrange(500)}", rng.randrange(1, 10)) for _ in range(5000)]
+        self.expected = Counter()
+        for k, v in self.pairs:
+            self.expected[k] += v
+
+    def test_spilled_sum_matches(self):
+        for max_groups, partitions in ((1000, 4), (50, 4), (3, 2)):
+            with self.subTest(max_groups=max_groups, partitions=partitions):
+                g = ExternalGroupBy("sum", max_groups=max_groups, partitions=partitions, tmpdir=self.tmp.name)
+                g.update(self.pairs)
+                self.assertEqual(g.spills > 0, max_groups < 500)
+                got = list(g.items())
+                self.assertEqual(len(got), len(self.expected))
+                self.assertEqual(dict(got), dict(self.expected))
+                self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_or_combiner(self):
+        g = ExternalGroupBy("or", max_groups=2, tmpdir=self.tmp.name)
+        for key, flag in (("a", 1), ("b", 2), ("c", 0), ("a", 2), ("d", 1), ("c", 1)):
+            g.add(key, flag)
+        self.assertEqual(dict(g.items()), {"a": 3, "b": 2, "c": 1, "d": 1})
+        with self.assertRaises(ValueError):
+            ExternalGroupBy(max_groups=0)
+
+
+class ExternalReportTests(unittest.TestCase):
+    """
+    external_report must agree with stream_report when forced to spill.
+    """
+
+    def test_matches_stream_report(self):
+        rng = random.Random(1)
+        start = datetime(2010, 12, 1, 8)
+        rows = []
+        for i in range(3000):
+            inv = str(i // 3) if i % 50 else f"C{i}"
+            qty = rng.randrange(1, 6) if i % 50 else -1
+            price = 0.0 if i % 97 == 0 else rng.choice((0.5, 1.25, 2.0, 3.75))
+            cust = None if i % 7 == 0 else f"c{rng.randrange(300)}"
+            rows.append(make_tx(inv, f"P{rng.randrange(400)}", None, qty, start + timedelta(hours=i), price, cust))
+
+        expected = stream_report(rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            got = external_report(rows, max_groups=20, partitions=4, tmpdir=tmp)
+            self.assertEqual(os.listdir(tmp), [])
+
+        for key in ("revenue_by_country", "monthly_revenue", "sales_by_weekday", "cancellation_summary"):
+            self.assertEqual(got[key], expected[key], key)
+        self.assertAlmostEqual(got["total_revenue"], expected["total_revenue"])
+        self.assertAlmostEqual(got["avg_order_value"], expected["avg_order_value"])
+        for key in ("top_products", "top_customers"):
+            self.assertEqual([v for _, v in got[key]], [v for _, v in expected[key]], key)
+        units = Counter(expected["units_sold_per_product"]).most_common(10)
+        self.assertEqual(sorted(got["units_sold_per_product"].values()), sorted(v for _, v in units))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+# tests/test_indexing.py
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import (
+    TransactionIndex,
+    load_indexed,
+    total_revenue,
+    units_sold_per_product,
+)
+from src.indexing import index_path_for
+from src.io_utils import load_transactions
+from tests.helpers import make_tx
+
+
+CSV = """Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country
+540001,A111,VINTAGE MUG,10,03/05/2011 10:15,1.99,10001,United Kingdom
+540010,C333,GLASS VASE,2,03/05/2011 11:00,15.00,20002,Germany
+540200,D444,,5,04/04/2011 09:00,3.00,,France
+"""
+
+
+LOADER_CALLS = []
+
+
+def counting_loader(path, **filters):
+    LOADER_CALLS.append(filters)
+    return load_transactions(path, **filters)
+
+
+class TransactionIndexTests(unittest.TestCase):
+    """
+    Index lookups must return exactly the rows a linear scan would.
+
+    Covers:
+        - Single and combined criteria
+        - Analysis functions over an index-driven subset
+        - Save/load round trip and stale-index detection
+        - Saved rows reused only for the same loader and filters
+    """
+
+    def setUp(self) -> None:
+        self.rows = [
+            make_tx("540001", "A111", "VINTAGE MUG", 10, datetime(2011, 3, 5, 10, 15), 1.99, "10001", "United Kingdom"),
+            make_tx("540001", "B222", "RETRO CLOCK", 3, datetime(2011, 3, 5, 10, 15), 9.50, "10001", "United Kingdom"),
+            make_tx("C540050", "A111", "VINTAGE MUG", -10, datetime(2011, 3, 5, 10, 45), 1.99, "10001", "United Kingdom"),
+            make_tx("540010", "C333", "GLASS VASE", 2, datetime(2011, 3, 5, 11, 0), 15.00, "20002", "Germany"),
+            make_tx("540200", "A111", "VINTAGE MUG", 5, datetime(2011, 4, 4, 9, 0), 3.00, None, "France"),
+        ]
+        self.index = TransactionIndex.build(self.rows)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_lookups_match_scan(self):
+        self.assertEqual(list(self.index.offsets(customer_id="10001")), [0, 1, 2])
+        self.assertEqual(list(self.index.offsets(month="2011-04")), [4])
+        self.assertEqual(list(self.index.offsets(stock_code="A111", month="2011-03")), [0, 2])
+        self.assertEqual(self.index.count(country="Nowhere"), 0)
+        self.assertNotIn(None, self.index.keys("customer_id"))
+
+    def test_subset_feeds_analysis(self):
+        subset = self.index.subset(self.rows, customer_id="10001")
+        expected = [t for t in self.rows if t.customer_id == "10001"]
+        self.assertAlmostEqual(total_revenue(subset), total_revenue(expected), places=6)
+
+        march_mugs = self.index.subset(self.rows, stock_code="A111", month="2011-03")
+        self.assertEqual(units_sold_per_product(march_mugs), {"VINTAGE MUG": 10})
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            self.index.offsets(description="VINTAGE MUG")
+
+    def test_load_indexed_persists_next_to_data(self):
+        path = os.path.join(self.tmp.name, "retail.csv")
+        with open(path, "w", encoding="ISO-8859-1") as f:
+            f.write(CSV)
+
+        rows, index = load_indexed(path)
+        self.assertTrue(index_path_for(path).exists())
+        self.assertEqual(list(index.offsets(country="Germany")), [1])
+
+        # Fresh index is reused as-is.
+        loaded = TransactionIndex.load(index_path_for(path), source=path)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(list(loaded.offsets(customer_id="10001")), [0])
+
+        # Changing the data file invalidates it.
+        with open(path, "a", encoding="ISO-8859-1") as f:
+            f.write("540300,E555,LAMP,1,04/05/2011 09:00,7.00,30003,Germany\n")
+        self.assertIsNone(TransactionIndex.load(index_path_for(path), source=path))
+        rows, index = load_indexed(path)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(list(index.offsets(country="Germany")), [1, 3])
+
+    def test_load_indexed_reuses_rows_per_loader_and_filters(self):
+        path = os.path.join(self.tmp.name, "retail.csv")
+        with open(path, "w", encoding="ISO-8859-1") as f:
+            f.write(CSV)
+        LOADER_CALLS.clear()
+
+        rows, _ = load_indexed(path, loader=counting_loader)
+        again, index = load_indexed(path, loader=counting_loader)
+        self.assertEqual(len(LOADER_CALLS), 1)
+        self.assertEqual(again, rows)
+        self.assertEqual(list(index.offsets(country="France")), [2])
+
+        # Other filters (or another loader) must not get the cached rows.
+        german, index = load_indexed(path, loader=counting_loader, countries={"Germany"})
+        self.assertEqual(len(LOADER_CALLS), 2)
+        self.assertEqual([t.country for t in german], ["Germany"])
+        self.assertEqual(list(index.offsets(country="Germany")), [0])
+        full, _ = load_indexed(path)
+        self.assertEqual(full, rows)
+        load_indexed(path, loader=lambda p: load_transactions(p))
+        load_indexed(path, loader=lambda p: load_transactions(p))
+        self.assertEqual(len(LOADER_CALLS), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# tests/test_io_utils.py
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import analysis, fields_for, load_transactions
+from src.io_utils import iter_columns
+
+CSV = """Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country
+540001,A111,VINTAGE MUG,10,03/05/2011 10:15,1.99,10001,United Kingdom
+540001,B222,RETRO CLOCK,3,03/05/2011 10:15,9.50,10001,United Kingdom
+C540050,A111,VINTAGE MUG,-10,03/05/2011 10:45,1.99,10001,United Kingdom
+540010,C333,GLASS VASE,2,03/05/2011 11:00,15.00,20002,Germany
+540200,D444,,5,04/04/2011 09:00,3.00,,France
+540300,E555,BROKEN ROW,abc,04/05/2011 09:00,3.00,30003,France
+540400,F666,BAD DATE,1,not-a-date,3.00,30003,France
+"""
+
+
+class LoadTransactionsFilterTests(unittest.TestCase):
+    """
+    Predicate pushdown in load_transactions must match filtering afterwards.
+
+    Covers:
+        - Date range, country, customer and cancellation filters
+        - Combined filters
+        - Malformed rows are still skipped
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "retail.csv")
+        with open(self.path, "w", encoding="ISO-8859-1") as f:
+            f.write(CSV)
+        self.all = list(load_transactions(self.path))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_unfiltered_skips_malformed_rows(self):
+        self.assertEqual([t.invoice_no for t in self.all], ["540001", "540001", "C540050", "540010", "540200"])
+        self.assertIsNone(self.all[-1].customer_id)
+        self.assertIsNone(self.all[-1].description)
+
+    def test_date_range(self):
+        got = list(load_transactions(self.path, start=datetime(2011, 3, 5, 10, 30), end=datetime(2011, 4, 1)))
+        expected = [t for t in self.all if datetime(2011, 3, 5, 10, 30) <= t.invoice_date < datetime(2011, 4, 1)]
+        self.assertEqual(got, expected)
+        self.assertEqual(len(got), 2)
+
+    def test_countries_and_customers(self):
+        got = list(load_transactions(self.path, countries=["Germany", "France"]))
+        self.assertEqual([t.country for t in got], ["Germany", "France"])
+
+        got = list(load_transactions(self.path, customers={"10001"}))
+        self.assertEqual(got, [t for t in self.all if t.customer_id == "10001"])
+
+    def test_cancellations(self):
+        only = list(load_transactions(self.path, cancellations=True))
+        dropped = list(load_transactions(self.path, cancellations=False))
+        self.assertEqual(only, [t for t in self.all if t.is_cancellation])
+        self.assertEqual(dropped, [t for t in self.all if not t.is_cancellation])
+
+    def test_combined_filters(self):
+        got = list(
+            load_transactions(
+                self.path,
+                countries=["United Kingdom"],
+                end=datetime(2011, 3, 6),
+                cancellations=False,
+            )
+        )
+        self.assertEqual([t.stock_code for t in got], ["A111", "B222"])
+
+
+class ColumnProjectionTests(unittest.TestCase):
+    """
+    Projected loads must give every metric the same answer as full loads.
+
+    Covers:
+        - fields_for() for each analysis function, on both engines
+        - Rows with a bad date, stock code or country dropped under any projection
+        - Unprojected fields are None; filter columns are always kept
+        - Unknown field names
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "retail.csv")
+        # Malformed rows stay in: a projection must drop exactly what a full load drops.
+        with open(self.path, "w", encoding="ISO-8859-1") as f:
+            f.write(CSV)
+            f.write("540410,,NO CODE,4,04/05/2011 09:00,3.00,30003,France\n")
+            f.write("540420,H888,NO COUNTRY,4,04/05/2011 09:00,3.00,30003,\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_metrics_match_full_load(self):
+        for name in analysis.FIELDS_USED:
+            if name in ("valid_transactions", "returns_view"):
+                continue
+            fn = getattr(analysis, name)
+            expected = fn(load_transactions(self.path))
+            for engine in ("csv", "mmap"):
+                with self.subTest(metric=name, engine=engine):
+                    rows = load_transactions(self.path, engine=engine, fields=fields_for(fn))
+                    self.assertEqual(fn(rows), expected)
+
+    def test_malformed_rows_dropped_under_projection(self):
+        full = list(load_transactions(self.path))
+        for engine in ("csv", "mmap"):
+            for fields in ((), ("quantity",), fields_for("total_revenue")):
+                with self.subTest(engine=engine, fields=fields):
+                    rows = list(load_transactions(self.path, engine=engine, fields=fields))
+                    self.assertEqual(len(rows), len(full))
+
+    def test_unprojected_fields_are_none(self):
+        rows = list(load_transactions(self.path, fields=fields_for("total_revenue"), countries=["France"]))
+        self.assertEqual([(t.invoice_no, t.country) for t in rows], [("540200", "France")])
+        self.assertIsNone(rows[0].invoice_date)
+        self.assertIsNone(rows[0].stock_code)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            list(load_transactions(self.path, fields=["InvoiceDate"]))
+        with self.assertRaises(KeyError):
+            fields_for("no_such_metric")
+
+
+class IterColumnsTests(unittest.TestCase):
+    """
+    Raw column chunks must line up with the CSV rows.
+
+    Covers:
+        - Column order, canonical header names and chunking
+        - Short rows dropped, missing columns rejected
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "retail.csv")
+        with open(self.path, "w", encoding="ISO-8859-1") as f:
+            f.write(CSV + "\n540500,G777\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_chunks(self):
+        chunks = list(iter_columns(self.path, ("UnitPrice", "InvoiceNo"), chunk_size=3))
+        self.assertEqual([len(c[0]) for c in chunks], [3, 3, 1])
+        prices = [p for c in chunks for p in c[0]]
+        invoices = [i for c in chunks for i in c[1]]
+        self.assertEqual(prices[:2], ["1.99", "9.50"])
+        self.assertEqual(invoices[-1], "540400")
+        self.assertEqual(len(invoices), 7)
+        with self.assertRaises(ValueError):
+            list(iter_columns(self.path, ("NoSuchColumn",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
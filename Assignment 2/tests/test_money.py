@@ -0,0 +1,116 @@
+# tests/test_money.py
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from src import load_transactions, revenue_by_country, total_revenue
+from src.money import MoneyTotals, exact_revenue, from_pence, parse_ints, parse_pence, to_pence
+
+HEADER = "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\n"
+ROWS = [
+    "1,A,,3,01/03/2011 10:00,0.10,,United Kingdom",
+    "1,B,,2,01/03/2011 10:00,2.55,,United Kingdom",
+    "2,A,,1,01/03/2011 11:00, 19.99 ,,France",
+    "C3,A,,-1,01/03/2011 12:00,0.10,,France",
+    "4,A,,5,01/03/2011 12:00,0,,France",
+    "5,A,,abc,01/03/2011 12:00,1.00,,France",
+    "6,A,,1,01/03/2011 12:00,,,France",
+    "7,A,,1,01/03/2011 12:00,1.00,,",
+    "8,,,1,01/03/2011 12:00,1.00,,France",
+    "9,A,,1,not-a-date,1.00,,France",
+]
+
+
+class ConversionTests(unittest.TestCase):
+    """
+    Amount parsing must be exact to the penny.
+
+    Covers:
+        - to_pence fast path, Decimal path and half-even rounding
+        - Batch parse_ints / parse_pence and their errors
+    """
+
+    def test_to_pence(self):
+        cases = {"2.55": 255, "0.1": 10, " 3 ": 300, "-1.25": -125, "1e2": 10000, "0.005": 0, "0.015": 2}
+        for text, pence in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(to_pence(text), pence)
+        self.assertEqual(to_pence("92233720368547758.07"), 9223372036854775807)
+        for bad in ("", "abc", "nan", "inf"):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                to_pence(bad)
+        self.assertEqual(from_pence(123456), Decimal("1234.56"))
+        self.assertEqual(str(from_pence(0)), "0.00")
+
+    def test_batch(self):
+        self.assertEqual(list(parse_ints(["1", " 2", "-3"])), [1, 2, -3])
+        cache = {}
+        self.assertEqual(list(parse_pence(["0.10", "2.55", "0.10"], cache)), [10, 255, 10])
+        self.assertEqual(cache, {"0.10": 10, "2.55": 255})
+        with self.assertRaises(ValueError):
+            parse_ints(["1", "x"])
+        with self.assertRaises(ValueError):
+            parse_pence(["99999999999999999999"])
+
+
+class ExactRevenueTests(unittest.TestCase):
+    """
+    Integer-pence totals must equal the float functions rounded, and be exact.
+
+    Covers:
+        - Same rows counted as a full load_transactions + total_revenue / revenue_by_country,
+          including rows with an empty stock code or a bad date
+        - Chunk boundaries and the invalid-row fallback
+        - No drift over many small amounts; invoice dedupe across files,
+          skipped for files with disjoint invoice ranges
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, rows):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="ISO-8859-1") as f:
+            f.write(HEADER + "\n".join(rows) + "\n")
+        return path
+
+    def test_matches_float_functions(self):
+        path = self._write("a.csv", ROWS)
+        rows = list(load_transactions(path))
+        for chunk_size in (2, 65536):
+            with self.subTest(chunk_size=chunk_size):
+                totals = exact_revenue(path, chunk_size=chunk_size)
+                self.assertEqual(totals.total_revenue(), Decimal("25.39"))
+                self.assertEqual(float(totals.total_revenue()), round(total_revenue(rows), 2))
+                self.assertEqual(
+                    {k: float(v) for k, v in totals.revenue_by_country().items()}, revenue_by_country(rows)
+                )
+                self.assertEqual(totals.skipped, 2)
+
+    def test_no_drift(self):
+        n = 100_001
+        totals = MoneyTotals().update_columns(
+            ["1"] * n, ["A"] * n, ["1"] * n, ["01/03/2011 10:00"] * n, ["0.10"] * n, ["UK"] * n
+        )
+        self.assertEqual(totals.total_revenue(), Decimal("10000.10"))
+        self.assertNotEqual(sum([0.1] * n), 10000.1)   # what the float sum does
+
+    def test_files_dedupe_and_merge(self):
+        a = self._write("a.csv", ROWS[:3])
+        b = self._write("b.csv", ROWS[2:3] + ["9,A,,1,01/04/2011 10:00,5.00,,France"])
+        got = exact_revenue([a, b])
+        self.assertEqual(got.revenue_by_country(), {"United Kingdom": Decimal("5.40"), "France": Decimal("24.99")})
+        merged = exact_revenue(a).merge(exact_revenue(b))
+        self.assertEqual(merged.total_revenue(), got.total_revenue() + Decimal("19.99"))
+
+        # Invoice 10 is past a.csv's invoice range: no invoice-level check.
+        c = self._write("c.csv", ["10,A,,1,01/05/2011 10:00,1.00,,France"])
+        with mock.patch("src.money._invoices_between", side_effect=AssertionError("invoice check")):
+            self.assertEqual(exact_revenue([a, c]).total_revenue(), exact_revenue(a).total_revenue() + Decimal("1.00"))
+
+
+if __name__ == "__main__":
+    unittest.main()
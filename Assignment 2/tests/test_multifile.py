@@ -0,0 +1,108 @@
+# tests/test_multifile.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import load_transactions, stream_report
+from src.io_utils import InvoiceRange, expand_sources
+from src.multifile import report_many
+
+HEADER = "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\n"
+
+JAN = HEADER + """540001,A111,VINTAGE MUG,10,01/05/2011 10:15,1.99,10001,United Kingdom
+540001,B222,RETRO CLOCK,3,01/05/2011 10:15,9.50,10001,United Kingdom
+C540050,A111,VINTAGE MUG,-10,01/05/2011 10:45,1.99,10001,United Kingdom
+540010,C333,GLASS VASE,2,01/31/2011 11:00,15.00,20002,Germany
+"""
+
+# Overlaps January by one invoice (540010), as consecutive exports often do.
+FEB = HEADER + """540010,C333,GLASS VASE,2,01/31/2011 11:00,15.00,20002,Germany
+540200,D444,LANTERN,5,02/04/2011 09:00,3.00,,France
+540300,A111,VINTAGE MUG,4,02/05/2011 09:00,1.99,30003,France
+"""
+
+# Later invoice numbers than February: the ranges do not overlap.
+MAR = HEADER + """540400,A111,VINTAGE MUG,2,03/01/2011 09:00,1.99,30003,France
+C540401,A111,VINTAGE MUG,-1,03/01/2011 09:30,1.99,30003,France
+"""
+
+
+class MultiFileTests(unittest.TestCase):
+    """
+    Several exports must read and report like one deduplicated file.
+
+    Covers:
+        - Directory, glob and list expansion
+        - Invoice dedup across overlapping files
+        - Invoice ranges: disjoint files are never compared invoice by invoice
+        - Parallel report_many matches the single-stream report
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.jan = os.path.join(self.tmp.name, "2011-01.csv")
+        self.feb = os.path.join(self.tmp.name, "2011-02.csv")
+        for path, text in ((self.jan, JAN), (self.feb, FEB)):
+            with open(path, "w", encoding="ISO-8859-1") as f:
+                f.write(text)
+        with open(os.path.join(self.tmp.name, "notes.txt"), "w") as f:
+            f.write("not data\n")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_expand_sources(self):
+        names = lambda paths: [os.path.basename(p) for p in paths]
+        self.assertEqual(names(expand_sources(self.tmp.name)), ["2011-01.csv", "2011-02.csv"])
+        self.assertEqual(names(expand_sources(os.path.join(self.tmp.name, "*-02.csv"))), ["2011-02.csv"])
+        self.assertEqual(names(expand_sources([self.feb, self.tmp.name])), ["2011-02.csv", "2011-01.csv"])
+        with self.assertRaises(FileNotFoundError):
+            expand_sources(os.path.join(self.tmp.name, "*.parquet"))
+
+    def test_overlapping_invoice_is_read_once(self):
+        rows = list(load_transactions(self.tmp.name))
+        self.assertEqual([t.invoice_no for t in rows].count("540010"), 1)
+        self.assertEqual(len(rows), 6)
+
+        duplicated = list(load_transactions([self.jan, self.feb], dedupe_invoices=False))
+        self.assertEqual(len(duplicated), 7)
+
+        with self.assertRaises(ValueError):
+            list(load_transactions(self.tmp.name, offset=10))
+
+    def test_report_many_matches_stream_report(self):
+        expected = stream_report(load_transactions(self.tmp.name))
+        self.assertAlmostEqual(expected["total_revenue"], 10 * 1.99 + 3 * 9.50 + 30.0 + 15.0 + 4 * 1.99)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                got = report_many(self.tmp.name, workers=workers)
+                self.assertEqual(got["revenue_by_country"], expected["revenue_by_country"])
+                self.assertEqual(got["cancellation_summary"], expected["cancellation_summary"])
+                self.assertAlmostEqual(got["avg_order_value"], expected["avg_order_value"])
+                self.assertAlmostEqual(got["total_revenue"], expected["total_revenue"])
+
+    def test_invoice_ranges(self):
+        first = InvoiceRange().update(["99998", "C99999", "99999"])
+        self.assertIsNone(first.overlap(InvoiceRange().update(["100000", "100001"])))
+        self.assertIsNone(first.overlap(InvoiceRange()))
+        self.assertEqual(first.overlap(InvoiceRange().update(["C99999", "100000"])), ((5, "99999"), (5, "99999")))
+
+    def test_disjoint_files_skip_invoice_checks(self):
+        os.mkdir(os.path.join(self.tmp.name, "later"))
+        mar = os.path.join(self.tmp.name, "later", "2011-03.csv")
+        with open(mar, "w", encoding="ISO-8859-1") as f:
+            f.write(MAR)
+        expected = stream_report(load_transactions([self.feb, mar]))
+        with mock.patch("src.multifile._invoices_between", side_effect=AssertionError("invoice check")):
+            got = report_many([self.feb, mar], workers=1)
+        self.assertEqual(got["revenue_by_country"], expected["revenue_by_country"])
+        self.assertEqual(got["cancellation_summary"], expected["cancellation_summary"])
+
+    def test_report_many_applies_filters(self):
+        got = report_many([self.jan, self.feb], workers=1, countries=["France"])
+        self.assertEqual(set(got["revenue_by_country"]), {"France"})
+
+
+if __name__ == "__main__":
+    unittest.main()
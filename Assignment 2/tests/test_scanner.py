@@ -0,0 +1,113 @@
+# tests/test_scanner.py
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import load_transactions
+from src.scanner import scan_transactions
+
+# Quoted commas, doubled quotes, an embedded newline, CRLF endings, a blank
+# line, quotes that do not wrap a whole field and the malformed rows
+# load_transactions() skips.
+CSV = (
+    "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\r\n"
+    '540001,A111,"MUG, VINTAGE",10,03/05/2011 10:15,1.99,10001,United Kingdom\r\n'
+    '540001,B222,"CLOCK ""RETRO""",3,03/05/2011 10:15,9.50,10001,United Kingdom\r\n'
+    "\r\n"
+    'C540050,A111,"TWO\r\nLINES",-10,03/05/2011 10:45,1.99,10001,United Kingdom\r\n'
+    "540010,C333,GLASS VASE,2,03/05/2011 11:00,15.00,20002,Germany\r\n"
+    "540200,D444,,5,04/04/2011 09:00,3.00,,France\r\n"
+    "540300,E555,BROKEN ROW,abc,04/05/2011 09:00,3.00,30003,France\r\n"
+    "540400,F666,BAD DATE,1,not-a-date,3.00,30003,France\r\n"
+    "540500,G777,SHORT ROW,1\r\n"
+    '540700,"J999" X,"Q" TRAILING,1,04/06/2011 09:00,2.50,30003,France\r\n'
+    '540800,K111,AB"C,1,04/06/2011 09:00,2.50,30003,France\r\n'
+    '540850,K222, "SPACED",1,04/06/2011 09:00,2.50,30003,France\r\n'
+    "540900,L222,AFTER STRAY QUOTE,1,04/06/2011 09:00,2.50,30003,France\r\n"
+    "540600,H888,CAFÉ SIGN,1,04/06/2011 09:00,2.50,30003,France"
+)
+
+
+class ScannerTests(unittest.TestCase):
+    """
+    The mmap scanner must return the same rows as the csv-module loader.
+
+    Covers:
+        - Quoting, embedded newlines, CRLF and non-ASCII bytes
+        - Irregular quotes (csv-module fallback) and repeated header columns
+        - Filters and byte offsets
+        - Field projection
+        - engine="mmap" in load_transactions
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "retail.csv")
+        with open(self.path, "w", encoding="ISO-8859-1", newline="") as f:
+            f.write(CSV)
+        self.expected = list(load_transactions(self.path))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_same_rows_as_csv_loader(self):
+        got = list(scan_transactions(self.path))
+        self.assertEqual(got, self.expected)
+        self.assertEqual(got[1].description, 'CLOCK "RETRO"')
+        self.assertEqual(got[2].description, "TWO\r\nLINES")
+        self.assertEqual(got[-1].description, "CAFÉ SIGN")
+        odd = {t.invoice_no: t for t in got}
+        self.assertEqual((odd["540700"].stock_code, odd["540700"].description), ("J999 X", "Q TRAILING"))
+        self.assertEqual(odd["540800"].description, 'AB"C')
+        self.assertEqual(odd["540850"].description, '"SPACED"')
+        self.assertIn("540900", odd)
+
+    def test_repeated_header_column(self):
+        with open(self.path, "w", encoding="ISO-8859-1", newline="") as f:
+            f.write(
+                "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Country,Customer ID,Country\n"
+                "540001,A111,MUG,10,03/05/2011 10:15,1.99,Nowhere,10001,United Kingdom\n"
+            )
+        got = list(scan_transactions(self.path))
+        self.assertEqual(got, list(load_transactions(self.path)))
+        self.assertEqual(got[0].country, "United Kingdom")
+
+    def test_filters_match(self):
+        for filters in (
+            dict(countries=["France", "Germany"]),
+            dict(customers={"10001"}),
+            dict(cancellations=True),
+            dict(cancellations=False, start=datetime(2011, 3, 5, 10, 30), end=datetime(2011, 4, 5)),
+        ):
+            with self.subTest(**{k: str(v) for k, v in filters.items()}):
+                self.assertEqual(list(scan_transactions(self.path, **filters)), list(load_transactions(self.path, **filters)))
+
+    def test_offset(self):
+        with open(self.path, "rb") as f:
+            offset = f.read().index(b"540010")
+        got = list(scan_transactions(self.path, offset=offset))
+        self.assertEqual(got, list(load_transactions(self.path, offset=offset)))
+        self.assertEqual(got[0].invoice_no, "540010")
+
+    def test_projection(self):
+        fields = ("invoice_no", "quantity", "invoice_date", "unit_price", "stock_code", "country")
+        got = list(scan_transactions(self.path, fields=fields))
+        self.assertEqual([t.invoice_no for t in got], [t.invoice_no for t in self.expected])
+        self.assertTrue(all(t.description is None and t.customer_id is None for t in got))
+        self.assertEqual(got, list(load_transactions(self.path, fields=fields)))
+
+        only_customers = list(scan_transactions(self.path, fields=["invoice_no"], customers=["20002"]))
+        self.assertEqual([(t.customer_id, t.description) for t in only_customers], [("20002", None)])
+
+        with self.assertRaises(ValueError):
+            list(scan_transactions(self.path, fields=["Quantity"]))
+
+    def test_engine_option(self):
+        self.assertEqual(list(load_transactions(self.path, engine="mmap")), self.expected)
+        with self.assertRaises(ValueError):
+            load_transactions(self.path, engine="pandas")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+# tests/test_server.py
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.client import HTTPConnection
+
+from src import load_transactions, monthly_revenue, revenue_by_country
+from src.server import AnalysisService, SourceUnavailable, make_server
+
+HEADER = "Invoice,StockCode,Description,Quantity,InvoiceDate,Price,Customer ID,Country\n"
+ROWS = (
+    "540001,A111,VINTAGE MUG,10,03/05/2011 10:15,1.99,10001,United Kingdom\n"
+    "C540050,A111,VINTAGE MUG,-10,03/05/2011 10:45,1.99,10001,United Kingdom\n"
+    "540010,C333,GLASS VASE,2,03/05/2011 11:00,15.00,20002,Germany\n"
+    "540200,D444,,5,04/04/2011 09:00,3.00,,France\n"
+)
+
+
+class AnalysisServiceTests(unittest.TestCase):
+    """
+    The warm service must answer like the one-shot analysis and stay fresh.
+
+    Covers:
+        - Metric results and filters
+        - Memoization of repeated queries
+        - Invalidation when the source file changes
+        - One reload for concurrent queries after a change
+        - 503 with the last cube kept while the source is unreadable
+        - HTTP transport round trip
+    """
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "retail.csv")
+        with open(self.csv_path, "w", encoding="ISO-8859-1") as f:
+            f.write(HEADER + ROWS)
+        self.service = AnalysisService(self.csv_path, check_interval=0.0)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _query(self, metric, **params):
+        return json.loads(self.service.query(metric, params))
+
+    def test_metrics_match_analysis(self):
+        raw = list(load_transactions(self.csv_path))
+        self.assertEqual(self._query("revenue_by_country"), revenue_by_country(raw))
+        self.assertEqual(self._query("monthly_revenue"), monthly_revenue(raw))
+        self.assertEqual(self._query("revenue_by_country", month="2011-03"), {"United Kingdom": 19.9, "Germany": 30.0})
+        self.assertEqual(self._query("rollup", dims="country,month", measure="lines")[0], ["United Kingdom", "2011-03", 1])
+
+    def test_repeated_query_is_memoized(self):
+        first = self.service.query("top_products", {"n": "2"})
+        self.assertIs(self.service.query("top_products", {"n": "2"}), first)
+
+    def test_invalid_queries(self):
+        with self.assertRaises(KeyError):
+            self.service.query("nope")
+        with self.assertRaises(ValueError):
+            self.service.query("total_revenue", {"colour": "red"})
+        with self.assertRaises(ValueError):
+            self.service.query("avg_order_value", {"country": "France"})
+
+    def test_source_change_invalidates(self):
+        before = self._query("revenue_by_country")
+        self.assertNotIn("Spain", before)
+        with open(self.csv_path, "a", encoding="ISO-8859-1") as f:
+            f.write("540300,E555,LAMP,1,04/05/2011 09:00,7.00,30003,Spain\n")
+
+        after = self._query("revenue_by_country")
+        self.assertEqual(after["Spain"], 7.0)
+        self.assertEqual(self.service.reloads, 2)
+
+    def test_concurrent_queries_reload_once(self):
+        with open(self.csv_path, "a", encoding="ISO-8859-1") as f:
+            f.write("540300,E555,LAMP,1,04/05/2011 09:00,7.00,30003,Spain\n")
+
+        start = threading.Barrier(16)
+        results, errors = [], []
+
+        def worker():
+            start.wait()
+            try:
+                results.append(self._query("revenue_by_country"))
+            except Exception as exc:  # noqa: BLE001 - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.service.reloads, 2)
+        self.assertTrue(all(r["Spain"] == 7.0 for r in results))
+
+    def test_missing_source_keeps_cube(self):
+        before = self.service.query("total_revenue")
+        moved = self.csv_path + ".bak"
+        os.rename(self.csv_path, moved)
+        with self.assertRaises(SourceUnavailable):
+            self.service.query("total_revenue")
+        self.assertIsNotNone(self.service.check())
+        self.assertEqual(self.service.reloads, 1)
+
+        os.rename(moved, self.csv_path)
+        self.assertEqual(self.service.query("total_revenue"), before)
+        self.assertIsNone(self.service.error)
+
+    def test_http_round_trip(self):
+        server = make_server(self.service, "127.0.0.1:0")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            conn = HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+            conn.request("GET", "/metrics/revenue_by_country?country=Germany,France")
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(json.loads(resp.read()), {"Germany": 30.0, "France": 15.0})
+
+            conn.request("GET", "/metrics/unknown")
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 404)
+            resp.read()
+
+            os.remove(self.csv_path)
+            for path in ("/metrics/total_revenue", "/health"):
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                self.assertEqual(resp.status, 503, path)
+                self.assertIn("source unavailable", json.loads(resp.read())["error"])
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
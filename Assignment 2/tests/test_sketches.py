@@ -0,0 +1,124 @@
+# tests/test_sketches.py
+import random
+import unittest
+from datetime import datetime, timedelta
+
+from src import ReportAccumulator, Transaction
+from src.sketches import HyperLogLog, KLLSketch
+
+
+class HyperLogLogTests(unittest.TestCase):
+    """
+    Distinct counts must stay within a few standard errors and merge as unions.
+    """
+
+    def test_estimate_within_error(self):
+        hll = HyperLogLog(precision=12)
+        for i in range(50_000):
+            hll.add(f"inv-{i}")
+            hll.add(f"inv-{i}")  # duplicates do not count
+        self.assertLess(abs(hll.count() - 50_000) / 50_000, 4 * hll.relative_error)
+
+    def test_small_counts_are_near_exact(self):
+        hll = HyperLogLog()
+        for i in range(100):
+            hll.add(i)
+        self.assertLessEqual(abs(len(hll) - 100), 2)
+
+    def test_merge_is_union(self):
+        left, right, both = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+        for i in range(3_000):
+            (left if i % 2 else right).add(i)
+            both.add(i)
+        left |= right
+        self.assertEqual(left.registers, both.registers)
+        with self.assertRaises(ValueError):
+            left.merge(HyperLogLog(11))
+
+    def test_from_error(self):
+        self.assertLessEqual(HyperLogLog.from_error(0.01).relative_error, 0.01)
+
+
+class KLLSketchTests(unittest.TestCase):
+    """
+    Quantiles must stay within the configured rank error, also after merges.
+    """
+
+    def _rank_error(self, sketch, values, q):
+        ordered = sorted(values)
+        estimate = sketch.quantile(q)
+        rank = sum(1 for v in ordered if v <= estimate) / len(ordered)
+        return abs(rank - q)
+
+    def test_quantiles_within_error(self):
+        rng = random.Random(1)
+        values = [rng.lognormvariate(5, 1) for _ in range(50_000)]
+        sketch = KLLSketch(k=200)
+        for v in values:
+            sketch.add(v)
+        for q in (0.5, 0.9, 0.99):
+            self.assertLess(self._rank_error(sketch, values, q), 0.02)
+        self.assertEqual(len(sketch), len(values))
+
+    def test_merge(self):
+        rng = random.Random(2)
+        values = [rng.random() for _ in range(20_000)]
+        parts = [KLLSketch(k=128, seed=i) for i in range(4)]
+        for i, v in enumerate(values):
+            parts[i % 4].add(v)
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        self.assertEqual(len(merged), len(values))
+        self.assertLess(self._rank_error(merged, values, 0.5), 0.03)
+
+    def test_empty(self):
+        self.assertNotEqual(KLLSketch().quantile(0.5), KLLSketch().quantile(0.5))  # NaN
+
+
+class ApproximateReportTests(unittest.TestCase):
+    """
+    The approximate accumulator must agree with the exact one within error.
+    """
+
+    def setUp(self) -> None:
+        rng = random.Random(3)
+        start = datetime(2011, 1, 1)
+        self.rows = []
+        for inv in range(2_000):
+            invoice = f"C{inv}" if inv % 50 == 0 else str(inv)
+            for _ in range(rng.randint(1, 5)):
+                qty = -1 if invoice.startswith("C") else rng.randint(1, 10)
+                self.rows.append(Transaction(
+                    invoice_no=invoice,
+                    stock_code=f"P{rng.randint(1, 40)}",
+                    description=None,
+                    quantity=qty,
+                    invoice_date=start + timedelta(hours=inv),
+                    unit_price=round(rng.uniform(0.5, 20), 2),
+                    customer_id=str(rng.randint(1, 300)),
+                    country="United Kingdom",
+                ))
+
+    def test_matches_exact_within_error(self):
+        exact = ReportAccumulator().update(self.rows).report()
+        approx = ReportAccumulator(approximate=True, max_open_invoices=8).update(self.rows).report()
+
+        self.assertEqual(approx["revenue_by_country"], exact["revenue_by_country"])
+        self.assertLess(abs(approx["avg_order_value"] - exact["avg_order_value"]) / exact["avg_order_value"], 0.03)
+        self.assertLess(abs(approx["distinct_customers"] - 300), 10)
+        self.assertEqual(set(approx["order_value_quantiles"]), {"p50", "p90", "p99"})
+
+    def test_merge_across_chunks(self):
+        half = len(self.rows) // 2
+        left = ReportAccumulator(approximate=True).update(self.rows[:half])
+        right = ReportAccumulator(approximate=True).update(self.rows[half:])
+        whole = ReportAccumulator(approximate=True).update(self.rows)
+        merged = left.merge(right).report()
+        self.assertEqual(merged["cancellation_summary"], whole.report()["cancellation_summary"])
+        with self.assertRaises(ValueError):
+            ReportAccumulator().merge(ReportAccumulator(approximate=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
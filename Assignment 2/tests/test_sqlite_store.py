@@ -0,0 +1,78 @@
+# tests/test_sqlite_store.py
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src import (
+    SQLiteBackend,
+    avg_order_value,
+    cancellation_rate,
+    cancellation_summary,
+    load_into_sqlite,
+    monthly_revenue,
+    revenue_by_country,
+    sales_by_weekday,
+    top_n_customers_by_revenue,
+    top_n_products_by_revenue,
+    total_revenue,
+    units_sold_per_product,
+)
+from tests.helpers import make_tx
+
+
+class SQLiteBackendTests(unittest.TestCase):
+    """
+    The SQL backend must agree with the in-memory analysis functions.
+
+    Covers:
+        - Bulk load row count
+        - Every metric against its src.analysis counterpart
+        - Date/country filter pushdown
+    """
+
+    def setUp(self) -> None:
+        self.raw = [
+            make_tx("540001", "A111", "VINTAGE MUG", 10, datetime(2011, 3, 5, 10, 15), 1.99, "10001", "United Kingdom"),
+            make_tx("540001", "B222", "RETRO CLOCK", 3, datetime(2011, 3, 5, 10, 15), 9.50, "10001", "United Kingdom"),
+            make_tx("C540050", "A111", "VINTAGE MUG", -10, datetime(2011, 3, 5, 10, 45), 1.99, "10001", "United Kingdom"),
+            make_tx("540010", "C333", "GLASS VASE", 2, datetime(2011, 3, 5, 11, 0), 15.00, "20002", "Germany"),
+            make_tx("540200", "D444", None, 5, datetime(2011, 4, 4, 9, 0), 3.00, None, "France"),
+        ]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "retail.db")
+        self.inserted = load_into_sqlite(self.raw, self.db_path, batch_size=2)
+        self.db = SQLiteBackend(self.db_path)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.tmp.cleanup()
+
+    def test_row_count(self) -> None:
+        """All rows are inserted across several batches."""
+        self.assertEqual(self.inserted, 5)
+        self.assertEqual(self.db.row_count(), 5)
+
+    def test_metrics_match_in_memory(self) -> None:
+        """Each SQL aggregate equals its Python counterpart."""
+        self.assertAlmostEqual(self.db.total_revenue(), total_revenue(self.raw), places=6)
+        self.assertEqual(self.db.revenue_by_country(), revenue_by_country(self.raw))
+        self.assertEqual(self.db.monthly_revenue(), monthly_revenue(self.raw))
+        self.assertEqual(self.db.top_n_products_by_revenue(3), top_n_products_by_revenue(self.raw, 3))
+        self.assertEqual(self.db.top_n_customers_by_revenue(3), top_n_customers_by_revenue(self.raw, 3))
+        self.assertEqual(self.db.sales_by_weekday(), sales_by_weekday(self.raw))
+        self.assertEqual(self.db.cancellation_summary(), cancellation_summary(self.raw))
+        self.assertAlmostEqual(self.db.avg_order_value(), avg_order_value(self.raw), places=6)
+        self.assertEqual(self.db.units_sold_per_product(), units_sold_per_product(self.raw))
+        self.assertAlmostEqual(self.db.cancellation_rate(), cancellation_rate(self.raw), places=6)
+
+    def test_filters(self) -> None:
+        """Date and country filters restrict the aggregated rows."""
+        march = self.db.total_revenue(start=datetime(2011, 3, 1), end=datetime(2011, 4, 1))
+        self.assertAlmostEqual(march, 78.40, places=2)
+        self.assertEqual(self.db.revenue_by_country(countries=["Germany"]), {"Germany": 30.0})
+        self.assertEqual(self.db.top_n_products_by_revenue(0), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+# tests/test_streaming.py
+import unittest
+from datetime import datetime
+
+from src import (
+    ReportAccumulator,
+    avg_order_value,
+    cancellation_summary,
+    monthly_revenue,
+    revenue_by_country,
+    sales_by_weekday,
+    stream_report,
+    top_n_customers_by_revenue,
+    top_n_products_by_revenue,
+    total_revenue,
+    units_sold_per_product,
+)
+from tests.helpers import make_tx
+
+
+class StreamingReportTests(unittest.TestCase):
+    """
+    The single-pass report must match the in-memory analysis functions.
+
+    Covers:
+        - Every section from a one-shot generator
+        - Merging accumulators over disjoint inputs
+    """
+
+    def setUp(self) -> None:
+        self.raw = [
+            make_tx("540001", "A111", "VINTAGE MUG", 10, datetime(2011, 3, 5, 10, 15), 1.99, "10001", "United Kingdom"),
+            make_tx("540001", "B222", "RETRO CLOCK", 3, datetime(2011, 3, 5, 10, 15), 9.50, "10001", "United Kingdom"),
+            make_tx("C540050", "A111", "VINTAGE MUG", -10, datetime(2011, 3, 5, 10, 45), 1.99, "10001", "United Kingdom"),
+            make_tx("540010", "C333", "GLASS VASE", 2, datetime(2011, 3, 5, 11, 0), 15.00, "20002", "Germany"),
+            make_tx("540200", "D444", None, 5, datetime(2011, 4, 4, 9, 0), 3.00, None, "France"),
+            make_tx("540201", "E555", "FREE GIFT", 1, datetime(2011, 4, 4, 9, 5), 0.0, "20002", "Germany"),
+        ]
+
+    def _assert_matches(self, report):
+        raw = self.raw
+        self.assertAlmostEqual(report["total_revenue"], total_revenue(raw), places=6)
+        self.assertEqual(report["revenue_by_country"], revenue_by_country(raw))
+        self.assertEqual(report["monthly_revenue"], monthly_revenue(raw))
+        self.assertEqual(report["top_products"], top_n_products_by_revenue(raw, 3))
+        self.assertEqual(report["top_customers"], top_n_customers_by_revenue(raw, 3))
+        self.assertAlmostEqual(report["avg_order_value"], avg_order_value(raw), places=6)
+        self.assertEqual(report["units_sold_per_product"], units_sold_per_product(raw))
+        self.assertEqual(report["sales_by_weekday"], sales_by_weekday(raw))
+        self.assertEqual(report["cancellation_summary"], cancellation_summary(raw))
+
+    def test_single_pass_matches_analysis(self):
+        self._assert_matches(stream_report(iter(self.raw), top_n=3))
+
+    def test_merge_of_disjoint_parts(self):
+        left = ReportAccumulator().update(self.raw[:3])
+        right = ReportAccumulator().update(self.raw[3:])
+        merged = left.merge(right)
+        self.assertEqual(merged.rows, len(self.raw))
+        self._assert_matches(merged.report(top_n=3))
+
+
+if __name__ == "__main__":
+    unittest.main()
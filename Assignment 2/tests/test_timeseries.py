@@ -0,0 +1,82 @@
+# tests/test_timeseries.py
+import unittest
+from datetime import datetime, timedelta
+
+from src import monthly_revenue, sales_by_weekday
+from src.timeseries import FREQUENCIES, TimeSeries, period_code, period_label, period_start
+from tests.helpers import make_tx
+
+
+class PeriodCodeTests(unittest.TestCase):
+    """
+    Period codes must be consecutive integers that round-trip to their start.
+
+    Covers:
+        - period_code / period_start / period_label for every frequency
+        - Weeks start on Monday
+    """
+
+    def test_round_trip(self):
+        ts = datetime(2011, 3, 9, 14, 35)  # a Wednesday
+        for freq in FREQUENCIES:
+            with self.subTest(freq=freq):
+                code = period_code(ts, freq)
+                start = period_start(code, freq)
+                self.assertLessEqual(start, ts)
+                self.assertEqual(period_code(start, freq), code)
+                self.assertEqual(period_code(period_start(code + 1, freq), freq), code + 1)
+
+        self.assertEqual(period_start(period_code(ts, "week"), "week"), datetime(2011, 3, 7))
+        self.assertEqual(period_label(period_code(ts, "hour"), "hour"), "2011-03-09 14:00")
+        self.assertEqual(period_label(period_code(ts, "month"), "month"), "2011-03")
+        self.assertEqual(period_label(period_code(ts, "quarter"), "quarter"), "2011-Q1")
+
+
+class TimeSeriesTests(unittest.TestCase):
+    """
+    One binning pass must support resampling, windows and growth.
+
+    Covers:
+        - Agreement with monthly_revenue and sales_by_weekday
+        - Resampling hour -> day -> month -> quarter
+        - Rolling sums, moving averages and growth over gaps
+    """
+
+    def setUp(self) -> None:
+        start = datetime(2010, 12, 1, 8)
+        self.rows = []
+        for i in range(120):
+            when = start + timedelta(days=i // 2, hours=3 * (i % 2))
+            self.rows.append(make_tx(str(i), quantity=1 + i % 4, unit_price=2.5, invoice_date=when))
+        self.rows.append(make_tx("C1", quantity=-3, unit_price=2.5, invoice_date=start))   # cancellation: ignored
+        self.rows.append(make_tx("9", quantity=2, unit_price=0.0, invoice_date=start))     # zero price: ignored
+
+    def test_matches_fixed_groupings(self):
+        hourly = TimeSeries.from_transactions(self.rows, freq="hour")
+        self.assertEqual(hourly.resample("month").to_dict(), monthly_revenue(self.rows))
+        self.assertEqual(hourly.profile("weekday"), sales_by_weekday(self.rows))
+        self.assertEqual(sum(hourly.profile("hour").values()), round(sum(hourly.values.values()), 2))
+
+    def test_resample_chain(self):
+        hourly = TimeSeries.from_transactions(self.rows, freq="hour")
+        daily = hourly.resample("day")
+        self.assertEqual(len(daily), 60)
+        self.assertEqual(daily.resample("quarter").values, hourly.resample("quarter").values)
+        self.assertEqual(set(hourly.resample("quarter").to_dict()), {"2010-Q4", "2011-Q1"})
+        with self.assertRaises(ValueError):
+            daily.resample("hour")
+        with self.assertRaises(ValueError):
+            daily.resample("week").resample("month")
+
+    def test_windows_and_growth(self):
+        series = TimeSeries("day", {10: 1.0, 11: 2.0, 13: 4.0})  # day 12 is a gap
+        self.assertEqual([c for c, _ in series.dense()], [10, 11, 12, 13])
+        self.assertEqual(series.rolling_sum(2).values, {11: 3.0, 12: 2.0, 13: 4.0})
+        self.assertEqual(series.moving_average(2).values, {11: 1.5, 12: 1.0, 13: 2.0})
+        self.assertEqual(series.growth().values, {11: 100.0, 12: -100.0})
+        self.assertEqual(series.growth(periods=3).values, {13: 300.0})
+        self.assertEqual(TimeSeries("day").dense(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()